@@ -0,0 +1,162 @@
+"""Пакетная конвертация .bin логов (SD-карта и наземная станция) в наборы данных.
+
+    python binconv.py log/ sd/ -o out --format csv
+    python binconv.py log/*.bin -o out --format npz -j 8
+    python binconv.py log/ -o out --format sqlite --raw
+
+Файлы разбираются в пуле процессов через telemetry.bulk (NumPy). Значения
+сразу переводятся в физические единицы (bulk.SCALES), если не указан --raw.
+Для каждого файла в out/summary.csv пишется строка: пакеты, ошибки CRC,
+разрывы в packet_num и потерянные пакеты. --print выводит пакеты, как bin.py.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from telemetry import bulk, codec
+
+SUMMARY_HEADER = "file;packets;crc_failures;gaps;lost;duration_s;bytes;output\n"
+
+
+def find_logs(paths) -> list:
+    """Файлы .bin из списка путей; каталоги просматриваются рекурсивно."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(".bin"))
+        else:
+            found.append(path)
+    return found
+
+
+def output_name(path: str, root: str) -> str:
+    """Имя без расширения, уникальное для файлов с одинаковыми именами в разных каталогах."""
+    rel = os.path.relpath(os.path.splitext(path)[0], root)
+    return rel.replace(os.sep, "__").replace("..", "_")
+
+
+def _print_packets(path, cols):
+    print(f"== {path}")
+    for row in zip(*(cols[name].tolist() for name in codec.FIELDS)):
+        print(";".join(map(str, row)))
+
+
+def write_csv(path: str, cols: dict):
+    fmt = ["%.6g" if cols[name].dtype.kind == "f" else "%d" for name in codec.FIELDS]
+    data = np.column_stack([cols[name] for name in codec.FIELDS]) if len(cols["time"]) else \
+        np.empty((0, len(codec.FIELDS)))
+    np.savetxt(path, data, fmt=fmt, delimiter=";", header=";".join(codec.FIELDS), comments="")
+
+
+def convert_file(path: str, out_dir: str, name: str, fmt: str, raw: bool = False,
+                 verbose: bool = False):
+    """Разобрать один файл. Возвращает (сводка, столбцы для SQLite или None)."""
+    log = bulk.decode_file(path)
+    cols = bulk.columns(log.records) if raw else bulk.physical(log.records)
+    gaps, lost = bulk.sequence_gaps(log.records["packet_num"])
+    t = log.records["time"]
+    summary = {
+        "file": path,
+        "packets": len(log.records),
+        "crc_failures": log.crc_failures,
+        "gaps": gaps,
+        "lost": lost,
+        "duration_s": round((int(t.max()) - int(t.min())) / 1000, 3) if len(t) else 0.0,
+        "bytes": os.path.getsize(path),
+        "output": "",
+    }
+    if verbose:
+        _print_packets(path, cols)
+    if fmt == "csv":
+        summary["output"] = os.path.join(out_dir, name + ".csv")
+        write_csv(summary["output"], cols)
+    elif fmt == "npz":
+        summary["output"] = os.path.join(out_dir, name + ".npz")
+        np.savez_compressed(summary["output"], **cols)
+    else:
+        # SQLite пишет один процесс — столбцы возвращаются родителю
+        return summary, cols
+    return summary, None
+
+
+def _sqlite_open(path: str) -> sqlite3.Connection:
+    con = sqlite3.connect(path)
+    con.executescript(f"""
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY, file TEXT UNIQUE, packets INTEGER, crc_failures INTEGER,
+            gaps INTEGER, lost INTEGER, duration_s REAL, bytes INTEGER);
+        CREATE TABLE IF NOT EXISTS packets (
+            file_id INTEGER NOT NULL REFERENCES files(id),
+            {", ".join(f"{name} NUMERIC" for name in codec.FIELDS)});
+        CREATE INDEX IF NOT EXISTS packets_file_time ON packets(file_id, time);
+    """)
+    return con
+
+
+def _sqlite_add(con, summary: dict, cols: dict):
+    with con:
+        con.execute("DELETE FROM packets WHERE file_id IN (SELECT id FROM files WHERE file = ?)",
+                    (summary["file"],))
+        con.execute("DELETE FROM files WHERE file = ?", (summary["file"],))
+        cur = con.execute(
+            "INSERT INTO files (file, packets, crc_failures, gaps, lost, duration_s, bytes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            tuple(summary[k] for k in ("file", "packets", "crc_failures", "gaps", "lost",
+                                       "duration_s", "bytes")))
+        file_id = cur.lastrowid
+        rows = zip([file_id] * summary["packets"], *(cols[name].tolist() for name in codec.FIELDS))
+        con.executemany(
+            f"INSERT INTO packets VALUES ({', '.join('?' * (len(codec.FIELDS) + 1))})", rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Конвертация .bin логов ГРИБа")
+    parser.add_argument("inputs", nargs="+", help=".bin файлы или каталоги")
+    parser.add_argument("-o", "--out", default="converted", help="каталог результата")
+    parser.add_argument("-f", "--format", choices=("csv", "npz", "sqlite"), default="csv")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="число процессов")
+    parser.add_argument("--raw", action="store_true", help="без перевода в физические единицы")
+    parser.add_argument("--print", dest="verbose", action="store_true", help="выводить пакеты")
+    args = parser.parse_args(argv)
+
+    logs = find_logs(args.inputs)
+    if not logs:
+        print("Нет .bin файлов", file=sys.stderr)
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in logs])
+    con = _sqlite_open(os.path.join(args.out, "telemetry.db")) if args.format == "sqlite" else None
+    failed = 0
+    with open(os.path.join(args.out, "summary.csv"), "w") as summary_file, \
+            ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        summary_file.write(SUMMARY_HEADER)
+        futures = [pool.submit(convert_file, path, args.out,
+                               output_name(os.path.abspath(path), root),
+                               args.format, args.raw, args.verbose) for path in logs]
+        for path, future in zip(logs, futures):
+            try:
+                summary, cols = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"{path}: ошибка: {e}", file=sys.stderr)
+                continue
+            if con is not None:
+                _sqlite_add(con, summary, cols)
+                summary["output"] = os.path.join(args.out, "telemetry.db")
+            summary_file.write(";".join(str(summary[k]) for k in SUMMARY_HEADER.strip().split(";")) + "\n")
+            print(f"{path}: пакетов {summary['packets']}, ошибок CRC {summary['crc_failures']}, "
+                  f"разрывов {summary['gaps']} (потеряно {summary['lost']})")
+    if con is not None:
+        con.close()
+    print(f"Файлов: {len(logs) - failed} из {len(logs)}, результат в {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,13 @@ import logging
 import sys
 import json
 import time
+import asyncio
+
+from telemetry import codec, e220, o2, relay
+from telemetry.framer import Framer
+from telemetry.latency import LatencyTracer
+from telemetry.linkstats import LinkStats
+from telemetry.writer import LogWriter
 
 # Настройка логирования
 current_datetime = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -45,28 +52,13 @@ def calculate_mq4_ppm(voltage):
 
 
 # ===== Добавляем расчёт кислорода =====
-# Параметры АЦП и усилителя
-ADC_REF_VOLTAGE = 3.3    # опорное напряжение АЦП (V)
-ADC_MAX = 4095.0         # разрешение 12-битного АЦП
-
-# Вычислите эти два параметра по вашим измерениям:
-#   V_zero — выход датчика при 0 % O2 (например, в чистом N2)
-#   V_air  — выход датчика при ~21 % O2 (обычный воздух)
-# Тогда:
-#   O2_SLOPE  = (V_air  – V_zero) / 21.0
-#   O2_OFFSET = V_zero
-
-V_zero = 0.175   # В при 0 % O₂
-V_air  = 1.05    # В при ~21 % O₂
-
-O2_SLOPE = (V_air  - V_zero) / 21.0   # заменить на число, полученное по формуле
-O2_OFFSET = V_zero                     # заменить на измеренное напряжение при 0 % O2
+# Калибровка датчика — в telemetry/o2.py (общая с дашбордом)
 
 def calculate_o2_percent(voltage: float) -> float:
     """
     Переводим входное напряжение в % кислорода и ограничиваем в диапазоне 0–100%.
     """
-    perc = (voltage - O2_OFFSET) / O2_SLOPE
+    perc = (voltage - o2.O2_OFFSET) / o2.O2_SLOPE
     # Логируем для отладки: «сырое» АЦП, напряжение, рассчитанный %
     logging.debug(
         "O2 raw ADC=%d, voltage=%.3f V → perc=%.2f%%",
@@ -84,6 +76,8 @@ class UDPServer:
         self.port = port
         self.socket = None
         self.clients = []
+        # Клиенты, запросившие двоичный режим ("status bin"); остальным — JSON
+        self.binary_clients = set()
         self.last_check = time.time()
         self.create_socket()
 
@@ -111,10 +105,16 @@ class UDPServer:
             print(f"\nNew UDP client connected: {addr}")
             print(f"Total clients: {len(self.clients)}")
         
-        if data == b"status":
+        mode = relay.parse_hello(data)
+        if mode is not None:
             try:
-                self.send_data(b"OK", addr)
-                print(f"Sent status response to {addr}")
+                if mode == "bin":
+                    self.binary_clients.add(addr)
+                    self.send_data(relay.ACK_BIN, addr)
+                else:
+                    self.binary_clients.discard(addr)
+                    self.send_data(relay.ACK_JSON, addr)
+                print(f"Sent status response to {addr} (mode: {mode})")
             except Exception as e:
                 print(f"ERROR: Failed to send status response: {e}")
         else:
@@ -126,7 +126,11 @@ class UDPServer:
             except Exception as e:
                 print(f"ERROR: Failed to process data from {addr}: {e}")
 
-    def send_data(self, data, addr=None):
+    def has_json_clients(self):
+        return len(self.clients) > len(self.binary_clients)
+
+    def send_data(self, data, addr=None, binary=False):
+        """Отправить одному клиенту или всем клиентам выбранного режима."""
         if not self.socket:
             if not self.create_socket():
                 return False
@@ -137,12 +141,16 @@ class UDPServer:
             else:
                 active_clients = []
                 for client in self.clients:
+                    if (client in self.binary_clients) != binary:
+                        active_clients.append(client)
+                        continue
                     try:
                         self.socket.sendto(data, client)
-                        print(f"Sent to client: {client}")
+                        logging.debug("Sent to client: %s", client)
                         active_clients.append(client)
                     except Exception as e:
                         print(f"ERROR: Failed to send to client {client}: {e}")
+                        self.binary_clients.discard(client)
                 self.clients = active_clients
             return True
         except Exception as e:
@@ -160,7 +168,8 @@ class UDPServer:
                 except:
                     pass
             self.clients = active_clients
-            print(f"Active UDP clients: {len(self.clients)}")
+            self.binary_clients.intersection_update(self.clients)
+            print(f"Active UDP clients: {len(self.clients)} (binary: {len(self.binary_clients)})")
             self.last_check = time.time()
 
 # Создаем экземпляр UDP сервера
@@ -251,10 +260,8 @@ logging.info("Initial AUX pin state: %d", aux_state)
 
 # Файлы лога данных
 binfile = f"log/grib_{current_datetime}.bin"
-file_bin = open(binfile, "wb")
 csvfile = f"log/grib_{current_datetime}.csv"
-file_csv = open(csvfile, "w")
-file_csv.write(
+CSV_HEADER = (
     "start;team_id;time;temp_bmp280;pressure_bmp280;"
     "acceleration_x;acceleration_y;acceleration_z;"
     "angular_x;angular_y;angular_z;cheksum_org;"
@@ -263,170 +270,54 @@ file_csv.write(
     "neo6mv2_latitude;neo6mv2_longitude;neo6mv2_height;neo6mv2_fix;"
     "scd41;mq_4;me2o2;checksum_grib;\n"
 )
+# fsync логов раз в секунду или после 64 КБ — что наступит раньше
+LOG_SYNC_INTERVAL = 1.0
+LOG_SYNC_BYTES = 64 * 1024
+# Запись в отдельном потоке: приём только кладёт данные в очередь
+log_writer = LogWriter(binfile, csvfile, CSV_HEADER,
+                       sync_interval=LOG_SYNC_INTERVAL, sync_bytes=LOG_SYNC_BYTES)
 
-logging.info("Initialization complete. Logging to %s", log_filename)
-
-def xor_block(data):
-    result = 0x00
-    for byte in data:
-        result ^= byte
-    return result
-
-# Функции управления модулем E220
-
-def e220_set_mode(regim):
-    if regim == 0:
-        GPIO.output(E220_M0_PIN, GPIO.LOW)
-        GPIO.output(E220_M1_PIN, GPIO.LOW)
-    elif regim == 1:
-        GPIO.output(E220_M0_PIN, GPIO.HIGH)
-        GPIO.output(E220_M1_PIN, GPIO.LOW)
-    elif regim == 2:
-        GPIO.output(E220_M0_PIN, GPIO.LOW)
-        GPIO.output(E220_M1_PIN, GPIO.HIGH)
-    elif regim == 3:
-        GPIO.output(E220_M0_PIN, GPIO.HIGH)
-        GPIO.output(E220_M1_PIN, GPIO.HIGH)
-
-
-def e220_set_reg(adres, data):
-    port.write(struct.pack("<4B", 0xC0, adres, 1, data))
-    time.sleep(0.5)
-
-
-def e220_set_adres(adres):
-    e220_set_reg(0, adres >> 8)
-    e220_set_reg(1, adres & 0xFF)
-
-
-def e220_set_reg0(air_rate, parity, port_rate):
-    e220_set_reg(2, air_rate | (parity << 3) | (port_rate << 5))
-
-
-def e220_set_reg1(packet_len, rssi, power):
-    e220_set_reg(3, power | (rssi << 5) | (packet_len << 6))
+# Сводка качества канала (потери, джиттер, поток) в лог — раз в LINK_LOG_INTERVAL секунд
+LINK_LOG_INTERVAL = 10
 
+logging.info("Initialization complete. Logging to %s", log_filename)
 
-def e220_set_channel(chanel):
-    e220_set_reg(4, chanel)
+# Модуль E220 (telemetry/e220.py)
 
+# Порт и GPIO передаются явно — так же модуль работает с заглушками
+radio = e220.E220(port, GPIO, E220_M0_PIN, E220_M1_PIN, E220_AUX_PIN)
 
-def e220_set_reg3(enable_rssi, method, lbt_enable, cycle):
-    e220_set_reg(
-        5,
-        cycle | (lbt_enable << 4) | (method << 6) | (enable_rssi << 7)
-    )
-
-
-def e220_get_config():
-    port.write(struct.pack("<BBB", 0xC1, 0, 9))
-    recv = port.read(15)
-    logging.info("E220 Settings (raw): %s", recv)
-    if len(recv) >= 12:
-        logging.info(
-            "E220 Settings (parsed): %s",
-            struct.unpack("<3BH7B", recv[:12])
-        )
 
 def setup_e220():
     try:
         print("\n=== E220 Module Setup ===")
-        print("Checking initial state...")
-        
-        # Проверяем начальное состояние AUX
-        aux_state = GPIO.input(E220_AUX_PIN)
-        print(f"Initial AUX state: {aux_state}")
-        
-        # Проверяем состояние M0 и M1
-        m0_state = GPIO.input(E220_M0_PIN)
-        m1_state = GPIO.input(E220_M1_PIN)
-        print(f"Initial M0 state: {m0_state}, M1 state: {m1_state}")
-        
-        # Устанавливаем режим 3 (конфигурация)
-        print("\nSetting mode 3 (configuration)...")
-        e220_set_mode(3)
-        time.sleep(0.5)  # Увеличиваем задержку
-
-        # Проверяем состояние M0 и M1
-        m0_state = GPIO.input(E220_M0_PIN)
-        m1_state = GPIO.input(E220_M1_PIN)
-        print(f"Setting mode M0 state: {m0_state}, M1 state: {m1_state}")
-        
-        # Проверяем AUX после установки режима
-        aux_state = GPIO.input(E220_AUX_PIN)
-        print(f"AUX state after mode change: {aux_state}")
-        
-        if aux_state == 0:
-            print("WARNING: AUX is LOW after mode change - module might be busy")
-            time.sleep(0.5)  # Увеличиваем задержку
-        
-        # Очищаем буферы
-        print("\nClearing buffers...")
-        port.reset_input_buffer()
-        port.reset_output_buffer()
-        
-        # Проверяем состояние порта
-        print(f"Port is open: {port.is_open}")
-        print(f"Port settings: {port.get_settings()}")
-        
-        # Настройка регистров
-        print("\nConfiguring registers...")
-        
-        # Address = 0xFFFF
-        print("Setting ADDR REG...")
-        e220_set_adres(0xFFFF)
-        time.sleep(0.5)
-        response = port.read(10)
-        print(f"ADDR REG response: {response.hex() if response else 'None'}")
-
-        # Air rate = 9600, parity = 8N1, prot rate = 9600
-        print("Setting REG0...")
-        e220_set_reg0(E220_REG0_AIR_RATE_9600, E220_REG0_PARITY_8N1_DEF, E220_REG0_PORT_RATE_9600)
-        time.sleep(0.5)
-        response = port.read(10)
-        print(f"REG0 response: {response.hex() if response else 'None'}")
-
-        # REG1: packet len = 200, rssi off, power = 22
-        print("Setting REG1...")
-        e220_set_reg1(E220_REG1_PACKET_LEN_200B, E220_REG1_RSSI_OFF, E220_REG1_TPOWER_22)
-        time.sleep(0.5)
-        response = port.read(10)
-        print(f"REG1 response: {response.hex() if response else 'None'}")
-
-        # chanel = 1
-        print("Setting CHANNEL...")
-        e220_set_channel(1)
-        time.sleep(0.5)
-        response = port.read(10)
-        print(f"CHANNEL response: {response.hex() if response else 'None'}")
-
-        # REG3:
-        print("Setting REG3...")
-        e220_set_reg3(
-            E220_REG3_RSSI_BYTE_OFF,
-            E220_REG3_TRANS_M_TRANSPARENT,
-            E220_REG3_LBT_EN_OFF,
-            E220_REG3_WOR_CYCLE_500
+        started = time.monotonic()
+        print(f"Initial AUX state: {GPIO.input(E220_AUX_PIN)}")
+
+        # Address = 0xFFFF; air rate = 9600, 8N1, port rate = 9600;
+        # packet len = 200, rssi off, power = 22; chanel = 1; REG3 — прозрачный режим
+        regs = e220.registers(
+            0xFFFF,
+            e220.reg0(E220_REG0_AIR_RATE_9600, E220_REG0_PARITY_8N1_DEF, E220_REG0_PORT_RATE_9600),
+            e220.reg1(E220_REG1_PACKET_LEN_200B, E220_REG1_RSSI_OFF, E220_REG1_TPOWER_22),
+            1,
+            e220.reg3(
+                E220_REG3_RSSI_BYTE_OFF,
+                E220_REG3_TRANS_M_TRANSPARENT,
+                E220_REG3_LBT_EN_OFF,
+                E220_REG3_WOR_CYCLE_500
+            ),
         )
-        time.sleep(0.5)
-        response = port.read(10)
-        print(f"REG3 response: {response.hex() if response else 'None'}")
-        
-        # Читаем настройки для проверки
-        print("\nReading current settings...")
-        e220_get_config()
-        #print(f"Current settings: {settings.hex() if settings else 'None'}")
-        
-        # Возвращаем в режим 0 (передача)
-        print("\nSetting mode 0 (transmission)...")
-        e220_set_mode(0)
-        time.sleep(0.5)
-        
-        # Проверяем AUX после возврата в режим передачи
-        aux_state = GPIO.input(E220_AUX_PIN)
-        print(f"Final AUX state: {aux_state}")
+        print(f"Writing registers in one burst: {regs.hex()}")
+        # Режим 3 -> C0 00 06 ... -> проверка чтением C1 00 06 -> режим 0
+        current = radio.configure(regs)
+        logging.info("E220 Settings (raw): %s", current.hex())
+        logging.info("E220 Settings (parsed): ADDR=0x%04X regs=%s",
+                     current[0] << 8 | current[1], list(current[2:]))
+        port.reset_input_buffer()
 
-        print("\n=== E220 Setup Complete ===")
+        print(f"Final AUX state: {GPIO.input(E220_AUX_PIN)}")
+        print(f"\n=== E220 Setup Complete ({(time.monotonic() - started) * 1000:.0f} ms) ===")
         return True
     except Exception as e:
         print(f"ERROR: E220 setup failed: {e}")
@@ -438,147 +329,202 @@ if not setup_e220():
     print("ERROR: Failed to configure E220 module. Exiting...")
     sys.exit(1)
 
-# Основной цикл
-try:
-    # Инициализация буфера
-    buf = bytearray()
-    print("\n=== Starting main loop ===")
-    print("Waiting for UART data...")
+class SerialRelay:
+    """Приём кадров с UART и немедленная пересылка UDP-клиентам."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        # Буфер приёма фиксированного размера, без перевыделений
+        self.framer = Framer()
+        self.relay_seq = 0        # сквозной номер кадра для двоичных клиентов
+        self.link = LinkStats(window=LINK_LOG_INTERVAL)
+        # Задержка от чтения порта до отправки клиентам (участок uart->send)
+        self.latency = LatencyTracer()
+        self.rx_time = time.time()
+        self.udp_fd = None
+
+    # --- источники событий ---
+
+    def watch_serial(self):
+        self.loop.add_reader(port.fileno(), self.on_serial_readable)
+
+    def watch_udp(self):
+        """(Пере)подписаться на сокет сервера — после create_socket() он новый."""
+        if self.udp_fd is not None:
+            self.loop.remove_reader(self.udp_fd)
+            self.udp_fd = None
+        if udp_server.socket:
+            self.udp_fd = udp_server.socket.fileno()
+            self.loop.add_reader(self.udp_fd, self.on_udp_readable)
 
-    while True:
-        # UDP: проверка новых клиентов
-        try:
-            if udp_server.socket:
+    def on_udp_readable(self):
+        # UDP: новые клиенты и рукопожатия обрабатываются сразу, без ожидания UART
+        while udp_server.socket:
+            try:
                 data, addr = udp_server.socket.recvfrom(1024)
-                udp_server.handle_client(data, addr)
-        except socket.error as e:
-            if e.errno != socket.EAGAIN:
+            except BlockingIOError:
+                return
+            except socket.error as e:
                 print(f"ERROR: UDP receive error: {e}")
                 udp_server.create_socket()
+                self.watch_udp()
+                return
+            udp_server.handle_client(data, addr)
 
-        # UART: чтение данных
+    def on_serial_readable(self):
         try:
-            print("\nTrying to read UART...")
-            rcv = port.read(100)
-            print(f"Read result: {rcv.hex() if rcv else 'No data'}")
-            if rcv:
-                aux_state = GPIO.input(E220_AUX_PIN)
-                print(f"AUX state: {aux_state}")
-                print(f"Buffer size before adding: {len(buf)}")
-                buf += rcv
-                print(f"Buffer size after adding: {len(buf)}")
-                print(f"Current buffer content: {buf.hex()}")
-                file_bin.write(rcv)
-                file_bin.flush()
-            else:
-                # Проверяем состояние порта
-                if not port.is_open:
-                    print("ERROR: Serial port is closed!")
-                    try:
-                        port.open()
-                        print("Serial port reopened")
-                    except Exception as e:
-                        print(f"ERROR: Failed to reopen serial port: {e}")
-                # Проверяем AUX пин
-                aux_state = GPIO.input(E220_AUX_PIN)
-                if aux_state == 0:
-                    print("WARNING: AUX pin is LOW - module might be busy")
+            rcv = port.read(port.in_waiting or 1)
         except serial.SerialException as e:
             print(f"ERROR: Serial port error: {e}")
-            try:
-                port.close()
-                port.open()
-                print("Serial port reopened")
-            except Exception as e:
-                print(f"ERROR: Failed to reopen serial port: {e}")
+            self.reopen_serial()
+            return
         except Exception as e:
             print(f"ERROR: UART read error: {e}")
+            return
+        if not rcv:
+            return
+        self.rx_time = time.time()
+        self.framer.feed(rcv)
+        log_writer.write_raw(rcv)
+        # Кадр уходит клиентам, как только пришёл его последний байт
+        self.process_frames()
+
+    def reopen_serial(self):
+        try:
+            self.loop.remove_reader(port.fileno())
+        except Exception:
+            pass
+        try:
+            port.close()
+            port.open()
+            self.watch_serial()
+            print("Serial port reopened")
+        except Exception as e:
+            print(f"ERROR: Failed to reopen serial port: {e}")
+
+    async def housekeeping(self):
+        """Периодические задачи: пинг клиентов, состояние порта и AUX, сводка канала."""
+        ticks = 0
+        while True:
+            await asyncio.sleep(1)
+            ticks += 1
+            if ticks % LINK_LOG_INTERVAL == 0 and self.link.received:
+                logging.info(self.link.summary())
+                for line in self.latency.lines()[1:]:
+                    logging.info("latency %s", line)
+            udp_server.check_clients()
+            # send_data() мог сбросить или пересоздать сокет
+            if not udp_server.socket:
+                udp_server.create_socket()
+            sock_fd = udp_server.socket.fileno() if udp_server.socket else None
+            if sock_fd != self.udp_fd:
+                self.watch_udp()
+            if not port.is_open:
+                print("ERROR: Serial port is closed!")
+                self.reopen_serial()
+            if GPIO.input(E220_AUX_PIN) == 0:
+                print("WARNING: AUX pin is LOW - module might be busy")
+
+    # --- обработка пакетов ---
+
+    def process_frames(self):
+        # framer сам ищет 0xAAAA и проверяет CRC
+        framer = self.framer
+        crc_errors = framer.crc_errors
+        relay_records = []
+        frames = 0
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        for chunk in framer.frames():
+            frames += 1
+            if debug:
+                logging.debug("Frame: %s", chunk.hex())
+            if udp_server.binary_clients:
+                self.relay_seq += 1
+                relay_records.append(relay.pack_record(self.relay_seq, self.rx_time, True, chunk))
+            pack = codec.decode(chunk)
+            logging.debug("Unpacked packet: %s", pack)
+            self.link.add(pack.packet_num, pack.time, self.rx_time, len(chunk))
+            log_writer.write_row(pack)
+
+            global raw_me2o2
+            raw_me2o2 = pack.me2o2      # «сырое» значение АЦП
+            voltage_o2 = o2.voltage(raw_me2o2)
+            me2o2_o2 = round(calculate_o2_percent(voltage_o2), 1)
+            data = {
+                "header": int(pack.header),
+                "team_id": int(pack.team_id),
+                "time": int(pack.time),
+                "temp_bmp": float(pack.temp_bmp * 0.01),
+                "press_bmp": int(pack.press_bmp),
+                "accel_x": float(pack.accel_x * 0.000488),
+                "accel_y": float(pack.accel_y * 0.000488),
+                "accel_z": float(pack.accel_z * 0.000488),
+                "gyro_x": float(pack.gyro_x * 0.07),
+                "gyro_y": float(pack.gyro_y * 0.07),
+                "gyro_z": float(pack.gyro_z * 0.07),
+                "checksum_org": int(pack.checksum_org),
+                "packet_num": int(pack.packet_num),
+                "state": int(pack.state & 7),
+                "photo": float(pack.photo * 0.001),
+                "mag_x": float(pack.mag_x * 0.000584),
+                "mag_y": float(pack.mag_y * 0.000584),
+                "mag_z": float(pack.mag_z * 0.000584),
+                "temp_ds": float(pack.temp_ds * 0.0625),
+                "gps_lat": float(pack.gps_lat),
+                "gps_lon": float(pack.gps_lon),
+                "gps_alt": float(pack.gps_alt),
+                "gps_fix": int(pack.gps_fix),
+                "scd41": int(pack.scd41),
+                "mq4": int(pack.mq4),
+                "me2o2": float(me2o2_o2),
+                "checksum_grib": int(pack.checksum_grib)
+            }
+
+            if not udp_server.has_json_clients():
+                continue
+            try:
+                # Метки времени для замера задержек на дашборде
+                data["rx_time"] = self.rx_time
+                data["tx_time"] = time.time()
+                # Преобразуем все значения в базовые типы Python
+                json_string = json.dumps(data, ensure_ascii=False)
+                logging.debug("JSON to %d clients: %s", len(udp_server.clients), json_string)
+                udp_server.send_data(json_string.encode('utf-8'))
+            except Exception as e:
+                print(f"ERROR: Failed to send JSON UDP packet: {e}")
+                print(f"Data that caused error: {data}")
+
+        # Двоичным клиентам — сырые кадры, до MAX_FRAMES в одной датаграмме
+        if relay_records:
+            for datagram in relay.pack_datagrams(relay_records, sent=time.time()):
+                udp_server.send_data(datagram, binary=True)
+
+        # Один замер на кадр — после отправки и JSON-, и двоичным клиентам
+        if frames and (relay_records or udp_server.has_json_clients()):
+            sent = time.time() - self.rx_time
+            for _ in range(frames):
+                self.latency.record("uart->send", sent)
+
+        if framer.crc_errors != crc_errors:
+            print(f"WARNING: CRC mismatch x{framer.crc_errors - crc_errors} "
+                  f"(total {framer.crc_errors}, dropped {framer.dropped} bytes)")
+
+
+async def main():
+    # UART, UDP-сокет и периодическая проверка клиентов — отдельные источники
+    # событий одного цикла asyncio, никто не ждёт таймаута чтения порта
+    station = SerialRelay(asyncio.get_running_loop())
+    port.timeout = 0
+    station.watch_serial()
+    station.watch_udp()
+    print("\n=== Starting main loop ===")
+    print("Waiting for UART data...")
+    await station.housekeeping()
 
-        # обработка пакетов
-        while len(buf) >= 60:
-            print("\n=== Processing packet ===")
-            print(f"Buffer size: {len(buf)}")
-            print(f"First 10 bytes: {buf[:10].hex()}")
-            if buf[0] == 0xAA and buf[1] == 0xAA:
-                print("Found packet header!")
-                chunk = buf[:60]
-                print(f"Processing chunk: {chunk.hex()}")
-                try:
-                    pack = struct.unpack("<2HIhI6hBHBH4h3fB3HB", chunk)
-                    print(f"Unpacked packet: {pack}")
-                except struct.error as e:
-                    print(f"ERROR: Struct unpack error: {e}. Skipping byte.")
-                    buf = buf[1:]
-                    continue
-
-                calculated_crc = xor_block(chunk[:-1])
-                received_crc = pack[-1]
-                print(f"CRC check - Calculated: {calculated_crc}, Received: {received_crc}")
-
-                if calculated_crc == received_crc:
-                    raw_me2o2 = pack[25]      # «сырое» значение АЦП
-                    voltage_o2 = raw_me2o2 / ADC_MAX * ADC_REF_VOLTAGE
-                    me2o2_o2 = round(calculate_o2_percent(voltage_o2), 1)
-                    data = {
-                        "header": int(pack[0]),
-                        "team_id": int(pack[1]),
-                        "time": int(pack[2]),
-                        "temp_bmp": float(pack[3] * 0.01),
-                        "press_bmp": int(pack[4]),
-                        "accel_x": float(pack[5] * 0.000488),
-                        "accel_y": float(pack[6] * 0.000488),
-                        "accel_z": float(pack[7] * 0.000488),
-                        "gyro_x": float(pack[8] * 0.07),
-                        "gyro_y": float(pack[9] * 0.07),
-                        "gyro_z": float(pack[10] * 0.07),
-                        "checksum_org": int(pack[11]),
-                        "packet_num": int(pack[12]),
-                        "state": int(pack[13] & 7),
-                        "photo": float(pack[14] * 0.001),
-                        "mag_x": float(pack[15] * 0.000584),
-                        "mag_y": float(pack[16] * 0.000584),
-                        "mag_z": float(pack[17] * 0.000584),
-                        "temp_ds": float(pack[18] * 0.0625),
-                        "gps_lat": float(pack[19]),
-                        "gps_lon": float(pack[20]),
-                        "gps_alt": float(pack[21]),
-                        "gps_fix": int(pack[22]),
-                        "scd41": int(pack[23]),
-                        "mq4": int(pack[24]),
-                        "me2o2": float(me2o2_o2),
-                        "checksum_grib": int(pack[26])
-                    }
-                    print(f"Processed data: {data}")
-
-                    try:
-                        # Преобразуем все значения в базовые типы Python
-                        json_string = json.dumps(data, ensure_ascii=False)
-                        print(f"JSON string: {json_string}")
-                        udp_message = json_string.encode('utf-8')
-                        print(f"UDP message (hex): {udp_message.hex()}")
-                        print(f"Sending UDP message to {len(udp_server.clients)} clients")
-                        udp_server.send_data(udp_message)
-                    except Exception as e:
-                        print(f"ERROR: Failed to send JSON UDP packet: {e}")
-                        print(f"Data that caused error: {data}")
-
-                    buf = buf[60:]
-                else:
-                    print(f"WARNING: CRC mismatch! Calculated: {calculated_crc}, Received: {received_crc}")
-                    buf = buf[1:]
-            else:
-                # Ищем следующий заголовок
-                header_index = buf.find(b"\xAA\xAA")
-                if header_index != -1:
-                    print(f"Found header at index {header_index}, skipping {header_index} bytes")
-                    buf = buf[header_index:]
-                else:
-                    # Если заголовок не найден, оставляем только последний байт
-                    buf = buf[-1:]
-
-        # Проверяем активных клиентов
-        udp_server.check_clients()
 
+# Основной цикл
+try:
+    asyncio.run(main())
 except KeyboardInterrupt:
     print("\nUser interrupted")
 finally:
@@ -596,9 +542,9 @@ finally:
     except:
         pass
     try:
-        file_bin.close()
-        file_csv.close()
-        print("Log files closed")
+        log_writer.close()
+        print(f"Log files closed ({log_writer.raw_bytes} bytes, {log_writer.rows} rows, "
+              f"dropped {log_writer.dropped_bytes} bytes / {log_writer.dropped_rows} rows)")
     except:
         pass
     try:
@@ -8,9 +8,13 @@ import struct
 import zipfile
 import datetime
 import configparser
+import json
 
 from PySide6.QtWidgets import QMessageBox
 
+# Общие модули наземки (src/gcs/telemetry) лежат уровнем выше
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # 🌐 Настройка Qt API
 os.environ['QT_API'] = 'pyside6'
 
@@ -35,7 +39,7 @@ from PySide6.QtWidgets import (
 
 from PySide6.QtGui    import QDrag, QMouseEvent, QDropEvent, QDragEnterEvent, QDragMoveEvent
 from PySide6.QtCore   import QByteArray, QMimeData
-from PySide6.QtWidgets import QPlainTextEdit
+from PySide6.QtWidgets import QPlainTextEdit, QComboBox
 
 # 🔄 Qt Core — Сигналы, Слоты, Таймеры, Потоки
 from qtpy.QtCore import (
@@ -63,10 +67,12 @@ import pyqtgraph.opengl as gl
 from pyqtgraph.opengl import MeshData, GLMeshItem
 
 # === ПАРАМЕТРЫ ПАРСЕРА ===
+from telemetry import checksum, codec, o2, relay, replay
+from telemetry.scheduler import FrameCoalescer
 PL, R0 = 1000, 4000
 NAKLON, SMESHENIE = -0.7565, 1.269
 SCALE = math.pow(10, -SMESHENIE / NAKLON)
-STRUCT_FMT = "<2HIhI6hBHBH4h3fB3HB"  # 60 bytes
+STRUCT_FMT = codec.PACKET_FMT  # 60 bytes
 
 # === ЦВЕТОВАЯ СХЕМА ===
 COLORS = {
@@ -117,9 +123,30 @@ class ExportLogsThread(QThread):
         except Exception as e:
             self.finished.emit("", False, str(e))
 
+class ReplayIndexThread(QThread):
+    """Фоновая индексация файла имитации (mmap + поиск кадров по кускам), как в tw.py."""
+    progress = Signal(int, int)   # байт просмотрено, всего
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.index = None
+        self.error = ""
+
+    def run(self):
+        try:
+            index = replay.ReplayIndex.open(self.path, build=False)
+            if index.build(progress=self.progress.emit, cancel=self.isInterruptionRequested):
+                self.index = index
+            else:
+                index.close()
+        except Exception as e:
+            self.error = str(e)
+
 # === WORKER ДЛЯ UART + UDP + ЛОГОВ + CRC-ОШИБОК ===
 class TelemetryWorker(QThread):
-    data_ready    = Signal(dict)
+    data_ready    = Signal(dict)   # пакет по одному, если кольцо (ring) не подключено
+    batch_ready   = Signal()       # в ring появилась пачка пакетов; не чаще раза за кадр
     packet_ready  = Signal(list)
     log_ready     = Signal(str)
     error_crc     = Signal()
@@ -130,6 +157,10 @@ class TelemetryWorker(QThread):
         # для дросселя CRC‑варнингов
         self.last_crc_warning = 0.0
         self.crc_cooldown    = 1.0   # не более 1 варнинга в секунду
+        # Общее с окном кольцо пакетов (FrameCoalescer); задаёт MainWindow
+        self.ring = None
+        # Двоичный режим ретрансляции ([UDP] binary_relay в config.ini), иначе JSON
+        self.udp_binary = False
         self.port_name = port_name
         self.baud = baud
         self._running = True
@@ -142,6 +173,10 @@ class TelemetryWorker(QThread):
         # Для режима имитации
         self.sim_enabled   = False
         self.sim_file_path = ""
+        self.replay = None      # индекс кадров файла, темп по полю time; задаёт MainWindow
+        self.replay_speed = 1.0
+        # Смена файла/скорости из окна: применяются в этом потоке в начале цикла
+        self._replay_requests = deque()
         # Логи
         now = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         os.makedirs("log", exist_ok=True)
@@ -149,7 +184,7 @@ class TelemetryWorker(QThread):
         self.csv_path = f"log/grib_{now}.csv"
         self.f_bin = open(self.bin_path, "ab")
         self.f_csv = open(self.csv_path, "w", encoding="utf-8")
-        headers = [f"field_{i}" for i in range(len(struct.unpack(STRUCT_FMT, b'\x00'*60)))]
+        headers = [f"field_{i}" for i in range(len(codec.FIELDS))]
         self.f_csv.write(";".join(headers) + "\n")
 
         #from functools import reduce
@@ -157,10 +192,7 @@ class TelemetryWorker(QThread):
         #def xor_block(self, data: bytes) -> int:
             #return reduce(operator.xor, data, 0)
     def xor_block(self, data: bytes) -> int:
-            res = 0
-            for b in data:
-                res ^= b
-            return res
+            return checksum.xor_block(data)
 
     @Slot(bool, str)
     def update_simulation(self, enabled, file_path):
@@ -189,11 +221,35 @@ class TelemetryWorker(QThread):
         self.log_ready.emit(f"[{ts}] UDP settings updated: enabled={enabled}, host={host}, port={port}")
         if enabled:
             self.udp_socket.bind(('', self.udp_port))
-            self.udp_socket.sendto(b"status", (self.udp_host, self.udp_port))
-            self.log_ready.emit(f"[{datetime.datetime.now()}] UDP bound to port {self.udp_port} and 'status' sent")
+            # Режим выбирается приветствием: сырые кадры или JSON, как в tw.py
+            hello = relay.HELLO_BIN if self.udp_binary else relay.HELLO_JSON
+            self.udp_socket.sendto(hello, (self.udp_host, self.udp_port))
+            self.log_ready.emit(f"[{datetime.datetime.now()}] UDP bound to port {self.udp_port} "
+                                f"and '{hello.decode()}' sent")
         else:
             self.log_ready.emit(f"[{datetime.datetime.now()}] UDP disabled; socket closed")
 
+    def set_replay(self, rp):
+        """Новый Replay (или None) из потока окна; старый индекс закроет поток приёма."""
+        self._replay_requests.append(("replay", rp))
+
+    @Slot(float)
+    def set_replay_speed(self, speed):
+        """Скорость имитации: множитель 0.5–100 или replay.AFAP («как можно быстрее»)."""
+        self._replay_requests.append(("speed", speed))
+
+    def _apply_replay_requests(self):
+        while self._replay_requests:
+            kind, value = self._replay_requests.popleft()
+            if kind == "replay":
+                old, self.replay = self.replay, value
+                if old is not None:
+                    old.index.close()
+            elif kind == "speed":
+                self.replay_speed = value
+                if self.replay is not None:
+                    self.replay.set_speed(value)
+
     def pause(self):
         self._paused = True
 
@@ -206,25 +262,81 @@ class TelemetryWorker(QThread):
     def stop(self):
         self._running = False
 
+    def _publish(self, data):
+        """В кольцо с одним сигналом на пачку или сигналом data_ready."""
+        if self.ring is None:
+            self.data_ready.emit(data)
+        elif self.ring.push(data):
+            self.batch_ready.emit()
+
+    def _handle_json(self, rcv: bytes):
+        """Пакет JSON от gcs.py: значения уже в физических единицах."""
+        try:
+            d = json.loads(rcv.decode("utf-8"))
+            data = {
+                "packet_num": d["packet_num"],
+                "timestamp": d["time"],
+                "temp_bmp": d["temp_bmp"],
+                "press_bmp": d["press_bmp"],
+                "accel": [d["accel_x"], d["accel_y"], d["accel_z"]],
+                "gyro": [d["gyro_x"], d["gyro_y"], d["gyro_z"]],
+                "state": d["state"],
+                "photo": d["photo"],
+                "mag": [d["mag_x"], d["mag_y"], d["mag_z"]],
+                "temp_ds": d["temp_ds"],
+                "gps": (d["gps_lat"], d["gps_lon"], d["gps_alt"]),
+                "gps_fix": d["gps_fix"],
+                "scd41": d["scd41"],
+                "mq4": d["mq4"],
+                "me2o2": d["me2o2"],
+                "crc": d["checksum_grib"],
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            self.log_ready.emit(f"[ERROR] Ошибка разбора JSON: {e}")
+            return
+        self._publish(data)
+        self.last_data_time = time.time()
+        # JSON несёт значения в физических единицах, а не кадр: в CSV пишутся они
+        self.f_csv.write(";".join(str(d.get(name, "")) for name in codec.FIELDS) + "\n")
+
     def run(self):
         buf = b""
         self.log_ready.emit("Telemetry thread started. Version 2.0 (Big Update)")
         self.log_ready.emit("Надёжная версия: 1.9")
 
         while self._running:
+            self._apply_replay_requests()
             try:
                 if self.sim_enabled and not self.udp_enabled:
-                    # Режим симуляции
-                    rcv = self.sim_f.read(60)
-                    if not rcv:
+                    # Режим симуляции: кадры выдаются по их бортовому времени.
+                    # Индекс строит ReplayIndexThread; пока он не готов — ждём
+                    if self.replay is None:
+                        time.sleep(0.05)
+                        continue
+                    # Пауза останавливает и часы воспроизведения: после неё кадры не хлынут пачкой
+                    if self._paused:
+                        self.replay.pause()
+                    else:
+                        self.replay.resume()
+                    if self.replay.done:
                         self.log_ready.emit("[SIM] End of file reached")
                         self.sim_ended.emit()      # <-- + эмитим сигнал о конце
                         break
-                    time.sleep(1)  # чуть-чуть притормозим, как будто приходят данные
+                    time.sleep(self.replay.wait_time(0.05))
+                    index = self.replay.index
+                    rcv = b"".join(index.frame(i) for i in self.replay.take_due())
+                    if not rcv:
+                        continue
                 else:
                     # Режим UDP
                     try:
                         rcv = self.udp_socket.recv(60*100)
+                        if relay.is_relay(rcv):
+                            rcv = b"".join(bytes(f.frame) for f in relay.unpack(rcv) if f.crc_ok)
+                        elif rcv[:1] == b"{":
+                            if not self._paused:
+                                self._handle_json(rcv)
+                            continue
                     except Exception as e:
                         continue
             except Exception as e:
@@ -240,7 +352,7 @@ class TelemetryWorker(QThread):
                 if buf[:2] == b"\xAA\xAA":
                     chunk = buf[:60]
                     try:
-                        pkt = struct.unpack(STRUCT_FMT, chunk)
+                        pkt = codec.decode(buf)
                     except struct.error:
                         buf = buf[1:]
                         continue
@@ -261,14 +373,14 @@ class TelemetryWorker(QThread):
                                 "gps_fix": pkt[22],
                                 "scd41": pkt[23],
                                 "mq4": pkt[24],
-                                "me2o2": pkt[25],
+                                "me2o2": o2.percent(pkt[25]),   # как в JSON gcs.py
                                 "crc": pkt[-1]
                             }
                         except Exception as e:
                             self.log_ready.emit(f"[ERROR] Ошибка парсинга пакета: {e}")
                             buf = buf[60:]
                             continue
-                        self.data_ready.emit(data)
+                        self._publish(data)
                         self.last_data_time = time.time()
                         self.f_csv.write(";".join(str(x) for x in pkt) + "\n")
                         self.f_bin.write(chunk)
@@ -283,11 +395,12 @@ class TelemetryWorker(QThread):
                 else:
                     buf = buf[1:]
 
-        if self.sim_f:
-            self.sim_f.close()
-            self.f_bin.close()
-            self.f_csv.close()
-            self.log_ready.emit(f"[{datetime.datetime.now()}] TelemetryWorker stopped")
+        self._apply_replay_requests()
+        if self.replay is not None:
+            self.replay.index.close()
+        self.f_bin.close()
+        self.f_csv.close()
+        self.log_ready.emit(f"[{datetime.datetime.now()}] TelemetryWorker stopped")
 
     sim_ended = Signal()  # <-- новый сигнал
 
@@ -562,6 +675,8 @@ class DraggableCard(QFrame):
 class GraphsPage(QWidget):
     def __init__(self):
         super().__init__()
+        # Пакеты, пришедшие пока вкладка скрыта (графики хранят максимум 200 точек, история — 600)
+        self._backlog = deque(maxlen=600)
         layout = QGridLayout(self)
         # === System Monitor ===
         import psutil
@@ -956,21 +1071,27 @@ class GraphsPage(QWidget):
 
     @Slot(dict)
     def update_charts(self, data):
-        import time
-        now = time.time()
-        if not hasattr(self, '_last_chart_update'):
-            self._last_chart_update = 0
-        # не чаще 20 FPS
-        if now - self._last_chart_update < 0.05:
+        self.update_charts_batch([data])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._backlog:
+            QTimer.singleShot(0, lambda: self.update_charts_batch([]))
+
+    def update_charts_batch(self, packets):
+        """Update all charts with every packet of a UI frame; one repaint per chart"""
+        # Скрытая вкладка копит пакеты (не больше, чем влезет в графики) до showEvent
+        if not self.isVisible():
+            self._backlog.extend(packets)
             return
-        self._last_chart_update = now
-        """Update all charts with new data"""
+        if self._backlog:
+            packets = list(self._backlog) + list(packets)
+            self._backlog.clear()
         for name, chart_data in self.charts.items():
-            if name not in data:
+            values = [d[name] for d in packets if name in d]
+            if not values:
                 continue
 
-            value = data.get(name)
-            index = self.indexes.get(name, 0)
             x_axis = chart_data["x_axis"]
             max_points = self.data_points.get(name, 200)
 
@@ -981,84 +1102,50 @@ class GraphsPage(QWidget):
             # Check if this is a multi-axis chart
             if chart_data.get("multi_axis", False):
                 # Multi-axis data (accel, gyro, mag)
+                values = [v for v in values if isinstance(v, list) and len(v) >= 3]
                 series_list = chart_data["series"]
-
-                if isinstance(value, list) and len(value) >= 3:
-                    data_values = []
-
-                    for i in range(3):
-                        series = series_list[i]
-                        if series.count() >= max_points:
-                            # + Удаляем старые точки разом вместо поштучного удаления
-                            points_to_keep = []
-                            for j in range(1, series.count()):
-                                point = series.at(j)
-                                # Сдвигаем X-координаты
-                                points_to_keep.append(QPointF(j-1, point.y()))
-
-                            series.clear()
-                            series.append(points_to_keep)
-
-                        # Add new point
-                        series.append(series.count(), value[i])
-                        data_values.append(value[i])
-
-                    # + Обновляем историю данных для автомасштабирования
-                    history = self.data_history.get(name, [])
-                    history.extend(data_values)
-                    # Ограничиваем количество сохраненных точек
-                    max_history = max_points * 3  # Храним максимум в 3 раза больше точек чем отображаем
-                    if len(history) > max_history:
-                        history = history[-max_history:]
-                    self.data_history[name] = history
-
-                    # Auto-scale Y axis based on all three values
-                    self.auto_scale_y_axis(name, data_values)
-
+                count_series = series_list[0]
+                columns = [[v[i] for v in values] for i in range(3)]
+                data_values = [x for v in values for x in v[:3]]
             else:
                 # Single-value data
-                series = chart_data["series"]
-
-                if isinstance(value, (int, float)):
-                    if series.count() >= max_points:
-                        # + Оптимизация: вместо поштучного обновления точек
-                        points_to_keep = []
-                        for j in range(1, series.count()):
-                            point = series.at(j)
-                            # Сдвигаем X-координаты
-                            points_to_keep.append(QPointF(j-1, point.y()))
-
-                        series.clear()
-                        series.append(points_to_keep)
-
-                    # Add new point
-                    series.append(series.count(), value)
-
-                    # + Обновляем историю данных
-                    history = self.data_history.get(name, [])
-                    history.append(value)
-                    # Ограничиваем количество сохраненных точек
-                    if len(history) > max_points * 3:
-                        history = history[-max_points*3:]
-                    self.data_history[name] = history
-
-                    # Auto-scale Y axis based on current value
-                    self.auto_scale_y_axis(name, [value])
+                values = [v for v in values if isinstance(v, (int, float))]
+                series_list = [chart_data["series"]]
+                count_series = series_list[0]
+                columns = [values]
+                data_values = values
+            if not values:
+                chart_view.setUpdatesEnabled(True)
+                continue
+
+            # + Старые точки + новые, последние max_points, X заново с нуля; один replace() на серию
+            for series, column in zip(series_list, columns):
+                ys = [p.y() for p in series.points()] + column
+                ys = ys[-max_points:]
+                series.replace([QPointF(j, y) for j, y in enumerate(ys)])
+
+            # + Обновляем историю данных для автомасштабирования
+            history = self.data_history.get(name, [])
+            history.extend(data_values)
+            # Храним максимум в 3 раза больше точек чем отображаем
+            max_history = max_points * 3
+            if len(history) > max_history:
+                history = history[-max_history:]
+            self.data_history[name] = history
+            self.auto_scale_y_axis(name, data_values)
 
             # Update index
-            self.indexes[name] = index + 1
+            self.indexes[name] = self.indexes.get(name, 0) + len(values)
 
             # Update X axis to always show the latest points
-            visible_points = min(max_points, series.count() if not chart_data.get("multi_axis") else series_list[0].count())
+            visible_points = min(max_points, count_series.count())
             if visible_points > 0:
                 # + Устанавливаем диапазон X с небольшим отступом справа
                 x_axis.setRange(0, visible_points + 5)  # +5 для небольшого отступа справа
 
             # + Разрешаем обновления после всех изменений
             chart_view.setUpdatesEnabled(True)
-
-            # + Обновляем только по необходимости
-            chart_data["view"].update()
+            chart_view.update()
 import numpy as np
 def load_mesh_obj(filename: str, max_faces: int = 1000) -> MeshData:
     """
@@ -1357,6 +1444,15 @@ class TestPage(QWidget):
             mesh.resetTransform()
         self.orientation_label.setText("Ориентация: R:0.0° P:0.0° Y:0.0°")
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.setInterval(12)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Фильтру хватает 10 Гц, пока модель никто не видит
+        self.timer.setInterval(100)
+
     def _on_frame(self):
         import math
         now = time.time()
@@ -1370,6 +1466,10 @@ class TestPage(QWidget):
             dt
         )
 
+        # Скрытая вкладка: фильтр ориентации считаем дальше, а сцену не рисуем
+        if not self.isVisible():
+            return
+
         # извлекаем Эйлеровы углы из q
         w, x, y, z = self.q
         roll  = math.atan2(2*(w*x + y*z),    w*w - x*x - y*y + z*z)
@@ -1631,6 +1731,7 @@ class LogPage(QWidget):
 class SettingsPage(QWidget):
     settings_changed      = Signal(bool, str, int)
     simulator_changed     = Signal(bool, str)
+    sim_speed_changed     = Signal(float)
 
     def __init__(self):
         super().__init__()
@@ -1642,6 +1743,8 @@ class SettingsPage(QWidget):
         udp_enabled  = self.cfg.get("UDP", "enabled", fallback="False") == "True"
         host         = self.cfg.get("UDP", "host",    fallback="127.0.0.1")
         port         = self.cfg.getint("UDP", "port", fallback=5005)
+        # Двоичный режим ретрансляции gcs.py; по умолчанию JSON, как в tw.py
+        self.binary_relay = self.cfg.getboolean("UDP", "binary_relay", fallback=False)
         sim_enabled  = self.cfg.get("Settings", "simulation",    fallback="False") == "True"
         auto_save    = self.cfg.getboolean("Settings", "auto_save",            fallback=False)
         auto_interval= self.cfg.getint    ("Settings", "auto_save_interval",  fallback=5)
@@ -1689,6 +1792,19 @@ class SettingsPage(QWidget):
         hl.addWidget(self.sim_file_path)
         hl.addWidget(btn_browse)
         v2.addLayout(hl)
+        # Скорость воспроизведения по бортовому времени (применяется сразу)
+        self.sim_speed = QComboBox()
+        for title, speed in (("0.5×", 0.5), ("1×", 1.0), ("2×", 2.0), ("5×", 5.0), ("10×", 10.0),
+                             ("25×", 25.0), ("100×", 100.0), ("Максимум", replay.AFAP)):
+            self.sim_speed.addItem(title, speed)
+        idx = self.sim_speed.findText(self.cfg.get("Settings", "sim_speed", fallback="1×"))
+        self.sim_speed.setCurrentIndex(idx if idx >= 0 else 1)
+        self.sim_speed.currentIndexChanged.connect(
+            lambda _: self.sim_speed_changed.emit(self.sim_speed.currentData()))
+        hs = QHBoxLayout()
+        hs.addWidget(QLabel("Скорость"))
+        hs.addWidget(self.sim_speed)
+        v2.addLayout(hs)
         layout.addWidget(sim_card)
 
         # Disable simulation block when UDP is on
@@ -1759,12 +1875,14 @@ class SettingsPage(QWidget):
         self.cfg["UDP"] = {
             "enabled": str(self.udp_enable.isChecked()),
             "host":    self.udp_ip.text(),
-            "port":    self.udp_port.text()
+            "port":    self.udp_port.text(),
+            "binary_relay": str(self.binary_relay)
         }
         # Settings section (simulation)
         if "Settings" not in self.cfg:
             self.cfg["Settings"] = {}
         self.cfg["Settings"]["simulation"]    = str(self.sim_enable.isChecked())
+        self.cfg["Settings"]["sim_speed"]     = self.sim_speed.currentText()
 
         # store auto-save into cfg
         self.cfg["Settings"]["auto_save"] = str(self.auto_save_chk.isChecked())
@@ -2035,17 +2153,24 @@ class MainWindow(QMainWindow):
 
         # Telemetry worker
         self.worker = TelemetryWorker("COM3", 9600)
+        self.replay_indexer = None       # ReplayIndexThread текущего файла имитации
+        self._stale_indexers = []
+        self.worker.udp_binary = self.settings.binary_relay
 
-        # Буфер пакетов и таймер для отложенного UI-обновления
-        self.packet_buffer = deque()
+        # Буфер пакетов: склейка в кадры интерфейса со счётчиками (telemetry/scheduler.py)
+        self.ui_scheduler = FrameCoalescer()
         self.ui_timer      = QTimer(self)
         self.ui_timer.timeout.connect(self.flush_buffered_packets)
-        self.ui_timer.start(50)  # обновлять UI не чаще чем раз в 50 ms
+        self.ui_timer.start(int(self.ui_scheduler.max_interval * 1000))
+        self._last_flush = time.monotonic()
 
         self.worker.sim_ended.connect(self.test.reset_orientation)
 
         self.tel.set_worker(self.worker)
-        self.worker.data_ready.connect(self.packet_buffer.append)
+        # Пакеты идут через общее кольцо ui_scheduler: один сигнал на пачку, а не на пакет
+        self.worker.ring = self.ui_scheduler
+        self.worker.batch_ready.connect(self._on_batch_ready)
+        self.worker.data_ready.connect(self.ui_scheduler.push)
         self.worker.log_ready.connect(self.log_page.add_log_message)
         self.worker.error_crc.connect(QApplication.beep)
 
@@ -2054,6 +2179,8 @@ class MainWindow(QMainWindow):
         # Теперь подключаем обработчики сигналов
         self.settings.settings_changed.connect(self.worker.update_udp)
         self.settings.simulator_changed.connect(self.on_simulator_changed)
+        self.worker.set_replay_speed(self.settings.sim_speed.currentData())
+        self.settings.sim_speed_changed.connect(self.worker.set_replay_speed)
         # автосохранение логов
         self.settings.save_settings()  # чтобы cfg обновился
         self.log_page.configure_auto_save(
@@ -2113,15 +2240,39 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentIndex(idx)
 
     def on_simulator_changed(self, enabled: bool, filepath: str):
+        self.worker.set_replay(None)
+        if self.replay_indexer is not None:
+            # Прерванный индексатор держим, пока он не завершится
+            self.replay_indexer.requestInterruption()
+            self._stale_indexers.append(self.replay_indexer)
+            self.replay_indexer = None
+        self._stale_indexers = [t for t in self._stale_indexers if not t.isFinished()]
         self.worker.sim_enabled = enabled
         if enabled:
-            try:
-                self.worker.sim_f = open(filepath, "rb")
-            except Exception as e:
-                print(f"[Ошибка открытия файла симуляции]: {e}")
-                self.worker.sim_enabled = False
+            # Большой лог индексируется в фоне, окно не замирает
+            indexer = self.replay_indexer = ReplayIndexThread(filepath, self)
+            indexer.finished.connect(lambda: self._on_replay_indexed(indexer))
+            indexer.start()
+            self.log_page.add_log_message(f"[SIM] Indexing {filepath}…")
         self.test.reset_orientation()
 
+    def _on_replay_indexed(self, indexer):
+        if indexer is not self.replay_indexer:
+            if indexer.index is not None:
+                indexer.index.close()    # файл уже сменили
+            return
+        self.replay_indexer = None
+        index = indexer.index
+        if index is None:
+            print(f"[Ошибка открытия файла симуляции]: {indexer.error or 'прервано'}")
+            self.log_page.add_log_message(f"[ERROR] Failed to open simulation file {indexer.path}: "
+                                          f"{indexer.error or 'прервано'}")
+            self.worker.sim_enabled = False
+            return
+        self.log_page.add_log_message(f"[SIM] Opened simulation file: {indexer.path} "
+                                      f"({len(index)} пакетов, {index.duration():.1f} с)")
+        self.worker.set_replay(replay.Replay(index, speed=self.settings.sim_speed.currentData()))
+
     def closeEvent(self, event):
         # save graph layout
         try:
@@ -2130,16 +2281,29 @@ class MainWindow(QMainWindow):
             pass
         self.worker.stop()
         self.worker.wait(1000)
+        for indexer in [self.replay_indexer, *self._stale_indexers]:
+            if indexer is not None:
+                indexer.requestInterruption()
+                indexer.wait(1000)
         super().closeEvent(event)
 
+    def _on_batch_ready(self):
+        """В кольце новая пачка: забрать сразу, если кадр уже можно рисовать (не чаще min_interval)."""
+        if time.monotonic() - self._last_flush >= self.ui_scheduler.min_interval:
+            self.flush_buffered_packets()
+
     def flush_buffered_packets(self):
-        # Берём только самый свежий пакет и сбрасываем устаревшие
-        if self.packet_buffer:
-            data = self.packet_buffer.pop()
-            self.packet_buffer.clear()
+        # Графикам — все пакеты кадра, карточкам и ориентации — последний
+        self._last_flush = time.monotonic()
+        packets = self.ui_scheduler.take()
+        if packets:
+            data = packets[-1]
             self.tel.update_values(data)
-            self.graphs.update_charts(data)
+            self.graphs.update_charts_batch(packets)
             self.test.update_orientation(data)
+        # Следующий кадр — по темпу пакетов; свёрнутое окно обновляем реже
+        # Отсчёт — от этого кадра, даже если его вызвал batch_ready, а не таймер
+        self.ui_timer.start(int(self.ui_scheduler.next_interval(not self.isMinimized()) * 1000))
 
     @Slot()
     def toggle_pause_shortcut(self):
@@ -2161,6 +2325,7 @@ class MainWindow(QMainWindow):
                 "resume": "продолжить прием",
                 "version":"версия программы",
                 "errors": "показать WARN/ERROR",
+                "ui":     "счётчики кадров интерфейса",
                 "help":   "список команд",
             }
             hotkeys = {
@@ -2180,6 +2345,11 @@ class MainWindow(QMainWindow):
         if cmd == "version":
             self.console.write_response("Grib Telemetry Dashboard v1.7 — program 'grib'")
             return
+        # ui: счётчики кадров интерфейса
+        if cmd == "ui":
+            for k, v in self.ui_scheduler.stats().items():
+                self.console.write_response(f"{k}: {v}")
+            return
 
         # pause/resume without data-check
         if cmd in ("pause", "resume"):
@@ -0,0 +1,5 @@
+"""Общие модули наземной станции: разбор и проверка пакетов ГРИБа.
+
+Используются gcs.py (Raspberry Pi), bin.py, tw/tw.py и gribexe/main.py,
+чтобы формат пакета описывался в одном месте.
+"""
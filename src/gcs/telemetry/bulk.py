@@ -0,0 +1,116 @@
+"""Пакетный разбор .bin логов через NumPy.
+
+Весь файл читается одним массивом байт, заголовки 0xAAAA и XOR-суммы
+проверяются векторно для всех кандидатов сразу, а найденные кадры
+превращаются в структурированный массив с dtype, повторяющим packet_t.
+"""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from telemetry import codec
+
+# struct-код -> код numpy (little-endian, без выравнивания)
+_NP_CODES = {"B": "u1", "b": "i1", "H": "<u2", "h": "<i2",
+             "I": "<u4", "i": "<i4", "f": "<f4", "d": "<f8"}
+
+
+def _dtype_from_format(fmt: str, fields) -> np.dtype:
+    codes = []
+    for count, code in re.findall(r"(\d*)([a-zA-Z])", fmt.lstrip("<=")):
+        codes.extend([_NP_CODES[code]] * int(count or 1))
+    return np.dtype(list(zip(fields, codes)))
+
+
+PACKET_DTYPE = _dtype_from_format(codec.PACKET_FMT, codec.FIELDS)
+assert PACKET_DTYPE.itemsize == codec.PACKET_SIZE
+
+BulkLog = namedtuple("BulkLog", "records offsets crc_failures")
+
+
+def find_frames(data: np.ndarray):
+    """Смещения кадров с верной checksum_grib и число кандидатов с ошибкой CRC.
+
+    Повторяет логику построчного разбора: после принятого кадра поиск
+    продолжается с его конца, после ошибки — со следующего байта.
+    """
+    size = codec.PACKET_SIZE
+    if len(data) < size:
+        return np.empty(0, dtype=np.int64), 0
+    # Кандидаты: 0xAA 0xAA, после которых помещается целый пакет
+    head = data[:len(data) - size + 1]
+    cand = np.flatnonzero((head == 0xAA) & (data[1:len(data) - size + 2] == 0xAA))
+    # Префиксный XOR: xor(data[i:i+59]) == px[i+59] ^ px[i]
+    px = np.zeros(len(data) + 1, dtype=np.uint8)
+    np.bitwise_xor.accumulate(data, out=px[1:])
+    ok = (px[cand + size - 1] ^ px[cand]) == data[cand + size - 1]
+    offsets = cand[ok]
+    crc_failures = int(len(cand) - len(offsets))
+    # Перекрывающиеся кадры (ложный 0xAAAA внутри пакета) отбрасываем жадно
+    if len(offsets) > 1 and np.any(np.diff(offsets) < size):
+        keep = []
+        next_free = -1
+        for off in offsets.tolist():
+            if off >= next_free:
+                keep.append(off)
+                next_free = off + size
+        offsets = np.asarray(keep, dtype=np.int64)
+    return offsets, crc_failures
+
+
+def decode_buffer(buf) -> BulkLog:
+    """Разобрать буфер (bytes, memoryview или массив uint8) целиком."""
+    data = np.frombuffer(buf, dtype=np.uint8) if not isinstance(buf, np.ndarray) else buf
+    offsets, crc_failures = find_frames(data)
+    raw = data[offsets[:, None] + np.arange(codec.PACKET_SIZE)]
+    records = raw.view(PACKET_DTYPE).reshape(-1)
+    return BulkLog(records, offsets, crc_failures)
+
+
+def decode_file(path: str) -> BulkLog:
+    """Разобрать .bin лог (grib_*.bin или дамп с SD-карты)."""
+    return decode_buffer(np.fromfile(path, dtype=np.uint8))
+
+
+def columns(records: np.ndarray) -> dict:
+    """Столбцы структурированного массива: имя поля -> np.ndarray."""
+    return {name: records[name] for name in records.dtype.names}
+
+
+# Перевод в физические единицы (как в bin.py и packet_structure в telemetry_config.json)
+SCALES = {
+    "temp_bmp": 1 / 100,                                  # °C
+    "accel_x": 488 / 1000 / 1000, "accel_y": 488 / 1000 / 1000, "accel_z": 488 / 1000 / 1000,  # g
+    "gyro_x": 70 / 1000, "gyro_y": 70 / 1000, "gyro_z": 70 / 1000,                             # °/с
+    "photo": 1 / 1000,
+    "mag_x": 1 / 1711, "mag_y": 1 / 1711, "mag_z": 1 / 1711,                                   # Гс
+    "temp_ds": 1 / 16,                                    # °C
+}
+MASKS = {"state": 0x07}
+
+
+def physical(records: np.ndarray) -> dict:
+    """Столбцы в физических единицах: масштабы SCALES, маски MASKS, остальное как есть."""
+    out = {}
+    for name in records.dtype.names:
+        col = records[name]
+        if name in SCALES:
+            col = col * SCALES[name]
+        elif name in MASKS:
+            col = col & MASKS[name]
+        out[name] = col
+    return out
+
+
+def sequence_gaps(packet_num: np.ndarray, modulo: int = 1 << 16):
+    """(число разрывов, потеряно пакетов) по packet_num с переполнением через modulo.
+
+    Шаг 0 (повтор) и скачок назад больше половины диапазона разрывами не
+    считаются — это дубликат или перезапуск платы, а не потеря.
+    """
+    if len(packet_num) < 2:
+        return 0, 0
+    step = np.diff(packet_num.astype(np.int64)) % modulo
+    lost = step[(step > 1) & (step < modulo // 2)] - 1
+    return int(len(lost)), int(lost.sum())
@@ -0,0 +1,113 @@
+"""XOR-контрольные суммы пакета, как их считает xorBlock() в appmain.c.
+
+    cheksum_org   = xorBlock(&packet, 26)                    -> байт 26
+    checksum_grib = xorBlock(&packet, sizeof(packet_t) - 1)  -> байт 59
+
+Вместо цикла по байтам блок читается одним целым (int.from_bytes) и
+сворачивается пополам сдвигами: для 59 байт это 6 операций XOR над
+длинным целым. Сдвиги для каждой длины считаются один раз и кешируются.
+"""
+from telemetry import codec
+
+ORG_LEN = 26                         # байты под cheksum_org
+GRIB_LEN = codec.PACKET_SIZE - 1     # байты под checksum_grib
+
+_shift_table = {}
+
+
+def _shifts(n: int) -> tuple:
+    """Сдвиги (в битах) для свёртки n байт: 256, 128, ..., 8."""
+    shifts = _shift_table.get(n)
+    if shifts is None:
+        width = 1
+        while width < n:
+            width *= 2
+        out = []
+        while width > 1:
+            width //= 2
+            out.append(width * 8)
+        shifts = _shift_table[n] = tuple(out)
+    return shifts
+
+
+def xor_block(data) -> int:
+    """XOR всех байт блока (bytes, bytearray или memoryview)."""
+    v = int.from_bytes(data, "little")
+    for s in _shifts(len(data)):
+        # Верхняя половина после сдвига не маскируется: на младший байт
+        # влияют только уже свёрнутые биты
+        v ^= v >> s
+    return v & 0xFF
+
+
+def checksum_org(frame) -> int:
+    return xor_block(frame[:ORG_LEN])
+
+
+def checksum_grib(frame) -> int:
+    return xor_block(frame[:GRIB_LEN])
+
+
+def verify(frame) -> bool:
+    """Проверка checksum_grib (последний байт пакета)."""
+    return xor_block(frame[:GRIB_LEN]) == frame[GRIB_LEN]
+
+
+def verify_org(frame) -> bool:
+    """Проверка старой суммы cheksum_org по первым 26 байтам."""
+    return xor_block(frame[:ORG_LEN]) == frame[ORG_LEN]
+
+
+def seal(frame: bytearray) -> bytearray:
+    """Проставить обе суммы в собранный пакет (для имитаторов и тестов)."""
+    frame[ORG_LEN] = xor_block(frame[:ORG_LEN])
+    frame[GRIB_LEN] = xor_block(frame[:GRIB_LEN])
+    return frame
+
+
+def validate_many(buf, offsets, size: int = codec.PACKET_SIZE, org: bool = False) -> list:
+    """Проверить сразу много кандидатов в одном буфере.
+
+    Возвращает список bool той же длины, что offsets. Буфер оборачивается
+    в memoryview один раз, срезы кандидатов не копируются.
+    """
+    view = memoryview(buf)
+    n = ORG_LEN if org else size - 1
+    shifts = _shifts(n)
+    from_bytes = int.from_bytes
+    result = []
+    for off in offsets:
+        if off + size > len(view):
+            result.append(False)
+            continue
+        v = from_bytes(view[off:off + n], "little")
+        for s in shifts:
+            v ^= v >> s
+        result.append((v & 0xFF) == view[off + n])
+    return result
+
+
+def scan(buf, start: int = 0, end: int = None, size: int = codec.PACKET_SIZE,
+         header: bytes = codec.HEADER) -> list:
+    """Смещения всех целых пакетов с верной checksum_grib в buf[start:end].
+
+    Логика та же, что у построчного разбора: после верного пакета поиск
+    продолжается с его конца, после ошибки — со следующего байта.
+    """
+    if end is None:
+        end = len(buf)
+    view = memoryview(buf)
+    shifts = _shifts(size - 1)
+    from_bytes = int.from_bytes
+    found = []
+    pos = buf.find(header, start, end)
+    while pos >= 0 and pos + size <= end:
+        v = from_bytes(view[pos:pos + size - 1], "little")
+        for s in shifts:
+            v ^= v >> s
+        if (v & 0xFF) == view[pos + size - 1]:
+            found.append(pos)
+            pos = buf.find(header, pos + size, end)
+        else:
+            pos = buf.find(header, pos + 1, end)
+    return found
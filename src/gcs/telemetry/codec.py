@@ -0,0 +1,86 @@
+"""Кодек 60-байтного пакета телеметрии (packet_t из appmain.c).
+
+Формат компилируется один раз в struct.Struct, поэтому разбор пакета —
+это один вызов unpack_from без срезов и повторного парсинга строки формата.
+"""
+import struct
+from collections import namedtuple
+
+PACKET_FMT = "<2HIhI6hBHBH4h3fB3HB"  # 60 bytes
+START = 0xAAAA
+HEADER = b"\xAA\xAA"
+
+# Имена полей совпадают с telemetry_config.json и ключами JSON из gcs.py
+FIELDS = (
+    "header", "team_id", "time", "temp_bmp", "press_bmp",
+    "accel_x", "accel_y", "accel_z",
+    "gyro_x", "gyro_y", "gyro_z",
+    "checksum_org", "packet_num", "state", "photo",
+    "mag_x", "mag_y", "mag_z", "temp_ds",
+    "gps_lat", "gps_lon", "gps_alt", "gps_fix",
+    "scd41", "mq4", "me2o2", "checksum_grib",
+)
+
+Packet = namedtuple("Packet", FIELDS)
+
+
+def _codes(fmt: str) -> tuple:
+    """Код struct для каждого значения пакета: "<2HI" -> ("H", "H", "I")."""
+    codes, repeat = [], ""
+    for ch in fmt.lstrip("<>!=@"):
+        if ch.isdigit():
+            repeat += ch
+        else:
+            codes.extend(ch * int(repeat or 1))
+            repeat = ""
+    return tuple(codes)
+
+
+class PacketCodec:
+    """Скомпилированный формат пакета: decode / decode_many / encode."""
+
+    def __init__(self, fmt: str = PACKET_FMT, fields=None):
+        self.struct = struct.Struct(fmt)
+        self.format = fmt
+        self.size = self.struct.size
+        self.count = len(self.struct.unpack(bytes(self.size)))  # число значений в пакете
+        self.codes = _codes(fmt)
+        if fields is None and fmt == PACKET_FMT:
+            self.record = Packet
+        elif fields is not None:
+            self.record = namedtuple("Packet", fields)
+        else:
+            self.record = None
+        # Локальные ссылки, чтобы не искать атрибуты на каждом пакете
+        self._unpack_from = self.struct.unpack_from
+        self._make = self.record._make if self.record else tuple
+
+    def decode(self, buf, offset: int = 0):
+        """Разобрать один пакет, начиная с offset. Бросает struct.error, если байт мало."""
+        return self._make(self._unpack_from(buf, offset))
+
+    def decode_many(self, buf, offset: int = 0) -> list:
+        """Разобрать подряд идущие пакеты; хвост короче пакета игнорируется."""
+        count = (len(buf) - offset) // self.size
+        if count <= 0:
+            return []
+        view = memoryview(buf)[offset:offset + count * self.size]
+        make = self._make
+        return [make(values) for values in self.struct.iter_unpack(view)]
+
+    def encode(self, record) -> bytes:
+        """Собрать пакет из кортежа/Packet или словаря с именами полей."""
+        if isinstance(record, dict):
+            if self.record is None:
+                raise ValueError("encode(dict) requires field names")
+            record = [record[name] for name in self.record._fields]
+        return self.struct.pack(*record)
+
+
+# Кодек по умолчанию — формат прошивки
+default_codec = PacketCodec()
+PACKET_SIZE = default_codec.size
+
+decode = default_codec.decode
+decode_many = default_codec.decode_many
+encode = default_codec.encode
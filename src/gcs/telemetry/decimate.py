@@ -0,0 +1,117 @@
+"""Прореживание длинных рядов для графиков: min-max и LTTB.
+
+MinMaxDecimator хранит все точки полёта в полном разрешении и параллельно
+ведёт корзины фиксированного размера с индексами минимума и максимума.
+Новая точка обновляет только последнюю корзину. Когда корзин становится
+больше max_buckets, соседние корзины сливаются попарно, а размер корзины
+удваивается. Поэтому на точку уходит O(1) амортизированно, а на отрисовку —
+O(число корзин), а не O(длина полёта).
+"""
+from array import array
+
+
+class MinMaxDecimator:
+    def __init__(self, max_buckets: int = 4096):
+        self.max_buckets = max_buckets
+        self.xs = array("d")
+        self.ys = array("d")
+        self.bucket = 1          # точек в одной корзине
+        self._imin = []          # индекс минимума в каждой корзине
+        self._imax = []          # индекс максимума в каждой корзине
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def clear(self):
+        self.xs = array("d")
+        self.ys = array("d")
+        self.bucket = 1
+        self._imin = []
+        self._imax = []
+
+    def push(self, x: float, y: float):
+        ys = self.ys
+        i = len(ys)
+        self.xs.append(x)
+        ys.append(y)
+        if i % self.bucket == 0:
+            self._imin.append(i)
+            self._imax.append(i)
+            if len(self._imin) > self.max_buckets:
+                self._merge()
+        else:
+            if y < ys[self._imin[-1]]:
+                self._imin[-1] = i
+            if y > ys[self._imax[-1]]:
+                self._imax[-1] = i
+
+    def _merge(self):
+        ys = self.ys
+        imin, imax = self._imin, self._imax
+        new_min, new_max = [], []
+        for k in range(0, len(imin), 2):
+            a, b = imin[k], imin[k + 1] if k + 1 < len(imin) else imin[k]
+            new_min.append(a if ys[a] <= ys[b] else b)
+            a, b = imax[k], imax[k + 1] if k + 1 < len(imax) else imax[k]
+            new_max.append(a if ys[a] >= ys[b] else b)
+        self._imin, self._imax = new_min, new_max
+        self.bucket *= 2
+
+    def indices(self, buckets: int) -> list:
+        """Индексы точек для отрисовки: не больше 2 * buckets, по возрастанию X."""
+        n = len(self.ys)
+        if n <= 2 * buckets:
+            return list(range(n))
+        ys = self.ys
+        imin, imax = self._imin, self._imax
+        group = -(-len(imin) // max(1, buckets))   # сколько корзин на один пиксель
+        out = []
+        for k in range(0, len(imin), group):
+            lo = min(imin[k:k + group], key=ys.__getitem__)
+            hi = max(imax[k:k + group], key=ys.__getitem__)
+            if lo == hi:
+                out.append(lo)
+            elif lo < hi:
+                out.append(lo)
+                out.append(hi)
+            else:
+                out.append(hi)
+                out.append(lo)
+        # Последняя точка всегда видна, даже если она не экстремум
+        if out[-1] != n - 1:
+            out.append(n - 1)
+        return out
+
+    def points(self, buckets: int) -> list:
+        xs, ys = self.xs, self.ys
+        return [(xs[i], ys[i]) for i in self.indices(buckets)]
+
+
+def lttb(xs, ys, threshold: int) -> list:
+    """Largest-Triangle-Three-Buckets: индексы threshold точек, сохраняющих форму ряда."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    out = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Среднее по следующей корзине — третья вершина треугольника
+        start = int((i + 1) * every) + 1
+        end = min(int((i + 2) * every) + 1, n)
+        span = end - start
+        avg_x = sum(xs[start:end]) / span
+        avg_y = sum(ys[start:end]) / span
+        # Точка текущей корзины с наибольшей площадью треугольника
+        lo = int(i * every) + 1
+        hi = start
+        ax, ay = xs[a], ys[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out.append(best)
+        a = best
+    out.append(n - 1)
+    return out
@@ -0,0 +1,139 @@
+"""Настройка радиомодуля E220 без фиксированных пауз.
+
+Все регистры пишутся одной командой 0xC0, готовность модуля после смены
+режима определяется по пину AUX, а ответ модуля читается с дедлайном.
+Порт и GPIO передаются снаружи, поэтому вместо pyserial и RPi.GPIO можно
+подставить заглушки с теми же методами (write/read/reset_input_buffer,
+output/input/HIGH/LOW).
+"""
+import time
+
+CMD_WRITE = 0xC0
+CMD_READ = 0xC1
+REPLY = 0xC1
+
+# Регистры: ADDH, ADDL, REG0, REG1, REG2 (канал), REG3
+REG_ADDH = 0
+REG_COUNT = 6
+
+# Режим -> (M0, M1)
+MODE_PINS = {0: (0, 0), 1: (1, 0), 2: (0, 1), 3: (1, 1)}
+MODE_NORMAL = 0
+MODE_CONFIG = 3
+
+
+class E220Error(Exception):
+    pass
+
+
+def reg0(air_rate: int, parity: int, port_rate: int) -> int:
+    return air_rate | (parity << 3) | (port_rate << 5)
+
+
+def reg1(packet_len: int, rssi: int, power: int) -> int:
+    return power | (rssi << 5) | (packet_len << 6)
+
+
+def reg3(enable_rssi: int, method: int, lbt_enable: int, cycle: int) -> int:
+    return cycle | (lbt_enable << 4) | (method << 6) | (enable_rssi << 7)
+
+
+def registers(address: int, r0: int, r1: int, channel: int, r3: int) -> bytes:
+    """Шесть байт конфигурации начиная с ADDH — для одной записи 0xC0."""
+    return bytes((address >> 8 & 0xFF, address & 0xFF, r0, r1, channel, r3))
+
+
+class E220:
+    """Команды модуля поверх порта и GPIO; все ожидания ограничены дедлайном."""
+
+    def __init__(self, port, gpio, m0_pin: int, m1_pin: int, aux_pin: int,
+                 timeout: float = 0.3, poll: float = 0.002,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.port = port
+        self.gpio = gpio
+        self.m0_pin = m0_pin
+        self.m1_pin = m1_pin
+        self.aux_pin = aux_pin
+        self.timeout = timeout
+        self.poll = poll
+        self.clock = clock
+        self.sleep = sleep
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Дождаться AUX = 1 (модуль свободен). False — вышел дедлайн."""
+        deadline = self.clock() + (self.timeout if timeout is None else timeout)
+        while not self.gpio.input(self.aux_pin):
+            if self.clock() >= deadline:
+                return False
+            self.sleep(self.poll)
+        return True
+
+    def set_mode(self, mode: int) -> bool:
+        m0, m1 = MODE_PINS[mode]
+        gpio = self.gpio
+        gpio.output(self.m0_pin, gpio.HIGH if m0 else gpio.LOW)
+        gpio.output(self.m1_pin, gpio.HIGH if m1 else gpio.LOW)
+        # AUX падает не сразу после смены пинов — даём модулю один интервал опроса
+        self.sleep(self.poll)
+        return self.wait_ready()
+
+    def read_exact(self, n: int, timeout: float = None) -> bytes:
+        """Прочитать n байт или сколько успело прийти до дедлайна."""
+        port = self.port
+        deadline = self.clock() + (self.timeout if timeout is None else timeout)
+        saved = port.timeout
+        data = b""
+        try:
+            while len(data) < n:
+                left = deadline - self.clock()
+                if left <= 0:
+                    break
+                port.timeout = left
+                chunk = port.read(n - len(data))
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            port.timeout = saved
+        return data
+
+    def _command(self, cmd: int, start: int, count: int, payload: bytes = b"") -> bytes:
+        self.port.reset_input_buffer()
+        self.port.write(bytes((cmd, start, count)) + payload)
+        reply = self.read_exact(3 + count)
+        if len(reply) < 3 + count:
+            raise E220Error(f"no reply to 0x{cmd:02X} (got {reply.hex() or 'nothing'})")
+        if reply[0] != REPLY or reply[1] != start or reply[2] != count:
+            raise E220Error(f"bad reply header to 0x{cmd:02X}: {reply.hex()}")
+        return reply[3:]
+
+    def write_regs(self, start: int, values) -> bytes:
+        """Записать регистры одной командой 0xC0; возвращает эхо модуля."""
+        values = bytes(values)
+        echo = self._command(CMD_WRITE, start, len(values), values)
+        if echo != values:
+            raise E220Error(f"register echo mismatch: wrote {values.hex()}, got {echo.hex()}")
+        return echo
+
+    def read_regs(self, start: int = REG_ADDH, count: int = REG_COUNT) -> bytes:
+        return self._command(CMD_READ, start, count)
+
+    def configure(self, regs, read_back=None) -> bytes:
+        """Режим 3 -> запись всех регистров -> проверка чтением -> режим 0.
+
+        read_back() должен вернуть регистры начиная с ADDH (по умолчанию
+        read_regs); сравниваются только записанные байты.
+        """
+        regs = bytes(regs)
+        try:
+            if not self.set_mode(MODE_CONFIG):
+                raise E220Error("AUX stayed LOW after switching to config mode")
+            self.write_regs(REG_ADDH, regs)
+            current = bytes((read_back or self.read_regs)()[:len(regs)])
+            if current != regs:
+                raise E220Error(f"config verify failed: expected {regs.hex()}, read {current.hex()}")
+        finally:
+            ready = self.set_mode(MODE_NORMAL)
+        if not ready:
+            raise E220Error("AUX stayed LOW after switching to normal mode")
+        return current
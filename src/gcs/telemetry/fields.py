@@ -0,0 +1,108 @@
+"""Компиляция packet_structure.fields из telemetry_config.json в функцию.
+
+Раньше TelemetryWorker на каждом пакете проходил по списку полей и заново
+читал type/scale/mask/index. Теперь описание полей один раз превращается
+в исходник вида
+
+    def decode_fields(pkt):
+        return {"time": pkt[2], "temp_bmp": pkt[3] * 0.01, "state": pkt[13] & 7, ...}
+
+который компилируется через exec. Результат кешируется по содержимому
+конфигурации, так что перекомпиляция происходит только при её изменении.
+"""
+import json
+
+from telemetry import codec
+
+_cache = {}
+
+
+def _expr(index: int, scale, mask) -> str:
+    expr = f"pkt[{index}]"
+    if mask is not None:
+        expr = f"({expr} & {int(mask)})"
+    if scale is not None and scale != 1.0:
+        expr = f"{expr} * {float(scale)!r}"
+    return expr
+
+
+def compile_fields(fields, n_values: int = len(codec.FIELDS)):
+    """Вернуть (decode_fields, errors) для списка полей из конфигурации.
+
+    decode_fields(pkt) -> dict. В errors — описания полей, которые не
+    удалось скомпилировать (неверный index/indices); такие поля пропускаются.
+    """
+    key = (json.dumps(fields, sort_keys=True, ensure_ascii=False), n_values)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    items = []
+    errors = []
+    for field in fields:
+        name = field.get("name")
+        if not name:
+            continue  # Пропускаем поле без имени
+        scale = field.get("scale", 1.0)
+        mask = field.get("mask")
+        indices = field.get("indices")
+        index = field.get("index")
+        if field.get("type") == "vector3" and indices and len(indices) == 3:
+            if any(not -n_values <= i < n_values for i in indices):
+                errors.append(f"Invalid indices {indices} for packet length {n_values} in field {name}")
+                continue
+            expr = "[" + ", ".join(_expr(i, scale, None) for i in indices) + "]"
+        elif index is not None:
+            if not -n_values <= index < n_values:
+                errors.append(f"Invalid index {index} for packet length {n_values} in field {name}")
+                continue
+            expr = _expr(index, scale, mask)
+        else:
+            continue
+        items.append(f"        {name!r}: {expr},")
+
+    source = "def decode_fields(pkt):\n    return {\n" + "\n".join(items) + "\n    }\n"
+    namespace = {}
+    exec(compile(source, "<telemetry_config fields>", "exec"), namespace)
+    decode_fields = namespace["decode_fields"]
+    decode_fields.source = source
+    result = _cache[key] = (decode_fields, errors)
+    return result
+
+
+def compile_raw(fields, pkt_codec=codec.default_codec):
+    """Обратная к decode_fields функция: dict значений -> список значений кадра.
+
+    Нужна там, где приходят уже пересчитанные значения (JSON от gcs.py), а
+    хранить надо в формате прошивки. Масштаб делится обратно, для целых
+    полей результат округляется; маска не обращается (биты вне маски — 0).
+    Значения, которых нет в dict или в описании полей, остаются 0.
+    """
+    slots = []   # (имя, номер в dict-значении или None, индекс в кадре, масштаб)
+    for field in fields:
+        name = field.get("name")
+        if not name:
+            continue
+        scale = field.get("scale", 1.0) or 1.0
+        indices = field.get("indices")
+        index = field.get("index")
+        if field.get("type") == "vector3" and indices and len(indices) == 3:
+            slots.extend((name, k, i, scale) for k, i in enumerate(indices) if 0 <= i < pkt_codec.count)
+        elif index is not None and 0 <= index < pkt_codec.count:
+            slots.append((name, None, index, scale))
+    is_float = [code in "efd" for code in pkt_codec.codes]
+    count = pkt_codec.count
+
+    def raw_fields(data: dict) -> list:
+        pkt = [0] * count
+        for name, k, i, scale in slots:
+            value = data.get(name)
+            if value is None:
+                continue
+            if k is not None:
+                value = value[k]
+            value = value / scale if scale != 1.0 else value
+            pkt[i] = value if is_float[i] else int(round(value))
+        return pkt
+
+    return raw_fields
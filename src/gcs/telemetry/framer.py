@@ -0,0 +1,86 @@
+"""Выделение пакетов из потока байт UART без перевыделения буфера.
+
+Байты складываются в bytearray фиксированного размера с курсорами чтения
+и записи. Заголовок 0xAAAA ищется через find() по всему непрочитанному
+участку, а готовые кадры отдаются как memoryview без копирования.
+"""
+from telemetry import checksum, codec
+
+
+class Framer:
+    """Кольцевой буфер приёма с курсором чтения."""
+
+    def __init__(self, capacity: int = 4096, size: int = codec.PACKET_SIZE,
+                 header: bytes = codec.HEADER, check=checksum.verify):
+        if capacity < size:
+            raise ValueError("capacity must hold at least one packet")
+        self.capacity = capacity
+        self.size = size
+        self.header = header
+        self.check = check
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._r = 0
+        self._w = 0
+        # Статистика для логов
+        self.crc_errors = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._w - self._r
+
+    def pending(self) -> memoryview:
+        """Непрочитанные байты (для отладки)."""
+        return self._view[self._r:self._w]
+
+    def clear(self):
+        self._r = self._w = 0
+
+    def feed(self, data):
+        """Добавить принятые байты. Кадры, выданные frames(), после этого недействительны."""
+        n = len(data)
+        if n > self.capacity:
+            self.dropped += n - self.capacity
+            data = data[n - self.capacity:]
+            n = self.capacity
+        if self._w + n > self.capacity:
+            pending = self._w - self._r
+            if pending + n > self.capacity:
+                # Переполнение: выбрасываем самые старые байты
+                lost = pending + n - self.capacity
+                self.dropped += lost
+                self._r += lost
+                pending -= lost
+            # Сдвигаем хвост в начало; обычно это меньше одного пакета
+            self._buf[:pending] = bytes(self._view[self._r:self._w])
+            self._r, self._w = 0, pending
+        self._buf[self._w:self._w + n] = data
+        self._w += n
+
+    def frames(self):
+        """Выдать все целые кадры с верной контрольной суммой (memoryview)."""
+        buf, view, size, header = self._buf, self._view, self.size, self.header
+        while self._w - self._r >= size:
+            r = self._r
+            if not buf.startswith(header, r):
+                idx = buf.find(header, r, self._w)
+                if idx < 0:
+                    # Последний байт может оказаться началом заголовка
+                    keep = self._w - 1 if buf[self._w - 1] == header[0] else self._w
+                    self.dropped += keep - r
+                    self._r = keep
+                    break
+                self.dropped += idx - r
+                self._r = idx
+                continue
+            frame = view[r:r + size]
+            if self.check(frame):
+                self._r = r + size
+                yield frame
+            else:
+                # Ложный заголовок или битый пакет — сдвигаемся на байт
+                self.crc_errors += 1
+                self.dropped += 1
+                self._r = r + 1
+        if self._r == self._w:
+            self._r = self._w = 0
@@ -0,0 +1,138 @@
+"""Задержки по участкам пути пакета: UART -> UDP -> дашборд -> график.
+
+Каждый участок (hop) копит гистограмму с логарифмическими корзинами
+(20 на декаду, от 10 мкс до 1000 с), поэтому запись — O(1), память
+постоянна, а p50/p95/p99 считаются по корзинам с точностью ~12%.
+
+Метки времени — time.time(). Участок send->recv переходит с Raspberry Pi
+на ПК дашборда и включает расхождение их часов: он честен, только если
+часы синхронизированы (NTP). Остальные участки меряются на одной машине.
+
+    tracer = LatencyTracer()
+    tracer.record_stamps([("uart", t0), ("send", t1), ("recv", t2), ("emit", t3)])
+    tracer.report()   # {"recv->emit": {"n": ..., "p50": ..., ...}, ...}
+"""
+import math
+import threading
+
+# Участки в порядке прохождения пакета
+HOPS = (
+    "uart->send",      # gcs.py: чтение порта -> отправка датаграммы
+    "send->recv",      # сеть (и разница часов Pi и ПК)
+    "recv->emit",      # TelemetryWorker: разбор -> data_ready.emit
+    "emit->flush",     # кольцо между потоками до кадра интерфейса (FrameCoalescer)
+    "flush->render",   # отрисовка графиков и карточек
+    "total",           # от чтения порта до конца отрисовки
+)
+
+_PER_DECADE = 20
+_MIN_EXP = -5          # 10 мкс
+_MAX_EXP = 3           # 1000 с
+_NBUCKETS = (_MAX_EXP - _MIN_EXP) * _PER_DECADE + 2
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= 10.0 ** _MIN_EXP:
+        return 0
+    i = int((math.log10(seconds) - _MIN_EXP) * _PER_DECADE) + 1
+    return min(i, _NBUCKETS - 1)
+
+
+def _bucket_value(i: int) -> float:
+    """Середина корзины (геометрическая), с."""
+    if i == 0:
+        return 10.0 ** _MIN_EXP
+    return 10.0 ** (_MIN_EXP + (i - 0.5) / _PER_DECADE)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * _NBUCKETS
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.negative = 0      # отрицательные задержки (разные часы) — отдельно
+
+    def add(self, seconds: float):
+        if seconds < 0:
+            self.negative += 1
+            return
+        self.counts[_bucket(seconds)] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        if not self.n:
+            return 0.0
+        rank = max(1, math.ceil(self.n * p / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(_bucket_value(i), self.max)
+        return self.max
+
+    def stats(self) -> dict:
+        return {
+            "n": self.n,
+            "mean": self.total / self.n if self.n else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "negative": self.negative,
+        }
+
+
+class LatencyTracer:
+    """Гистограммы по участкам; record() можно вызывать из разных потоков."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hists = {}
+
+    def record(self, hop: str, seconds: float):
+        with self._lock:
+            hist = self.hists.get(hop)
+            if hist is None:
+                hist = self.hists[hop] = LatencyHistogram()
+            hist.add(seconds)
+
+    def record_stamps(self, stamps):
+        """Участки между соседними метками [(имя, время), ...].
+
+        Если путь начался с чтения порта ("uart"), пишется и total.
+        """
+        for (a, ta), (b, tb) in zip(stamps, stamps[1:]):
+            self.record(f"{a}->{b}", tb - ta)
+        if len(stamps) > 1 and stamps[0][0] == "uart":
+            self.record("total", stamps[-1][1] - stamps[0][1])
+
+    def reset(self):
+        with self._lock:
+            self.hists = {}
+
+    def report(self) -> dict:
+        with self._lock:
+            hops = sorted(self.hists, key=lambda h: HOPS.index(h) if h in HOPS else len(HOPS))
+            return {hop: self.hists[hop].stats() for hop in hops}
+
+    def lines(self) -> list:
+        """Таблица для консоли и логов, мс."""
+        out = [f"{'hop':<14} {'n':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+        for hop, s in self.report().items():
+            out.append(f"{hop:<14} {s['n']:>7} {s['p50'] * 1000:>8.2f} {s['p95'] * 1000:>8.2f} "
+                       f"{s['p99'] * 1000:>8.2f} {s['max'] * 1000:>8.2f}"
+                       + (f"  (<0: {s['negative']})" if s["negative"] else ""))
+        return out
+
+    def html(self) -> str:
+        rows = "".join(
+            f"<tr><td>{hop}</td><td>{s['n']}</td><td>{s['p50'] * 1000:.2f}</td>"
+            f"<td>{s['p95'] * 1000:.2f}</td><td>{s['p99'] * 1000:.2f}</td>"
+            f"<td>{s['max'] * 1000:.2f}</td></tr>"
+            for hop, s in self.report().items())
+        return ("<table><tr><th>hop</th><th>n</th><th>p50, ms</th><th>p95, ms</th>"
+                f"<th>p99, ms</th><th>max, ms</th></tr>{rows}</table>")
@@ -0,0 +1,126 @@
+"""Качество радиоканала по packet_num (без зависимости от Qt).
+
+Прошивка увеличивает packet_num (uint16) на каждом цикле, поэтому по
+принятым номерам видно, сколько пакетов потеряно, повторено и пришло не
+по порядку. Номер сравнивается с наибольшим принятым по модулю 65536:
+
+    шаг 0                 — дубликат;
+    шаг 1..half           — новый пакет, пропущенные номера считаются потерянными;
+    номер из пропущенных  — опоздавший (reordered), из потерь вычитается;
+    далеко назад          — перезапуск платы, счёт продолжается с нового номера.
+
+Джиттер — по RFC 3550: сглаженное |(Rj - Ri) - (Sj - Si)|, где S — поле time
+пакета (мс), R — время приёма. Скользящие доля потерь и пропускная
+способность считаются за последние window секунд.
+
+    link = LinkStats()
+    link.add(pkt.packet_num, pkt.time, rx_time, size=60)
+    link.snapshot()   # {"received": ..., "loss_pct": ..., "jitter_ms": ...}
+"""
+import time
+from collections import deque
+
+
+class LinkStats:
+    def __init__(self, window: float = 10.0, modulo: int = 1 << 16,
+                 reorder_window: int = 64, clock=time.time):
+        self.window = window
+        self.modulo = modulo
+        self.reorder_window = reorder_window
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.received = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.restarts = 0
+        self.bytes = 0
+        self.jitter = 0.0            # мс
+        self._highest = None
+        self._missing = deque()      # недавно пропущенные номера (для опоздавших)
+        self._last_transit = None
+        self._events = deque()       # (время, принято, потеряно, байт) за окно
+
+    def add(self, packet_num: int, sent_ms: float = None, rx_time: float = None,
+            size: int = 60):
+        """Учесть принятый пакет; rx_time — время приёма в шкале clock (time.time)."""
+        now = self.clock() if rx_time is None else rx_time
+        lost = 0
+        if self._highest is None:
+            self._highest = packet_num
+        else:
+            step = (packet_num - self._highest) % self.modulo
+            if step == 0:
+                self.duplicates += 1
+                return
+            if step <= self.modulo // 2:
+                # Вперёд: всё между прошлым и текущим номером пока считается потерянным
+                lost = step - 1
+                if lost:
+                    first = max(1, step - self.reorder_window)
+                    self._missing.extend((self._highest + k) % self.modulo for k in range(first, step))
+                    while len(self._missing) > self.reorder_window:
+                        self._missing.popleft()
+                self._highest = packet_num
+            elif packet_num in self._missing:
+                # Опоздавший пакет: потерей он больше не считается
+                self._missing.remove(packet_num)
+                self.reordered += 1
+                lost = -1
+            elif self.modulo - step <= self.reorder_window:
+                self.duplicates += 1
+                return
+            else:
+                # Номер ушёл далеко назад — плата перезапустилась
+                self.restarts += 1
+                self._highest = packet_num
+                self._missing.clear()
+                self._last_transit = None
+        self.received += 1
+        self.lost += lost
+        self.bytes += size
+        if sent_ms is not None:
+            transit = now * 1000.0 - sent_ms
+            if self._last_transit is not None:
+                d = abs(transit - self._last_transit)
+                self.jitter += (d - self.jitter) / 16.0
+            self._last_transit = transit
+        self._events.append((now, 1, lost, size))
+        self._expire(now)
+
+    def _expire(self, now: float):
+        events = self._events
+        while events and now - events[0][0] > self.window:
+            events.popleft()
+
+    def snapshot(self, now: float = None) -> dict:
+        """Счётчики с начала и скользящие значения за окно."""
+        if now is None:
+            now = self.clock()
+        self._expire(now)
+        got = sum(e[1] for e in self._events)
+        lost = max(0, sum(e[2] for e in self._events))
+        size = sum(e[3] for e in self._events)
+        span = min(self.window, now - self._events[0][0]) if len(self._events) > 1 else 0.0
+        total = self.received + self.lost
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "duplicates": self.duplicates,
+            "reordered": self.reordered,
+            "restarts": self.restarts,
+            "loss_pct": round(100.0 * self.lost / total, 2) if total else 0.0,
+            "window_loss_pct": round(100.0 * lost / (got + lost), 2) if got + lost else 0.0,
+            "jitter_ms": round(self.jitter, 1),
+            "rate_pps": round(got / span, 2) if span else 0.0,
+            "throughput_bps": round(size * 8 / span) if span else 0,
+        }
+
+    def summary(self, now: float = None) -> str:
+        s = self.snapshot(now)
+        return (f"link: rx {s['received']}, lost {s['lost']} ({s['loss_pct']}%, "
+                f"{s['window_loss_pct']}% за {self.window:.0f} с), dup {s['duplicates']}, "
+                f"reord {s['reordered']}, jitter {s['jitter_ms']} мс, "
+                f"{s['rate_pps']} пак/с, {s['throughput_bps']} бит/с")
@@ -0,0 +1,75 @@
+"""Склейка и ограничение частоты сообщений журнала (без зависимости от Qt).
+
+Поток приёма кладёт сообщения через add(), а раз в цикл вызывает drain().
+Сообщения одной категории (key) проходят как есть не больше burst раз
+за окно window секунд. Остальные только считаются, и по окончании окна
+вместо них выходит одна сводка «<key> — 312× за 10 с». drain() отдаёт
+накопленное не чаще flush_interval, поэтому сигналов между потоками
+столько же, сколько кадров, а не пакетов.
+
+    agg = LogAggregator(window=10.0, burst=3)
+    agg.add(f"[UDP] Received valid packet from {addr}", key="[UDP] Received valid packet")
+    batch = agg.drain()          # [] или список строк для журнала
+"""
+import time
+
+
+class LogAggregator:
+    def __init__(self, window: float = 10.0, burst: int = 3,
+                 flush_interval: float = 0.25, max_batch: int = 500,
+                 clock=time.monotonic):
+        self.window = window
+        self.burst = burst
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.clock = clock
+        self._out = []
+        self._counts = {}        # key -> [всего за окно, из них подавлено]
+        self._window_start = clock()
+        self._last_flush = self._window_start
+        # Статистика
+        self.received = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def add(self, message: str, key: str = None):
+        """key=None — сообщение без ограничения (только пачкой)."""
+        self.received += 1
+        if key is not None:
+            count = self._counts.get(key)
+            if count is None:
+                count = self._counts[key] = [0, 0]
+            count[0] += 1
+            if count[0] > self.burst:
+                count[1] += 1
+                self.suppressed += 1
+                return
+        if len(self._out) >= self.max_batch:
+            self.dropped += 1
+            return
+        self._out.append(message)
+
+    def _summaries(self, elapsed: float) -> list:
+        out = [f"{key} — {total}× за {elapsed:.0f} с"
+               for key, (total, hidden) in self._counts.items() if hidden]
+        self._counts = {}
+        return out
+
+    def drain(self, force: bool = False) -> list:
+        """Строки для журнала; пусто, если flush_interval ещё не прошёл."""
+        now = self.clock()
+        if not force and now - self._last_flush < self.flush_interval:
+            return []
+        self._last_flush = now
+        elapsed = now - self._window_start
+        if force or elapsed >= self.window:
+            self._out.extend(self._summaries(elapsed))
+            self._window_start = now
+        if self.dropped:
+            self._out.append(f"[WARNING] Журнал: пропущено {self.dropped} сообщений (переполнение)")
+            self.dropped = 0
+        batch, self._out = self._out, []
+        if batch:
+            self.batches += 1
+        return batch
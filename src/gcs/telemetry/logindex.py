@@ -0,0 +1,119 @@
+"""Индекс строк журнала для быстрого поиска (без зависимости от Qt).
+
+Строки нумеруются сквозным seq и хранятся в кольцевом буфере на списках
+со смещением (доступ по seq — O(1), в отличие от deque). Рядом лежат копия
+строки в нижнем регистре и списки seq по уровням. search() сужает прошлый
+результат, если новый запрос содержит предыдущий, и досматривает только
+строки, пришедшие после него.
+"""
+from bisect import bisect_left
+from heapq import merge
+
+
+class LogIndex:
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max(1, max_entries)
+        self.base = 0            # seq самой старой хранимой строки
+        self._off = 0            # индекс строки base в списках ниже
+        self._raw = []
+        self._lower = []
+        self._level = []
+        self._by_level = {}      # уровень -> [seq, ...] по возрастанию
+        self._last = None        # (запрос, уровни, результат, следующий seq)
+
+    def __len__(self) -> int:
+        return len(self._raw) - self._off
+
+    @property
+    def end(self) -> int:
+        """seq, который получит следующая строка."""
+        return self.base + len(self)
+
+    def full(self) -> bool:
+        return len(self) >= self.max_entries
+
+    def get(self, seq: int):
+        i = seq - self.base + self._off
+        return self._raw[i], self._level[i]
+
+    def evict_oldest(self) -> int:
+        """Выбросить самую старую строку, вернуть её seq."""
+        seq = self.base
+        self.base += 1
+        self._off += 1
+        if self._off >= self.max_entries:
+            self._compact()
+        return seq
+
+    def _compact(self):
+        off = self._off
+        del self._raw[:off], self._lower[:off], self._level[:off]
+        self._off = 0
+        for level, seqs in self._by_level.items():
+            del seqs[:bisect_left(seqs, self.base)]
+
+    def append(self, raw: str, level: str) -> int:
+        if self.full():
+            self.evict_oldest()
+        seq = self.end
+        self._raw.append(raw)
+        self._lower.append(raw.lower())
+        self._level.append(level)
+        self._by_level.setdefault(level, []).append(seq)
+        return seq
+
+    def clear(self):
+        self.base = self.end
+        self._off = 0
+        self._raw, self._lower, self._level = [], [], []
+        self._by_level = {}
+        self._last = None
+
+    def lines(self) -> list:
+        return self._raw[self._off:]
+
+    def matches(self, seq: int, query: str, levels=None) -> bool:
+        i = seq - self.base + self._off
+        if levels and self._level[i] not in levels:
+            return False
+        return not query or query in self._lower[i]
+
+    def search(self, query: str, levels=None) -> list:
+        """seq всех строк, содержащих query (без учёта регистра) с уровнем из levels."""
+        query = query.lower()
+        levels = frozenset(levels) if levels else None
+        base, end, off = self.base, self.end, self._off
+        last = self._last
+        if last and last[1] == levels and last[0] in query and last[3] >= base:
+            # Запрос уточнили: проверяем только прошлые совпадения и новые строки
+            start = bisect_left(last[2], base)
+            candidates = last[2][start:] + self._candidates(last[3], end, levels)
+        else:
+            candidates = None
+        lower = self._lower
+        if candidates is None:
+            if levels:
+                result = self._candidates(base, end, levels)
+                if query:
+                    result = [s for s in result if query in lower[s - base + off]]
+            elif query:
+                # Полный проход по кешу нижнего регистра
+                result = [base + i for i, line in enumerate(lower[off:]) if query in line]
+            else:
+                result = list(range(base, end))
+        elif query:
+            result = [s for s in candidates if query in lower[s - base + off]]
+        else:
+            result = candidates
+        # Копия: вызывающий (LogModel) дописывает в свой список новые seq
+        self._last = (query, levels, list(result), end)
+        return result
+
+    def _candidates(self, start: int, end: int, levels) -> list:
+        if not levels:
+            return list(range(start, end))
+        parts = []
+        for level in levels:
+            seqs = self._by_level.get(level, [])
+            parts.append(seqs[bisect_left(seqs, start):])
+        return list(merge(*parts)) if len(parts) > 1 else parts[0] if parts else []
@@ -0,0 +1,40 @@
+"""Пересчёт me2o2 (сырое значение АЦП) в % кислорода.
+
+Калибровка в одном месте: gcs.py шлёт JSON-клиентам уже проценты, а tw.py
+в двоичном режиме получает сырой кадр и пересчитывает его так же.
+"""
+# Параметры АЦП и усилителя
+ADC_REF_VOLTAGE = 3.3    # опорное напряжение АЦП (V)
+ADC_MAX = 4095.0         # разрешение 12-битного АЦП
+
+# Вычислите эти два параметра по вашим измерениям:
+#   V_zero — выход датчика при 0 % O2 (например, в чистом N2)
+#   V_air  — выход датчика при ~21 % O2 (обычный воздух)
+# Тогда:
+#   O2_SLOPE  = (V_air  – V_zero) / 21.0
+#   O2_OFFSET = V_zero
+
+V_zero = 0.175   # В при 0 % O₂
+V_air  = 1.05    # В при ~21 % O₂
+
+O2_SLOPE = (V_air  - V_zero) / 21.0   # заменить на число, полученное по формуле
+O2_OFFSET = V_zero                     # заменить на измеренное напряжение при 0 % O2
+
+
+def voltage(raw: int) -> float:
+    return raw / ADC_MAX * ADC_REF_VOLTAGE
+
+
+def percent_from_voltage(volts: float) -> float:
+    """% O2, ограниченный диапазоном 0–100."""
+    return max(0.0, min(100.0, (volts - O2_OFFSET) / O2_SLOPE))
+
+
+def percent(raw: int) -> float:
+    """% O2 по сырому АЦП, с округлением до 0.1 — как в JSON gcs.py."""
+    return round(percent_from_voltage(voltage(raw)), 1)
+
+
+def raw(pct: float) -> int:
+    """Обратный пересчёт % O2 в АЦП (для JSON, где сырого значения нет); точность ~5 единиц."""
+    return round((pct * O2_SLOPE + O2_OFFSET) / ADC_REF_VOLTAGE * ADC_MAX)
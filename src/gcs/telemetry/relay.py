@@ -0,0 +1,93 @@
+"""Двоичный протокол ретрансляции gcs.py -> дашборды (tw.py, gribexe).
+
+Вместо JSON на каждый пакет по UDP уходит сам проверенный 60-байтный
+кадр с небольшим заголовком. Несколько кадров можно склеить в одну
+датаграмму:
+
+    датаграмма: magic "GR" | version u8 | count u8 | sent f64 | count x запись
+    запись:     seq u32 | rx_time f64 (unix, с) | crc_ok u8 | кадр 60 байт
+
+sent — время отправки датаграммы (unix, с; с версии 2, для замера задержек).
+Датаграммы версии 1 (без sent) по-прежнему принимаются.
+
+Режим выбирается клиентом при рукопожатии: b"status" — как раньше JSON,
+b"status bin" — двоичный режим (сервер отвечает b"OK bin").
+"""
+import struct
+import time
+from collections import namedtuple
+
+from telemetry import codec
+
+MAGIC = b"GR"
+VERSION = 2
+
+HELLO_JSON = b"status"
+HELLO_BIN = b"status bin"
+ACK_JSON = b"OK"
+ACK_BIN = b"OK bin"
+
+DGRAM_HDR = struct.Struct("<2sBB")
+SENT = struct.Struct("<d")           # после DGRAM_HDR в версии 2
+FRAME_HDR = struct.Struct("<IdB")
+RECORD_SIZE = FRAME_HDR.size + codec.PACKET_SIZE
+# 16 x 73 = 1168 байт + 12 байт заголовка — помещается в один Ethernet/Wi-Fi кадр
+MAX_FRAMES = 16
+
+RelayFrame = namedtuple("RelayFrame", "seq rx_time crc_ok frame")
+
+
+def parse_hello(data: bytes):
+    """Режим клиента по сообщению рукопожатия: "json", "bin" или None."""
+    if data == HELLO_JSON:
+        return "json"
+    if data == HELLO_BIN:
+        return "bin"
+    return None
+
+
+def pack_record(seq: int, rx_time: float, crc_ok: bool, frame) -> bytes:
+    return FRAME_HDR.pack(seq & 0xFFFFFFFF, rx_time, 1 if crc_ok else 0) + bytes(frame)
+
+
+def pack_datagrams(records, max_frames: int = MAX_FRAMES, sent: float = None) -> list:
+    """Склеить записи pack_record() в датаграммы по max_frames штук."""
+    sent = SENT.pack(time.time() if sent is None else sent)
+    out = []
+    for i in range(0, len(records), max_frames):
+        chunk = records[i:i + max_frames]
+        out.append(DGRAM_HDR.pack(MAGIC, VERSION, len(chunk)) + sent + b"".join(chunk))
+    return out
+
+
+def is_relay(datagram) -> bool:
+    return len(datagram) >= DGRAM_HDR.size and datagram[:2] == MAGIC
+
+
+def _header_size(version: int) -> int:
+    return DGRAM_HDR.size + (SENT.size if version >= 2 else 0)
+
+
+def sent_time(datagram):
+    """Время отправки датаграммы (unix, с) или None для версии 1."""
+    if datagram[2] >= 2 and len(datagram) >= DGRAM_HDR.size + SENT.size:
+        return SENT.unpack_from(datagram, DGRAM_HDR.size)[0]
+    return None
+
+
+def unpack(datagram) -> list:
+    """Разобрать датаграмму в список RelayFrame (кадры — memoryview)."""
+    magic, version, count = DGRAM_HDR.unpack_from(datagram)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError(f"unsupported relay datagram (magic={magic!r}, version={version})")
+    pos = _header_size(version)
+    if len(datagram) < pos + count * RECORD_SIZE:
+        raise ValueError(f"truncated relay datagram: {len(datagram)} bytes for {count} frames")
+    view = memoryview(datagram)
+    frames = []
+    for _ in range(count):
+        seq, rx_time, crc_ok = FRAME_HDR.unpack_from(view, pos)
+        pos += FRAME_HDR.size
+        frames.append(RelayFrame(seq, rx_time, bool(crc_ok), view[pos:pos + codec.PACKET_SIZE]))
+        pos += codec.PACKET_SIZE
+    return frames
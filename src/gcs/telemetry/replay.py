@@ -0,0 +1,207 @@
+"""Воспроизведение .bin лога в темпе бортового времени (без зависимости от Qt).
+
+ReplayIndex отображает файл в память (mmap) и один раз находит все кадры
+с верной checksum_grib (checksum.scan по кускам, с прогрессом — для фонового
+потока). Дальше кадры берутся по номеру срезом памяти, без чтения файла.
+По полю time строится шкала воспроизведения play (с от начала). Паузы в логе длиннее max_gap (перезапуск платы, обрыв записи)
+и скачки времени назад укорачиваются до max_gap, так что шкала монотонна
+и по ней работает бинарный поиск. Replay выдаёт номер кадра i, когда
+наступает anchor_wall + (play[i] - play[anchor]) / speed. Точка привязки
+сдвигается только при перемотке, смене скорости и паузе, поэтому ошибка
+не копится от кадра к кадру.
+
+    index = ReplayIndex.open("log/grib_....bin")
+    replay = Replay(index, speed=10.0)
+    for i in replay.take_due():
+        pkt = index.decode(i)
+"""
+import mmap
+import time
+from array import array
+from bisect import bisect_left
+
+from telemetry import checksum, codec
+
+AFAP = 0.0          # speed: «как можно быстрее», без пауз
+
+
+class ReplayIndex:
+    def __init__(self, data, pkt_codec=codec.default_codec, time_field: str = "time",
+                 max_gap: float = 2.0, build: bool = True):
+        self.data = data
+        self.codec = pkt_codec
+        self.max_gap = max_gap
+        self.fields = pkt_codec.record._fields if pkt_codec.record else codec.FIELDS
+        self._time_index = self.fields.index(time_field)
+        self.offsets = array("q")
+        self.play = array("d")
+        self.skipped_bytes = 0   # байты вне верных кадров (мусор, битые участки)
+        self._by_num = None
+        if build:
+            self.build()
+
+    @classmethod
+    def open(cls, path: str, pkt_codec=codec.default_codec, build: bool = True):
+        """Отобразить файл в память (mmap): кадры читаются без системных вызовов."""
+        with open(path, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                data = b""           # пустой файл не отображается
+        return cls(data, pkt_codec, build=build)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                pass                 # на кадры ещё есть ссылки; закроется сборщиком
+
+    def build(self, progress=None, cancel=None, chunk: int = 1 << 20):
+        """Найти кадры по кускам chunk байт.
+
+        progress(сделано, всего) вызывается после каждого куска, cancel() -> True
+        прерывает построение (индекс остаётся частичным). Граница куска не рвёт
+        кадры: следующий кусок начинается за последним найденным кадром.
+        """
+        data, size = self.data, self.codec.size
+        n = len(data)
+        unpack = self.codec.struct.unpack_from
+        ti, max_gap = self._time_index, self.max_gap
+        self.offsets = offsets = array("q")
+        self.play = play = array("d")
+        self._by_num = None
+        t = 0.0
+        prev = None
+        pos = 0
+        while pos < n:
+            if cancel and cancel():
+                return False
+            stop = min(n, pos + chunk)
+            found = [off for off in checksum.scan(data, pos, min(n, stop + size - 1), size=size)
+                     if off < stop]
+            for off in found:
+                ms = unpack(data, off)[ti]
+                if prev is not None:
+                    step = (ms - prev) / 1000.0
+                    t += step if 0 <= step <= max_gap else max_gap
+                play.append(t)
+                prev = ms
+            offsets.extend(found)
+            pos = max(stop, found[-1] + size) if found else stop
+            if progress:
+                progress(min(pos, n), n)
+        self.skipped_bytes = n - len(offsets) * size
+        return True
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def frame(self, i: int) -> memoryview:
+        off = self.offsets[i]
+        return memoryview(self.data)[off:off + self.codec.size]
+
+    def decode(self, i: int):
+        return self.codec.decode(self.data, self.offsets[i])
+
+    def duration(self) -> float:
+        """Длительность воспроизведения при 1×, с."""
+        return self.play[-1] if self.play else 0.0
+
+    def find_packet(self, packet_num: int, start: int = 0):
+        """Номер кадра с packet_num: первый после start, иначе первый в файле."""
+        if self._by_num is None:
+            ni = self.fields.index("packet_num")
+            unpack = self.codec.struct.unpack_from
+            by_num = {}
+            for i, off in enumerate(self.offsets):
+                by_num.setdefault(unpack(self.data, off)[ni], []).append(i)
+            self._by_num = by_num
+        hits = self._by_num.get(packet_num)
+        if not hits:
+            return None
+        k = bisect_left(hits, start)
+        return hits[k] if k < len(hits) else hits[0]
+
+    def find_time(self, seconds: float) -> int:
+        """Первый кадр не раньше seconds от начала шкалы воспроизведения."""
+        return min(bisect_left(self.play, seconds), max(0, len(self.play) - 1))
+
+
+class Replay:
+    def __init__(self, index: ReplayIndex, speed: float = 1.0, max_batch: int = 1000,
+                 clock=time.monotonic):
+        self.index = index
+        self.speed = speed
+        self.max_batch = max_batch
+        self.clock = clock
+        self._paused_at = None
+        self._anchor(0)
+
+    def _anchor(self, i: int):
+        self.position = i            # следующий кадр
+        self._anchor_wall = self.clock()
+        self._anchor_play = self.index.play[i] if i < len(self.index) else 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.position >= len(self.index)
+
+    def set_speed(self, speed: float):
+        """speed > 0 — множитель (0.5–100), AFAP — без пауз."""
+        self.speed = speed
+        self._anchor(self.position)
+        if self._paused_at is not None:
+            self._paused_at = self._anchor_wall
+
+    def seek(self, i: int):
+        """Перейти к кадру i (номер в индексе)."""
+        self._anchor(max(0, min(i, len(self.index))))
+        if self._paused_at is not None:
+            self._paused_at = self._anchor_wall
+
+    def seek_time(self, seconds: float):
+        self.seek(self.index.find_time(seconds))
+
+    def seek_packet(self, packet_num: int) -> bool:
+        i = self.index.find_packet(packet_num, self.position)
+        if i is None:
+            return False
+        self.seek(i)
+        return True
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.clock()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._anchor_wall += self.clock() - self._paused_at
+            self._paused_at = None
+
+    def _due_at(self, i: int) -> float:
+        return self._anchor_wall + (self.index.play[i] - self._anchor_play) / self.speed
+
+    def wait_time(self, limit: float = 0.05) -> float:
+        """Сколько секунд ждать до следующего кадра, но не больше limit."""
+        if self._paused_at is not None or self.done:
+            return limit
+        if self.speed <= 0:
+            return 0.0
+        return min(limit, max(0.0, self._due_at(self.position) - self.clock()))
+
+    def take_due(self) -> list:
+        """Номера кадров, время которых наступило (отставание догоняется пачкой)."""
+        if self.done or self._paused_at is not None:
+            return []
+        start = self.position
+        stop = min(len(self.index), start + self.max_batch)
+        if self.speed <= 0:
+            i = stop
+        else:
+            now = self.clock()
+            i = start
+            while i < stop and self._due_at(i) <= now:
+                i += 1
+        self.position = i
+        return list(range(start, i))
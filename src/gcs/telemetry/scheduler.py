@@ -0,0 +1,101 @@
+"""Склейка пакетов в кадры интерфейса (без зависимости от Qt).
+
+Поток приёма кладёт пакеты через push(), таймер интерфейса раз в кадр
+забирает всё накопившееся через take() и раздаёт страницам одной пачкой.
+Интервал следующего кадра подстраивается под темп пакетов: один кадр на
+пакет, но не чаще min_interval; пока данные никто не видит — hidden_interval.
+
+push() и take() можно вызывать из разных потоков: буфер служит общим
+кольцом между TelemetryWorker и окном. push() возвращает True только для
+первого пакета после take() — поток приёма шлёт один сигнал «есть пачка»
+на кадр, а не Qt-сигнал со словарём на каждый пакет.
+
+Счётчики: received — принято, frames — кадров, coalesced — пакетов,
+склеенных с соседними в одном кадре, dropped — выброшено при переполнении,
+signals — уведомлений окну о новой пачке.
+"""
+import threading
+import time
+from collections import deque
+
+
+class FrameCoalescer:
+    def __init__(self, min_interval: float = 0.033, max_interval: float = 0.25,
+                 hidden_interval: float = 0.5, max_pending: int = 10000,
+                 clock=time.monotonic):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hidden_interval = hidden_interval
+        self.clock = clock
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._notified = False   # сигнал о пачке уже отправлен, take() ещё не было
+        self._last_take = clock()
+        self.rate = 0.0          # пакетов в секунду (сглаженное)
+        self.interval = max_interval
+        self.received = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.signals = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, item) -> bool:
+        """Положить пакет; True — пачка только началась и окно стоит уведомить."""
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1    # deque сам выбросит самый старый
+            self._pending.append(item)
+            self.received += 1
+            if self._notified:
+                return False
+            self._notified = True
+            self.signals += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._notified = False
+
+    def take(self) -> list:
+        """Забрать пачку для кадра (может быть пустой)."""
+        now = self.clock()
+        dt = now - self._last_take
+        self._last_take = now
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._notified = False
+        if dt > 0:
+            # Экспоненциальное сглаживание темпа с постоянной ~1 с
+            k = min(1.0, dt)
+            self.rate += (len(batch) / dt - self.rate) * k
+        if batch:
+            self.frames += 1
+            self.coalesced += len(batch) - 1
+        return batch
+
+    def next_interval(self, visible: bool = True) -> float:
+        """Интервал до следующего кадра, с."""
+        if not visible:
+            self.interval = self.hidden_interval
+        elif self.rate <= 0:
+            self.interval = self.max_interval
+        else:
+            self.interval = min(self.max_interval, max(self.min_interval, 1.0 / self.rate))
+        return self.interval
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "signals": self.signals,
+            "pending": len(self._pending),
+            "rate": round(self.rate, 1),
+            "interval_ms": round(self.interval * 1000),
+        }
@@ -0,0 +1,154 @@
+"""Хранилище телеметрии в SQLite (секция data_storage в telemetry_config.json).
+
+В таблицу packets пишутся разобранные значения пакета (как в .bin, без
+масштабирования), время приёма и номер сессии. База открывается в режиме
+WAL, поэтому дашборд может читать её, пока поток приёма пишет. Вставки
+копятся в памяти и уходят одной транзакцией — раз в batch_size пакетов
+или раз в flush_interval секунд. add()/flush() защищены блокировкой:
+дашборд может сбросить очередь из своего потока, пока пишет поток приёма.
+
+    store = TelemetryStore("log/telemetry.db", source="log/grib_....bin")
+    store.add(pkt)                      # из потока приёма
+    rows = store.query_range(t0, t1, columns=["time", "temp_bmp"])
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from telemetry import codec
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS packets (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    rx_time REAL NOT NULL,
+    {", ".join(f"{name} NUMERIC" for name in codec.FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS packets_session_time ON packets(session, time);
+CREATE INDEX IF NOT EXISTS packets_time ON packets(time);
+CREATE INDEX IF NOT EXISTS packets_packet_num ON packets(packet_num);
+"""
+
+_INSERT = (
+    f"INSERT INTO packets (session, rx_time, {', '.join(codec.FIELDS)}) "
+    f"VALUES ({', '.join('?' * (len(codec.FIELDS) + 2))})"
+)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    con = sqlite3.connect(path, check_same_thread=False)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+class TelemetryStore:
+    def __init__(self, path: str, source: str = "", batch_size: int = 100,
+                 flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._con = _connect(path)
+        self._con.executescript(SCHEMA)
+        with self._con:
+            cur = self._con.execute(
+                "INSERT INTO sessions (started, source) VALUES (?, ?)", (time.time(), source))
+        self.session = cur.lastrowid
+        self._pending = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.rows = 0
+
+    @classmethod
+    def from_config(cls, config: dict, source: str = "", base_dir: str = "log"):
+        """Создать хранилище по секции data_storage; None, если SQLite не выбран."""
+        storage = config.get("data_storage") or {}
+        if storage.get("database_type", "").lower() != "sqlite":
+            return None
+        name = storage.get("database_name", "telemetry.db")
+        if base_dir and not os.path.isabs(name):
+            name = os.path.join(base_dir, name)
+        return cls(name, source,
+                   batch_size=storage.get("batch_size", 100),
+                   flush_interval=storage.get("flush_interval", 1.0))
+
+    # --- запись (поток приёма) ---
+
+    def add(self, pkt, rx_time: float = None):
+        """Поставить пакет (27 значений codec.FIELDS) в очередь на вставку."""
+        with self._lock:
+            self._pending.append((self.session, rx_time or time.time(), *pkt))
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                with self._con:
+                    self._con.executemany(_INSERT, pending)
+                self.rows += len(pending)
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._con.close()
+
+    # --- чтение (дашборд, отчёты) ---
+
+    def query_range(self, start=None, end=None, session=None, columns=None,
+                    by: str = "time") -> list:
+        """Строки с start <= by <= end, упорядоченные по by.
+
+        by — "time" (время бортового таймера, мс), "rx_time" или "packet_num";
+        session=None — текущая сессия, 0 — все сессии.
+        """
+        if by not in ("time", "rx_time", "packet_num"):
+            raise ValueError(f"unsupported range column: {by}")
+        columns = list(columns or ("rx_time", *codec.FIELDS))
+        unknown = set(columns) - {"id", "session", "rx_time", *codec.FIELDS}
+        if unknown:
+            raise ValueError(f"unknown columns: {sorted(unknown)}")
+        where, args = [], []
+        session = self.session if session is None else session
+        if session:
+            where.append("session = ?")
+            args.append(session)
+        if start is not None:
+            where.append(f"{by} >= ?")
+            args.append(start)
+        if end is not None:
+            where.append(f"{by} <= ?")
+            args.append(end)
+        sql = f"SELECT {', '.join(columns)} FROM packets"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {by}"
+        # Отдельное соединение: читать можно из любого потока параллельно с записью
+        con = sqlite3.connect(self.path)
+        try:
+            return con.execute(sql, args).fetchall()
+        finally:
+            con.close()
+
+    def sessions(self) -> list:
+        """[(id, started, source, packets), ...] по всем сессиям в базе."""
+        con = sqlite3.connect(self.path)
+        try:
+            return con.execute(
+                "SELECT s.id, s.started, s.source, COUNT(p.id) FROM sessions s "
+                "LEFT JOIN packets p ON p.session = s.id GROUP BY s.id ORDER BY s.id"
+            ).fetchall()
+        finally:
+            con.close()
@@ -0,0 +1,58 @@
+"""Минимум и максимум в скользящем окне за O(1) амортизированно.
+
+Две монотонные очереди: в одной значения возрастают (голова — минимум),
+в другой убывают (голова — максимум). Каждое значение входит и выходит
+из очереди один раз, так что окно может быть длиной во весь полёт.
+"""
+import math
+from collections import deque
+
+
+class SlidingExtrema:
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._count = 0          # сколько значений принято всего
+        self._min = deque()      # (номер, значение), значения возрастают
+        self._max = deque()      # (номер, значение), значения убывают
+        self.last = None
+
+    def __len__(self) -> int:
+        return min(self._count, self.window)
+
+    def push(self, value):
+        """Добавить значение; None и NaN пропускаются."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        i = self._count
+        self._count += 1
+        self.last = value
+        mn, mx = self._min, self._max
+        while mn and mn[-1][1] >= value:
+            mn.pop()
+        mn.append((i, value))
+        while mx and mx[-1][1] <= value:
+            mx.pop()
+        mx.append((i, value))
+        oldest = i - self.window
+        if mn[0][0] <= oldest:
+            mn.popleft()
+        if mx[0][0] <= oldest:
+            mx.popleft()
+
+    def extend(self, values):
+        for v in values:
+            self.push(v)
+
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+    def clear(self):
+        self._count = 0
+        self._min.clear()
+        self._max.clear()
+        self.last = None
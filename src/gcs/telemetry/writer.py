@@ -0,0 +1,122 @@
+"""Фоновая запись логов станции (.bin и .csv).
+
+Цикл приёма только кладёт данные в ограниченную очередь и никогда не
+ждёт диска. Отдельный поток забирает всё накопившееся пачкой, пишет одним
+writelines() и делает fsync раз в sync_interval секунд или после
+sync_bytes записанных байт — что наступит раньше. Если очередь полна,
+данные отбрасываются и учитываются в счётчиках dropped_*.
+"""
+import os
+import queue
+import threading
+import time
+
+_RAW = 0
+_ROW = 1
+_STOP = object()
+
+
+def csv_row(values) -> str:
+    """Строка CSV в формате bin.py: значения через ';' с ';' в конце."""
+    return ";".join(map(str, values)) + ";\n"
+
+
+class LogWriter(threading.Thread):
+    def __init__(self, bin_path: str, csv_path: str, csv_header: str = "",
+                 sync_interval: float = 1.0, sync_bytes: int = 64 * 1024,
+                 maxsize: int = 4096):
+        super().__init__(name="LogWriter", daemon=True)
+        self.sync_interval = sync_interval
+        self.sync_bytes = sync_bytes
+        self._queue = queue.Queue(maxsize)
+        self._bin = open(bin_path, "wb")
+        self._csv = open(csv_path, "w")
+        if csv_header:
+            self._csv.write(csv_header)
+        # Статистика
+        self.raw_bytes = 0
+        self.rows = 0
+        self.syncs = 0
+        self.dropped_bytes = 0
+        self.dropped_rows = 0
+        self.error = None
+        self.start()
+
+    # --- сторона приёма: только put_nowait ---
+
+    def write_raw(self, data: bytes):
+        try:
+            self._queue.put_nowait((_RAW, data))
+        except queue.Full:
+            self.dropped_bytes += len(data)
+
+    def write_row(self, values):
+        """values — кортеж значений пакета; в строку превращается в потоке записи."""
+        try:
+            self._queue.put_nowait((_ROW, values))
+        except queue.Full:
+            self.dropped_rows += 1
+
+    def close(self, timeout: float = 5.0):
+        """Дописать очередь, сделать fsync и закрыть файлы."""
+        if self.is_alive():
+            self._queue.put(_STOP)
+            self.join(timeout)
+
+    # --- поток записи ---
+
+    def run(self):
+        unsynced = 0
+        last_sync = time.monotonic()
+        try:
+            stop = False
+            while not stop:
+                try:
+                    items = [self._queue.get(timeout=self.sync_interval)]
+                except queue.Empty:
+                    items = []
+                # Забираем всё, что накопилось, одной пачкой
+                while True:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                raw = []
+                rows = []
+                for item in items:
+                    if item is _STOP:
+                        stop = True
+                    elif item[0] == _RAW:
+                        raw.append(item[1])
+                    else:
+                        rows.append(csv_row(item[1]))
+                if raw:
+                    data = b"".join(raw)
+                    self._bin.write(data)
+                    self.raw_bytes += len(data)
+                    unsynced += len(data)
+                if rows:
+                    self._csv.writelines(rows)
+                    self.rows += len(rows)
+                    unsynced += sum(map(len, rows))
+                now = time.monotonic()
+                if unsynced and (stop or unsynced >= self.sync_bytes
+                                 or now - last_sync >= self.sync_interval):
+                    self._sync()
+                    unsynced = 0
+                    last_sync = now
+        except Exception as e:
+            self.error = e
+            print(f"ERROR: Log writer failed: {e}")
+        finally:
+            for f in (self._bin, self._csv):
+                try:
+                    f.close()
+                except Exception:
+                    pass
+
+    def _sync(self):
+        for f in (self._bin, self._csv):
+            f.flush()
+            os.fsync(f.fileno())
+        self.syncs += 1
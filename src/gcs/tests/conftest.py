@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Модули станции импортируются как telemetry.* из src/gcs
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,42 @@
+import random
+from functools import reduce
+
+from telemetry import checksum, codec
+
+
+def naive_xor(data):
+    return reduce(lambda a, b: a ^ b, data, 0)
+
+
+def frame(n):
+    values = [0] * len(codec.FIELDS)
+    values[0], values[2], values[12] = 0xAAAA, n * 100, n
+    return checksum.seal(bytearray(codec.encode(values)))
+
+
+def test_xor_block_matches_naive_loop():
+    rnd = random.Random(1)
+    for n in list(range(0, 70)) + [127, 128, 129, 1000]:
+        data = bytes(rnd.randrange(256) for _ in range(n))
+        assert checksum.xor_block(data) == naive_xor(data)
+        assert checksum.xor_block(memoryview(bytearray(data))) == naive_xor(data)
+
+
+def test_seal_and_verify():
+    f = frame(5)
+    assert f[checksum.GRIB_LEN] == naive_xor(f[:59]) and f[checksum.ORG_LEN] == naive_xor(f[:26])
+    assert checksum.verify(f) and checksum.verify_org(f)
+    f[10] ^= 0x40
+    assert not checksum.verify(f) and not checksum.verify_org(f)
+
+
+def test_validate_many_and_scan():
+    good = bytes(frame(1))
+    bad = bytearray(frame(2))
+    bad[30] ^= 1
+    buf = b"\xAA\xAA\x00" + good + bytes(bad) + good + good[:20]
+    start = 3
+    assert checksum.validate_many(buf, [start, start + 60, start + 120, start + 180]) == \
+        [True, False, True, False]
+    assert checksum.scan(buf) == [start, start + 120]
+    assert checksum.scan(buf, start + 1) == [start + 120]
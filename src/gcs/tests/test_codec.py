@@ -0,0 +1,45 @@
+import struct
+
+import pytest
+
+from telemetry import codec
+
+
+def sample_values():
+    return (0xAAAA, 7, 123456, -1234, 101325, 2048, -2048, 16384, 100, -100, 7000,
+            0x5A, 812, 5, 1500, 1711, -1711, 300, 400, 55.75, 37.625, 180.5, 1, 410, 320, 1200, 0x33)
+
+
+def test_packet_layout():
+    assert codec.PACKET_SIZE == 60
+    assert len(codec.FIELDS) == codec.default_codec.count == len(codec.default_codec.codes)
+    assert codec.default_codec.codes[:3] == ("H", "H", "I")
+
+
+def test_encode_decode_round_trip():
+    frame = codec.encode(sample_values())
+    assert len(frame) == codec.PACKET_SIZE and frame[:2] == codec.HEADER
+    pkt = codec.decode(frame)
+    assert tuple(pkt) == sample_values()
+    assert pkt.packet_num == 812 and pkt.time == 123456
+    # dict с именами полей собирается в тот же кадр
+    assert codec.encode(pkt._asdict()) == frame
+
+
+def test_decode_offset_and_many():
+    frame = codec.encode(sample_values())
+    buf = b"\x01\x02" + frame * 3 + b"\xAA"
+    assert codec.decode(buf, 2) == codec.decode(frame)
+    many = codec.decode_many(buf, 2)
+    assert len(many) == 3 and all(p == many[0] for p in many)
+    assert codec.decode_many(frame[:-1]) == []
+    with pytest.raises(struct.error):
+        codec.decode(frame[:-1])
+
+
+def test_custom_format_without_names():
+    c = codec.PacketCodec("<HhB")
+    assert c.size == 5 and c.codes == ("H", "h", "B")
+    assert c.decode(c.encode((1, -2, 3))) == (1, -2, 3)
+    with pytest.raises(ValueError):
+        c.encode({"a": 1})
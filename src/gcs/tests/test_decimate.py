@@ -0,0 +1,38 @@
+import math
+import random
+
+from telemetry.decimate import MinMaxDecimator, lttb
+
+
+def test_short_series_is_returned_whole():
+    d = MinMaxDecimator()
+    for i in range(10):
+        d.push(i, i * i)
+    assert d.indices(100) == list(range(10))
+    assert d.points(100)[3] == (3.0, 9.0)
+
+
+def test_extrema_survive_decimation():
+    rnd = random.Random(5)
+    d = MinMaxDecimator(max_buckets=64)
+    ys = [rnd.gauss(0, 1) for _ in range(10000)]
+    ys[1234], ys[8765] = 50.0, -50.0          # одиночные выбросы
+    for i, y in enumerate(ys):
+        d.push(i, y)
+    assert len(d) == 10000 and d.bucket > 1
+    idx = d.indices(50)
+    assert len(idx) <= 2 * 50 + 1
+    assert idx == sorted(idx) and idx[-1] == 9999
+    assert 1234 in idx and 8765 in idx
+    d.clear()
+    assert len(d) == 0 and d.bucket == 1
+
+
+def test_lttb_keeps_ends_and_peak():
+    xs = list(range(1000))
+    ys = [math.sin(x / 50) for x in xs]
+    ys[500] = 10.0
+    idx = lttb(xs, ys, 100)
+    assert len(idx) == 100 and idx[0] == 0 and idx[-1] == 999
+    assert idx == sorted(idx) and 500 in idx
+    assert lttb(xs[:5], ys[:5], 10) == list(range(5))
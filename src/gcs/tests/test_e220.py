@@ -0,0 +1,77 @@
+import pytest
+
+from telemetry import e220
+
+M0, M1, AUX = 23, 24, 25
+
+
+class FakeGPIO:
+    HIGH, LOW = 1, 0
+
+    def __init__(self):
+        self.pins = {M0: 0, M1: 0, AUX: 1}
+
+    def output(self, pin, value):
+        self.pins[pin] = value
+
+    def input(self, pin):
+        return self.pins[pin]
+
+
+class FakeModule:
+    """Порт E220: команды C0/C1 отвечают только в режиме 3 (M0 = M1 = 1)."""
+
+    def __init__(self, gpio, regs=bytes(9)):
+        self.gpio = gpio
+        self.regs = bytearray(regs)
+        self.timeout = 1.0
+        self.written = []
+        self._out = b""
+
+    def reset_input_buffer(self):
+        self._out = b""
+
+    def write(self, data):
+        self.written.append(bytes(data))
+        if not (self.gpio.pins[M0] and self.gpio.pins[M1]):
+            return                      # в обычном режиме байты уходят в эфир
+        cmd, start, count = data[:3]
+        if cmd == e220.CMD_WRITE:
+            self.regs[start:start + count] = data[3:3 + count]
+        self._out = bytes((e220.REPLY, start, count)) + bytes(self.regs[start:start + count])
+
+    def read(self, n):
+        chunk, self._out = self._out[:n], self._out[n:]
+        return chunk
+
+
+def make_radio(**kw):
+    gpio = FakeGPIO()
+    port = FakeModule(gpio, **kw)
+    return e220.E220(port, gpio, M0, M1, AUX, sleep=lambda s: None), port, gpio
+
+
+def test_configure_writes_and_reads_back_registers():
+    radio, port, gpio = make_radio()
+    regs = e220.registers(0xFFFF, e220.reg0(3, 0, 3), e220.reg1(0, 0, 0), 1, e220.reg3(0, 0, 0, 3))
+    assert radio.configure(regs) == regs
+    assert port.regs[:6] == regs
+    # Одна запись всех регистров и одно чтение для проверки
+    assert port.written == [bytes((0xC0, 0, 6)) + regs, bytes((0xC1, 0, 6))]
+    assert (gpio.pins[M0], gpio.pins[M1]) == (0, 0)     # вернулись в обычный режим
+
+
+def test_configure_fails_when_aux_stays_low():
+    clock = iter(range(100)).__next__
+    gpio = FakeGPIO()
+    gpio.pins[AUX] = 0
+    radio = e220.E220(FakeModule(gpio), gpio, M0, M1, AUX, clock=clock, sleep=lambda s: None)
+    with pytest.raises(e220.E220Error, match="AUX"):
+        radio.configure(bytes(6))
+
+
+def test_write_regs_without_reply_raises():
+    radio, port, gpio = make_radio()
+    # Пины в режиме 0: модуль не отвечает на команды
+    with pytest.raises(e220.E220Error, match="no reply"):
+        radio.write_regs(0, b"\x01")
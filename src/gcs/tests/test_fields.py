@@ -0,0 +1,56 @@
+import json
+import os
+
+from telemetry import codec, fields
+
+CONFIG = os.path.join(os.path.dirname(__file__), os.pardir, "tw", "telemetry_config.json")
+
+
+def config_fields():
+    with open(CONFIG, encoding="utf-8") as f:
+        return json.load(f)["packet_structure"]["fields"]
+
+
+def sample_packet():
+    return [0xAAAA, 7, 123456, -1234, 101325, 2048, -2048, 16384, 100, -100, 7000,
+            0x5A, 812, 5, 1500, 1711, -1711, 300, 400, 55.75, 37.625, 180.5, 1, 410, 320, 1200, 0x33]
+
+
+def test_compile_raw_inverts_config_fields():
+    decode, errors = fields.compile_fields(config_fields())
+    assert errors == []
+    pkt = sample_packet()
+    values = decode(pkt)
+    # Через JSON (как из gcs.py) и обратно — тот же кадр
+    assert fields.compile_raw(config_fields())(json.loads(json.dumps(values))) == pkt
+
+
+def test_compile_raw_missing_values_are_zero():
+    raw = fields.compile_raw([{"name": "temp_bmp", "index": 3, "scale": 0.01}])
+    pkt = raw({"temp_bmp": 21.5, "unknown": 1})
+    assert len(pkt) == len(codec.FIELDS)
+    assert pkt[3] == 2150 and sum(v for i, v in enumerate(pkt) if i != 3) == 0
+
+
+def test_compile_fields_scale_mask_and_vector():
+    decode, errors = fields.compile_fields([
+        {"name": "time", "index": 2},
+        {"name": "temp_bmp", "index": 3, "scale": 0.01},
+        {"name": "state", "index": 13, "mask": 7},
+        {"name": "accel", "type": "vector3", "indices": [5, 6, 7], "scale": 0.5},
+        {"index": 4},
+    ])
+    assert errors == []
+    pkt = sample_packet()
+    pkt[13] = 0xFD
+    assert decode(pkt) == {"time": 123456, "temp_bmp": -12.34, "state": 5,
+                           "accel": [1024.0, -1024.0, 8192.0]}
+
+
+def test_compile_fields_reports_bad_index_and_caches():
+    spec = [{"name": "a", "index": 99}, {"name": "v", "type": "vector3", "indices": [0, 1, 50]},
+            {"name": "b", "index": 1}]
+    decode, errors = fields.compile_fields(spec)
+    assert len(errors) == 2 and "99" in errors[0]
+    assert decode(sample_packet()) == {"b": 7}
+    assert fields.compile_fields(json.loads(json.dumps(spec)))[0] is decode
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from telemetry import checksum, codec
+from telemetry.framer import Framer
+
+
+def frame(n):
+    values = [0] * len(codec.FIELDS)
+    values[0], values[2], values[12] = 0xAAAA, n * 100, n
+    return bytes(checksum.seal(bytearray(codec.encode(values))))
+
+
+def packet_nums(framer):
+    return [codec.decode(f).packet_num for f in framer.frames()]
+
+
+def test_resync_after_noise_and_corrupted_frame():
+    broken = bytearray(frame(1))
+    broken[20] ^= 0xFF
+    framer = Framer()
+    framer.feed(b"\x00\x13\xAA\xAA\x55" + frame(0) + bytes(broken) + b"\x01" + frame(2))
+    assert packet_nums(framer) == [0, 2]
+    assert framer.crc_errors >= 2        # ложный заголовок и битый кадр
+    assert len(framer) == 0
+
+
+def test_frames_split_across_feeds():
+    data = b"".join(frame(n) for n in range(20))
+    rnd = random.Random(2)
+    framer = Framer(capacity=256)
+    got, pos = [], 0
+    while pos < len(data):
+        step = rnd.randrange(1, 90)
+        framer.feed(data[pos:pos + step])
+        got += packet_nums(framer)
+        pos += step
+    assert got == list(range(20))
+    assert framer.crc_errors == 0 and framer.dropped == 0
+
+
+def test_trailing_header_byte_is_kept():
+    framer = Framer()
+    f = frame(7)
+    framer.feed(b"\x00" * 70 + f[:1])
+    assert packet_nums(framer) == []
+    framer.feed(f[1:])
+    assert packet_nums(framer) == [7]
+
+
+def test_overflow_drops_oldest_bytes():
+    framer = Framer(capacity=128)
+    framer.feed(frame(0) + frame(1))
+    framer.feed(frame(2))               # 180 байт в буфере на 128: -52 байта кадра 0
+    assert framer.dropped == 52
+    assert packet_nums(framer) == [1, 2]
+    assert framer.dropped == 60         # и остаток кадра 0 до заголовка
+    with pytest.raises(ValueError):
+        Framer(capacity=10)
@@ -0,0 +1,51 @@
+import threading
+
+from telemetry.latency import LatencyHistogram, LatencyTracer
+
+
+def test_percentiles_within_bucket_precision():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.add(ms / 1000)
+    s = hist.stats()
+    assert s["n"] == 1000 and s["max"] == 1.0
+    for p, exact in ((50, 0.5), (95, 0.95), (99, 0.99)):
+        assert abs(s[f"p{p}"] - exact) / exact < 0.12
+    assert abs(s["mean"] - 0.5005) < 1e-9
+
+
+def test_negative_and_empty():
+    hist = LatencyHistogram()
+    assert hist.percentile(50) == 0.0
+    hist.add(-0.01)
+    hist.add(0.0)
+    assert hist.negative == 1 and hist.n == 1 and hist.percentile(99) == 0.0
+
+
+def test_record_stamps_and_report_order():
+    tracer = LatencyTracer()
+    tracer.record_stamps([("uart", 10.0), ("send", 10.001), ("recv", 10.011), ("emit", 10.012)])
+    tracer.record("flush->render", 0.004)
+    report = tracer.report()
+    assert list(report) == ["uart->send", "send->recv", "recv->emit", "flush->render", "total"]
+    assert report["total"]["n"] == 1 and abs(report["total"]["max"] - 0.012) < 1e-9
+    lines = tracer.lines()
+    assert lines[0].split()[0] == "hop" and len(lines) == 6
+    assert "<table>" in tracer.html()
+    tracer.reset()
+    assert tracer.report() == {}
+
+
+def test_record_from_threads():
+    tracer = LatencyTracer()
+
+    def worker():
+        for _ in range(1000):
+            tracer.record("recv->emit", 0.001)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert tracer.report()["recv->emit"]["n"] == 4000
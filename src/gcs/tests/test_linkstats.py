@@ -0,0 +1,38 @@
+from telemetry.linkstats import LinkStats
+
+
+def feed(link, nums, period=0.1):
+    for k, n in enumerate(nums):
+        link.add(n, sent_ms=k * period * 1000, rx_time=100.0 + k * period)
+
+
+def test_loss_duplicates_and_reordering():
+    link = LinkStats()
+    feed(link, [1, 2, 5, 3, 3, 6, 6])
+    s = link.snapshot(now=100.6)
+    # 3 и 4 пропущены, 3 пришёл позже; повторы 3 и 6
+    assert (s["received"], s["lost"], s["reordered"], s["duplicates"]) == (5, 1, 1, 2)
+    assert s["loss_pct"] == round(100 / 6, 2)
+
+
+def test_wraparound_and_restart():
+    link = LinkStats()
+    feed(link, [65534, 65535, 0, 2])
+    assert link.lost == 1 and link.restarts == 0
+    feed(link, [40000, 40001])                   # далеко назад — перезапуск
+    assert link.restarts == 1 and link.lost == 1 and link.received == 6
+
+
+def test_rate_jitter_and_window():
+    link = LinkStats(window=1.0)
+    feed(link, range(21))                        # 10 пак/с без джиттера
+    s = link.snapshot(now=102.0)
+    # В окне 11 событий на интервале 1 с: оценка с точностью до одного пакета
+    assert 10.0 <= s["rate_pps"] <= 11.0 and s["throughput_bps"] == s["rate_pps"] * 480
+    assert s["jitter_ms"] == 0.0
+    link.add(21, sent_ms=2100, rx_time=102.2)    # пришёл на 100 мс позже
+    assert link.snapshot(now=102.2)["jitter_ms"] == round(100 / 16, 1)
+    assert link.snapshot(now=110.0)["rate_pps"] == 0.0
+    assert "lost 0" in link.summary(now=110.0)
+    link.reset()
+    assert link.snapshot(now=110.0)["received"] == 0
@@ -0,0 +1,36 @@
+from telemetry.logagg import LogAggregator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_summary():
+    clock = FakeClock()
+    agg = LogAggregator(window=10.0, burst=3, clock=clock)
+    for n in range(100):
+        agg.add(f"[UDP] packet {n}", key="[UDP] packet")
+    agg.add("[INFO] connected")
+    assert agg.drain() == []                 # flush_interval ещё не прошёл
+    clock.now += 1.0
+    assert agg.drain() == ["[UDP] packet 0", "[UDP] packet 1", "[UDP] packet 2", "[INFO] connected"]
+    assert agg.suppressed == 97
+    clock.now += 9.0
+    assert agg.drain() == ["[UDP] packet — 100× за 10 с"]
+    # Новое окно: снова пропускается burst сообщений
+    agg.add("[UDP] packet x", key="[UDP] packet")
+    assert agg.drain(force=True) == ["[UDP] packet x"]
+    assert agg.batches == 3 and agg.received == 102
+
+
+def test_overflow_is_reported():
+    agg = LogAggregator(max_batch=5, clock=FakeClock())
+    for n in range(8):
+        agg.add(str(n))
+    batch = agg.drain(force=True)
+    assert batch[:5] == ["0", "1", "2", "3", "4"]
+    assert "пропущено 3" in batch[-1] and agg.dropped == 0
@@ -0,0 +1,27 @@
+from telemetry.logindex import LogIndex
+
+
+def brute(ix, query, levels=None):
+    return [s for s in range(ix.base, ix.end) if ix.matches(s, query.lower(), levels)]
+
+
+def test_refine_after_append():
+    ix = LogIndex()
+    for i in range(4):
+        ix.append(f"[UDP] packet {i}", "info")
+    rows = ix.search("udp")
+    # LogModel.append дописывает совпавшие новые строки в свой список
+    for i in range(4, 6):
+        seq = ix.append(f"[UDP] packet {i}", "info")
+        if ix.matches(seq, "udp"):
+            rows.append(seq)
+    assert ix.search("udp]") == brute(ix, "udp]") == [0, 1, 2, 3, 4, 5]
+
+
+def test_refine_with_levels_and_eviction():
+    ix = LogIndex(max_entries=5)
+    for i in range(8):
+        ix.append(f"[{'ERROR' if i % 2 else 'INFO'}] line {i}", "danger" if i % 2 else "info")
+    assert ix.search("line", {"danger"}) == brute(ix, "line", {"danger"})
+    ix.append("[ERROR] line 8", "danger")
+    assert ix.search("line 8", {"danger"}) == brute(ix, "line 8", {"danger"}) == [8]
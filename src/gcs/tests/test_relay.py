@@ -0,0 +1,55 @@
+import pytest
+
+from telemetry import checksum, codec, o2, relay
+
+
+def frame(n):
+    values = [0] * len(codec.FIELDS)
+    values[0], values[2], values[12] = 0xAAAA, n * 100, n
+    return bytes(checksum.seal(bytearray(codec.encode(values))))
+
+
+def test_pack_and_unpack_round_trip():
+    records = [relay.pack_record(n, 1000.0 + n, n % 2 == 0, frame(n)) for n in range(20)]
+    datagrams = relay.pack_datagrams(records, sent=1234.5)
+    assert len(datagrams) == 2                      # 16 + 4
+    assert all(len(d) <= 1472 for d in datagrams)   # один UDP-пакет без фрагментации
+    got = []
+    for d in datagrams:
+        assert relay.is_relay(d) and relay.sent_time(d) == 1234.5
+        got += relay.unpack(d)
+    assert [f.seq for f in got] == list(range(20))
+    assert got[3].rx_time == 1003.0 and got[3].crc_ok is False and got[4].crc_ok is True
+    assert bytes(got[5].frame) == frame(5)
+
+
+def test_version_1_datagram_is_accepted():
+    record = relay.pack_record(0xFFFFFFFF + 3, 5.0, True, frame(1))
+    datagram = relay.DGRAM_HDR.pack(relay.MAGIC, 1, 1) + record
+    assert relay.sent_time(datagram) is None
+    (got,) = relay.unpack(datagram)
+    assert got.seq == 2 and bytes(got.frame) == frame(1)
+
+
+def test_bad_datagrams_raise():
+    good = relay.pack_datagrams([relay.pack_record(1, 0.0, True, frame(1))])[0]
+    assert not relay.is_relay(b'{"time": 1}')
+    with pytest.raises(ValueError):
+        relay.unpack(good[:-1])
+    with pytest.raises(ValueError):
+        relay.unpack(relay.DGRAM_HDR.pack(relay.MAGIC, 9, 0))
+
+
+def test_hello():
+    assert relay.parse_hello(relay.HELLO_JSON) == "json"
+    assert relay.parse_hello(relay.HELLO_BIN) == "bin"
+    assert relay.parse_hello(b"hello") is None
+
+
+def test_o2_percent_and_raw_are_inverse():
+    # percent() округляет до 0.1 %, это ~5 единиц АЦП
+    for raw in (300, 410, 1200, 2000):
+        assert abs(o2.raw(o2.percent(raw)) - raw) <= 5
+    for pct in (0.0, 20.9, 55.5):
+        assert o2.percent(o2.raw(pct)) == pct
+    assert o2.percent(0) == 0.0          # ниже V_zero — ограничение снизу
@@ -0,0 +1,51 @@
+from telemetry import checksum, codec
+from telemetry.replay import Replay, ReplayIndex
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_log(times_ms):
+    out = bytearray()
+    for n, t in enumerate(times_ms):
+        values = [0] * len(codec.FIELDS)
+        values[0], values[2], values[12] = 0xAAAA, t, n
+        frame = bytearray(codec.default_codec.struct.pack(*values))
+        frame[-1] = checksum.xor_block(frame[:-1])
+        out += frame
+    return bytes(out)
+
+
+def test_set_speed_while_paused_does_not_freeze():
+    clock = FakeClock()
+    index = ReplayIndex(make_log([0, 1000, 2000, 3000]))
+    rp = Replay(index, speed=1.0, clock=clock)
+    assert rp.take_due() == [0]
+    rp.pause()
+    clock.now += 60.0
+    rp.set_speed(2.0)
+    clock.now += 30.0
+    rp.resume()
+    # Смена скорости привязывает шкалу к следующему кадру: он выходит сразу,
+    # без «заморозки» на длину паузы, а дальше темп 2×
+    assert rp.take_due() == [1]
+    assert rp.wait_time(10.0) == 0.5
+    clock.now += 0.5
+    assert rp.take_due() == [2]
+
+
+def test_pause_resume_keeps_position():
+    clock = FakeClock()
+    rp = Replay(ReplayIndex(make_log([0, 1000, 2000])), clock=clock)
+    rp.take_due()
+    rp.pause()
+    clock.now += 5.0
+    assert rp.take_due() == []
+    rp.resume()
+    clock.now += 1.0
+    assert rp.take_due() == [1]
@@ -0,0 +1,64 @@
+import threading
+
+from telemetry.scheduler import FrameCoalescer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_one_signal_per_batch():
+    fc = FrameCoalescer(clock=FakeClock())
+    assert fc.push(1) is True
+    assert fc.push(2) is False and fc.push(3) is False
+    assert fc.take() == [1, 2, 3]
+    assert fc.take() == []
+    assert fc.push(4) is True
+    s = fc.stats()
+    assert (s["received"], s["frames"], s["coalesced"], s["signals"], s["pending"]) == (4, 1, 2, 2, 1)
+
+
+def test_interval_follows_packet_rate():
+    clock = FakeClock()
+    fc = FrameCoalescer(min_interval=0.033, max_interval=0.25, hidden_interval=0.5, clock=clock)
+    assert fc.next_interval() == 0.25             # пакетов ещё не было
+    for _ in range(200):                          # сглаживание ~1 с — ждём 20 с
+        clock.now += 0.1
+        fc.push(0)
+        fc.take()
+    assert abs(fc.rate - 10.0) < 1e-3
+    assert abs(fc.next_interval() - 0.1) < 1e-4
+    assert fc.next_interval(visible=False) == 0.5
+    for _ in range(20):
+        clock.now += 0.1
+        for _ in range(100):
+            fc.push(0)
+        fc.take()
+    assert fc.next_interval() == 0.033
+
+
+def test_overflow_and_threads():
+    fc = FrameCoalescer(max_pending=3, clock=FakeClock())
+    for n in range(5):
+        fc.push(n)
+    assert fc.take() == [2, 3, 4] and fc.dropped == 2
+    fc = FrameCoalescer(clock=FakeClock())
+    got = []
+    done = threading.Event()
+
+    def producer():
+        for n in range(5000):
+            fc.push(n)
+        done.set()
+
+    t = threading.Thread(target=producer)
+    t.start()
+    while not done.is_set():
+        got += fc.take()
+    t.join()
+    got += fc.take()
+    assert got == list(range(5000))
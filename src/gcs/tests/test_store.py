@@ -0,0 +1,57 @@
+import threading
+
+from telemetry import codec
+from telemetry.store import TelemetryStore
+
+
+def packet(n, t):
+    values = [0] * len(codec.FIELDS)
+    values[0], values[2], values[12] = 0xAAAA, t, n
+    return tuple(values)
+
+
+def test_add_flush_and_query_range(tmp_path):
+    db = TelemetryStore(str(tmp_path / "t.db"), source="a.bin", batch_size=1000, flush_interval=1e9)
+    for n in range(10):
+        db.add(packet(n, n * 100), rx_time=1000.0 + n)
+    assert db.query_range() == []          # ещё в очереди
+    db.flush()
+    rows = db.query_range(200, 500, columns=["packet_num", "time"])
+    assert rows == [(2, 200), (3, 300), (4, 400), (5, 500)]
+    assert db.query_range(3, 4, columns=["packet_num"], by="packet_num") == [(3,), (4,)]
+    db.close()
+
+
+def test_sessions_are_separate(tmp_path):
+    path = str(tmp_path / "t.db")
+    first = TelemetryStore(path, source="a.bin")
+    first.add(packet(1, 0))
+    first.close()
+    second = TelemetryStore(path, source="b.bin")
+    second.add(packet(2, 0))
+    second.add(packet(3, 0))
+    second.flush()
+    assert [(s[0], s[2], s[3]) for s in second.sessions()] == [(1, "a.bin", 1), (2, "b.bin", 2)]
+    assert second.query_range(columns=["packet_num"]) == [(2,), (3,)]
+    assert len(second.query_range(columns=["packet_num"], session=0)) == 3
+    second.close()
+
+
+def test_flush_from_other_thread_loses_nothing(tmp_path):
+    db = TelemetryStore(str(tmp_path / "t.db"), batch_size=50, flush_interval=1e9)
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            db.flush()
+
+    t = threading.Thread(target=reader)
+    t.start()
+    for n in range(5000):
+        db.add(packet(n % 65536, n))
+    stop.set()
+    t.join()
+    db.flush()
+    assert db.rows == 5000
+    assert len(db.query_range(columns=["time"])) == 5000
+    db.close()
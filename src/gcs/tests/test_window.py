@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from telemetry.window import SlidingExtrema
+
+
+def test_matches_naive_window():
+    rnd = random.Random(4)
+    values = [rnd.uniform(-100, 100) for _ in range(2000)]
+    w = SlidingExtrema(37)
+    for i, v in enumerate(values):
+        w.push(v)
+        tail = values[max(0, i - 36):i + 1]
+        assert (w.min(), w.max()) == (min(tail), max(tail))
+    assert len(w) == 37 and w.last == values[-1]
+
+
+def test_skips_missing_values_and_clears():
+    w = SlidingExtrema(3)
+    assert w.min() is None and w.max() is None
+    w.extend([5, None, float("nan"), 1, 9])
+    assert (w.min(), w.max(), len(w)) == (1, 9, 3)
+    w.push(2)
+    w.push(3)
+    assert (w.min(), w.max()) == (2, 9)
+    w.push(4)
+    assert (w.min(), w.max()) == (2, 4)
+    w.clear()
+    assert len(w) == 0 and w.last is None and w.max() is None
+    with pytest.raises(ValueError):
+        SlidingExtrema(0)
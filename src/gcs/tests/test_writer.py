@@ -0,0 +1,29 @@
+from telemetry.writer import LogWriter, csv_row
+
+
+def test_csv_row_format():
+    assert csv_row((1, -2, 3.5)) == "1;-2;3.5;\n"
+
+
+def test_writes_raw_and_rows_in_order(tmp_path):
+    bin_path, csv_path = tmp_path / "g.bin", tmp_path / "g.csv"
+    writer = LogWriter(str(bin_path), str(csv_path), csv_header="a;b;\n", sync_interval=60)
+    for n in range(100):
+        writer.write_raw(bytes([n]) * 3)
+        writer.write_row((n, n * 2))
+    writer.close()
+    assert not writer.is_alive() and writer.error is None
+    assert bin_path.read_bytes() == b"".join(bytes([n]) * 3 for n in range(100))
+    lines = csv_path.read_text().splitlines()
+    assert lines[0] == "a;b;" and lines[1:] == [f"{n};{n * 2};" for n in range(100)]
+    assert writer.raw_bytes == 300 and writer.rows == 100
+    assert writer.dropped_bytes == writer.dropped_rows == 0
+    assert writer.syncs >= 1                 # fsync при закрытии
+
+
+def test_sync_by_size(tmp_path):
+    writer = LogWriter(str(tmp_path / "g.bin"), str(tmp_path / "g.csv"),
+                       sync_interval=60, sync_bytes=1)
+    writer.write_raw(b"\xAA\xAA")
+    writer.close()
+    assert writer.syncs == 1
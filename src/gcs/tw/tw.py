@@ -20,6 +20,8 @@ if getattr(sys, "frozen", False):
     BASE_PATH = sys._MEIPASS
 else:
     BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+    # Общие модули наземки (src/gcs/telemetry) лежат уровнем выше
+    sys.path.insert(0, os.path.dirname(BASE_PATH))
 
 # 🌐 Настройка Qt API
 os.environ['QT_API'] = 'pyside6'
@@ -29,7 +31,7 @@ STABLE_VERSION = "2.3.0"
 GITHUB_REPO   = "NorfaRu/NorfaTelemtry"
 
 # ДЛЯ ТОГО ЧТОБЫ СОБРАТЬ ФАЙЛ В ТЕРМИНАЛЕ:
-# pyinstaller tw.py --onefile --windowed --icon=logo.ico --upx-dir=upx-5.0.0-win64 (после выполнения в скомпилированном виде 162 мб где-то так)
+# pyinstaller tw.py --onefile --windowed --icon=logo.ico --paths .. --upx-dir=upx-5.0.0-win64 (после выполнения в скомпилированном виде 162 мб где-то так)
 
 from PySide6.QtCore import QPropertyAnimation, QObject, QMetaObject
 from PySide6.QtGui  import QGuiApplication
@@ -49,13 +51,15 @@ from PySide6.QtWidgets import (
 )
 
 from PySide6.QtGui    import QDrag, QMouseEvent, QDropEvent, QDragEnterEvent, QDragMoveEvent
-from PySide6.QtCore   import QByteArray, QMimeData
+from PySide6.QtCore   import QByteArray, QMimeData, QPointF
 from PySide6.QtWidgets import QPlainTextEdit, QComboBox
 
 # 🔄 Qt Core — Сигналы, Слоты, Таймеры, Потоки
 from qtpy.QtCore import (
     Qt, QThread, Signal, Slot, QTimer, QRect
 )
+from PySide6.QtCore import QAbstractListModel, QModelIndex
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
 
 
 # 🎨 Qt GUI — Графика и Стили
@@ -74,13 +78,27 @@ from qtpy.QtCharts import (
 # 📊 PyQtGraph — Быстрая 2D и 3D визуализация
 # --- Удаляем зависимость от OpenGL --- 
 # from pyqtgraph.opengl import MeshData
+# Необязательный бэкенд графиков: "backend": "pyqtgraph" в секции graphs
+try:
+    import numpy as np
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
 
 # === ПАРАМЕТРЫ ПАРСЕРА ===
+from telemetry import checksum, codec, fields, o2, relay, replay, store
+from telemetry.decimate import MinMaxDecimator, lttb
+from telemetry.latency import LatencyTracer
+from telemetry.linkstats import LinkStats
+from telemetry.logagg import LogAggregator
+from telemetry.logindex import LogIndex
+from telemetry.scheduler import FrameCoalescer
+from telemetry.window import SlidingExtrema
 #DEBUG = False
 PL, R0 = 1000, 4000
 NAKLON, SMESHENIE = -0.7565, 1.269
 SCALE = math.pow(10, -SMESHENIE / NAKLON)
-STRUCT_FMT = "<2HIhI6hBHBH4h3fB3HB"  # 60 bytes
+STRUCT_FMT = codec.PACKET_FMT  # 60 bytes
 
 # === ЦВЕТОВАЯ СХЕМА ===
 COLORS = {
@@ -646,14 +664,42 @@ class ExportLogsThread(QThread):
         except Exception as e:
             self.finished.emit("", False, str(e))
 
+class ReplayIndexThread(QThread):
+    """Фоновая индексация файла имитации (mmap + поиск кадров по кускам)."""
+    progress = Signal(int, int)   # байт просмотрено, всего
+
+    def __init__(self, path: str, pkt_codec, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.codec = pkt_codec
+        self.index = None
+        self.error = ""
+
+    def run(self):
+        try:
+            index = replay.ReplayIndex.open(self.path, self.codec, build=False)
+            if index.build(progress=self.progress.emit, cancel=self.isInterruptionRequested):
+                self.index = index
+            else:
+                index.close()
+        except Exception as e:
+            self.error = str(e)
+
+
+_ME2O2 = codec.FIELDS.index("me2o2")   # сырое АЦП кислорода в кадре
+
 # === WORKER ДЛЯ UART + UDP + ЛОГОВ + CRC-ОШИБОК ===
 class TelemetryWorker(QThread):
-    data_ready    = Signal(dict)
+    data_ready    = Signal(dict)   # пакет по одному, если кольцо (ring) не подключено
+    batch_ready   = Signal()       # в ring появилась пачка пакетов; не чаще раза за кадр
     packet_ready  = Signal(list)
     log_ready     = Signal(str)
+    logs_ready    = Signal(list)   # пачка строк журнала из потока приёма
     error_crc     = Signal()
     sim_ended     = Signal()
     simulation_progress = Signal(int, int)
+    replay_indexing     = Signal(int, int)   # прогресс индексации файла имитации
+    link_stats          = Signal(dict)       # LinkStats.snapshot() раз в секунду
     # --- Добавляем сигнал для уведомлений --- (Добавлено)
     notification_requested = Signal(str, str) # message, level
 
@@ -662,6 +708,11 @@ class TelemetryWorker(QThread):
         self.config = config
         self.packet_format = config["packet_structure"]["format"]
         self.fields = config["packet_structure"]["fields"]
+        self.codec = codec.PacketCodec(self.packet_format)
+        # packet_structure -> готовая функция pkt -> dict (без разбора конфига на каждом пакете)
+        self.decode_fields, self.field_errors = fields.compile_fields(self.fields, self.codec.count)
+        # Обратный пересчёт для JSON: значения снова в формате прошивки (CSV, SQLite)
+        self.raw_fields = fields.compile_raw(self.fields, self.codec)
         import time
         # Для Mahony AHRS
         self.qw, self.qx, self.qy, self.qz = 1.0, 0.0, 0.0, 0.0
@@ -669,10 +720,24 @@ class TelemetryWorker(QThread):
         self.int_fb_x = self.int_fb_y = self.int_fb_z = 0.0
         self.last_fuse_time = time.time()
         self.last_data_time = None
-        self.sim_f = None
+        # Имитация: индекс кадров файла и темп по полю time (telemetry/replay.py)
+        self.replay = None
+        self.replay_indexer = None
+        self._stale_indexers = []         # прерванные индексаторы: держим, пока не завершатся
+        self.replay_speed = 1.0
+        self._replay_requests = deque()   # команды из GUI: ("speed"|"seek"|"seek_time"|"seek_packet"|"file", value)
         # для дросселя CRC‑варнингов
         self.last_crc_warning = 0.0
         self.crc_cooldown    = 1.0   # не более 1 варнинга в секунду
+        # Журнал из потока приёма: повторы сворачиваются в сводки, уходят пачкой
+        log_cfg = config.get("logging", {})
+        self.log_agg = LogAggregator(window=log_cfg.get("aggregate_window", 10.0),
+                                     burst=log_cfg.get("aggregate_burst", 3))
+        # Потери и джиттер по packet_num: сигнал раз в секунду, сводка в журнал раз в link_log_interval
+        self.link = LinkStats(window=log_cfg.get("link_log_interval", 10.0))
+        self._link_emit = self._link_log = time.time()
+        # Общее с окном кольцо пакетов (FrameCoalescer); задаёт MainWindow
+        self.ring = None
         self.port_name = port_name
         self.baud = baud
         self._running = True
@@ -681,6 +746,9 @@ class TelemetryWorker(QThread):
         self.udp_enabled = False
         self.udp_host = "127.0.0.1"
         self.udp_port = 5005
+        # Двоичный режим ретрансляции (сырые кадры вместо JSON), см. telemetry/relay.py;
+        # включается server.binary_relay, по умолчанию — совместимый JSON
+        self.udp_binary = config.get("server", {}).get("binary_relay", False)
         self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         # Для режима имитации
         self.sim_enabled   = False
@@ -692,18 +760,22 @@ class TelemetryWorker(QThread):
         self.csv_path = f"log/grib_{now}.csv"
         self.f_bin = open(self.bin_path, "ab")
         self.f_csv = open(self.csv_path, "w", encoding="utf-8")
-        headers = [f"field_{i}" for i in range(len(struct.unpack(STRUCT_FMT, b'\x00'*60)))]
+        headers = [f"field_{i}" for i in range(len(codec.FIELDS))]
         self.f_csv.write(";".join(headers) + "\n")
+        # SQLite по секции data_storage (таблица packets хранит значения формата прошивки)
+        self.store = None
+        if self.codec.count == len(codec.FIELDS):
+            try:
+                self.store = store.TelemetryStore.from_config(config, source=self.bin_path)
+            except Exception as e:
+                print(f"[STORE] SQLite storage disabled: {e}")
 
         #from functools import reduce
         #import operator
         #def xor_block(self, data: bytes) -> int:
             #return reduce(operator.xor, data, 0)
     def xor_block(self, data: bytes) -> int:
-            res = 0
-            for b in data:
-                res ^= b
-            return res
+            return checksum.xor_block(data)
 
     @Slot(bool, str)
     def update_simulation(self, enabled, file_path):
@@ -714,28 +786,15 @@ class TelemetryWorker(QThread):
             self.log_ready.emit("[SIM] Путь для симуляции не задан, режим имитации НЕ включён.")
             return
 
-        # 1. Корректно закрываем предыдущий файл симуляции, если он был открыт
-        if hasattr(self, 'sim_f') and self.sim_f:
-            try:
-                self.sim_f.close()
-                print("[SIM] Closed previous simulation file.") # Debug
-            except Exception as e:
-                print(f"[SIM] Error closing previous simulation file: {e}") # Debug
-        self.sim_f = None # Сбрасываем дескриптор в любом случае
+        # 1. Сброс предыдущего файла — в потоке приёма (он может сейчас читать из mmap);
+        # там же запустится индексация нового
+        self._replay_requests.append(("file", file_path))
 
         # 2. Обновляем путь и статус симуляции (выполняется всегда)
         self.sim_file_path = file_path
         self.sim_enabled = enabled
 
-        # 3. Пытаемся получить размер файла, если симуляция включена
-        self.sim_file_size = None
-        if enabled and file_path:
-            try:
-                self.sim_file_size = os.path.getsize(file_path)
-            except Exception as e:
-                self.log_ready.emit(f"[ERROR] Could not get size of simulation file {file_path}: {e}")
-
-        # 4. Логируем результат
+        # 3. Логируем результат
         ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_msg = f"[{ts}] Simulation set: enabled={enabled}, path={file_path or 'None'}"
         self.log_ready.emit(log_msg)
@@ -766,8 +825,9 @@ class TelemetryWorker(QThread):
                 self.udp_socket.settimeout(0.1)  # Set timeout immediately
                 self.udp_socket.bind(('', self.udp_port))
                 self.log_ready.emit(f"[{ts}] UDP settings updated: enabled={enabled}, host={host}, port={port}")
-                self.udp_socket.sendto(b"status", (self.udp_host, self.udp_port))
-                self.log_ready.emit(f"[{datetime.datetime.now()}] UDP bound to port {self.udp_port} and 'status' sent")
+                hello = relay.HELLO_BIN if self.udp_binary else relay.HELLO_JSON
+                self.udp_socket.sendto(hello, (self.udp_host, self.udp_port))
+                self.log_ready.emit(f"[{datetime.datetime.now()}] UDP bound to port {self.udp_port} and '{hello.decode()}' sent")
             except Exception as e:
                 self.log_ready.emit(f"[ERROR] UDP bind failed: {e}")
                 self.udp_enabled = False
@@ -775,6 +835,205 @@ class TelemetryWorker(QThread):
         else:
             self.log_ready.emit(f"[{datetime.datetime.now()}] UDP disabled; socket closed")
 
+    def _log(self, message, key=None):
+        """Сообщение из потока приёма; key — категория для сворачивания повторов."""
+        self.log_agg.add(message, key)
+
+    def _flush_logs(self, force=False):
+        batch = self.log_agg.drain(force)
+        if batch:
+            self.logs_ready.emit(batch)
+
+    def _record_packet(self, pkt, frame, rx_time=None):
+        """Пакет в CSV, .bin (если есть исходный кадр) и SQLite — значения формата прошивки."""
+        if self.f_csv and not self.f_csv.closed:
+            self.f_csv.write(";".join(str(x) for x in pkt) + "\n")
+        if frame is not None and self.f_bin and not self.f_bin.closed:
+            self.f_bin.write(frame)
+        if self.store:
+            self.store.add(pkt, rx_time)
+
+    def _publish(self, data):
+        """Отдать пакет интерфейсу: в кольцо с одним сигналом на пачку или сигналом data_ready."""
+        if self.ring is None:
+            self.data_ready.emit(data)
+        elif self.ring.push(data):
+            self.batch_ready.emit()
+
+    def _track_link(self, packet_num, sent_ms, rx_time=None, size=60):
+        if packet_num is not None:
+            self.link.add(int(packet_num), sent_ms, rx_time or time.time(), size)
+
+    def _track_packet(self, pkt, rx_time=None, size=60):
+        """packet_num и time берутся по индексам формата прошивки (codec.FIELDS)."""
+        if len(pkt) == len(codec.FIELDS):
+            self._track_link(pkt[12], pkt[2], rx_time, size)
+
+    def _report_link(self):
+        now = time.time()
+        if now - self._link_emit < 1.0 or not self.link.received:
+            return
+        self._link_emit = now
+        self.link_stats.emit(self.link.snapshot(now))
+        if now - self._link_log >= self.link.window:
+            self._link_log = now
+            self._log(f"[LINK] {self.link.summary(now)}")
+
+    def _crc_failed(self, message):
+        """CRC-ошибка: в журнал через агрегатор, звук и уведомление — не чаще crc_cooldown."""
+        self._log(message, key=message)
+        now = time.monotonic()
+        if now - self.last_crc_warning >= self.crc_cooldown:
+            self.last_crc_warning = now
+            self.error_crc.emit()
+            return True
+        return False
+
+    @Slot(float)
+    def set_replay_speed(self, speed):
+        """Скорость имитации: множитель 0.5–100 или replay.AFAP («как можно быстрее»)."""
+        self._replay_requests.append(("speed", speed))
+
+    @Slot(str, float)
+    def seek_replay(self, kind, value):
+        """Перемотка имитации: kind — "seek" (кадр), "seek_time" (с) или "seek_packet"."""
+        self._replay_requests.append((kind, value))
+
+    def _drop_replay(self):
+        indexer, self.replay_indexer = self.replay_indexer, None
+        if indexer is not None:
+            indexer.requestInterruption()
+            self._stale_indexers.append(indexer)
+        rp, self.replay = self.replay, None
+        if rp is not None:
+            rp.index.close()
+
+    def _open_replay(self):
+        """Индекс файла строится в ReplayIndexThread; пока он не готов — None."""
+        self._stale_indexers = [t for t in self._stale_indexers if not t.isFinished()]
+        indexer = self.replay_indexer
+        if indexer is None:
+            indexer = self.replay_indexer = ReplayIndexThread(self.sim_file_path, self.codec)
+            indexer.progress.connect(self.replay_indexing)
+            indexer.start()
+            return None
+        if not indexer.isFinished():
+            return None
+        self.replay_indexer = None
+        index = indexer.index
+        if index is None:
+            self._log(f"[ERROR] Failed to open simulation file {indexer.path}: {indexer.error or 'прервано'}")
+            self.sim_enabled = False # Отключаем симуляцию при ошибке
+            return None
+        self._log(f"[SIM] Opened simulation file: {indexer.path} "
+                  f"({len(index)} пакетов, {index.duration():.1f} с)")
+        if index.skipped_bytes:
+            self._log(f"[WARNING] CRC mismatch (sim): пропущено {index.skipped_bytes} байт вне целых пакетов")
+            self.notification_requested.emit("CRC mismatch (sim)", "warning")
+        self.replay = replay.Replay(index, speed=self.replay_speed)
+        return self.replay
+
+    def _apply_file_change(self):
+        """Смена файла имитации (update_simulation): закрыть старый индекс в этом потоке.
+
+        Перемотки, поставленные до смены файла, относятся к старому файлу и
+        выбрасываются; остальные команды остаются в очереди для _replay_step.
+        """
+        requests = self._replay_requests
+        if not any(kind == "file" for kind, _ in list(requests)):
+            return
+        keep = []
+        while requests:
+            kind, value = requests.popleft()
+            if kind == "file":
+                keep = [r for r in keep if r[0] == "speed"]
+                self._drop_replay()
+                self.link.reset()
+            else:
+                keep.append((kind, value))
+        requests.extendleft(reversed(keep))
+
+    def _replay_step(self):
+        """Выдать кадры имитации, время которых наступило, и подождать до следующего."""
+        rp = self.replay or self._open_replay()
+        if rp is None:
+            self.msleep(50)
+            return
+        while self._replay_requests:
+            kind, value = self._replay_requests.popleft()
+            if kind == "speed":
+                self.replay_speed = value
+                rp.set_speed(value)
+            elif kind == "seek":
+                rp.seek(int(value))
+            elif kind == "seek_time":
+                rp.seek_time(value)
+            elif kind == "seek_packet" and not rp.seek_packet(int(value)):
+                self._log(f"[WARNING] Пакет {int(value)} в файле имитации не найден")
+        if self._paused:
+            rp.pause()
+        else:
+            rp.resume()
+        index = rp.index
+        due = rp.take_due()
+        for i in due:
+            pkt = index.decode(i)
+            self._track_packet(pkt)
+            try:
+                # Поля из packet_structure скомпилированы один раз в __init__
+                data = self.decode_fields(pkt)
+            except Exception as e:
+                self._log(f"[ERROR] Ошибка парсинга полей из config (симуляция): {e}",
+                          key="[ERROR] Ошибка парсинга полей из config (симуляция)")
+                continue
+            data["_trace"] = [("emit", time.time())]
+            self._publish(data)
+            self._record_packet(pkt, index.frame(i))
+        if due:
+            self.last_data_time = time.time()
+            self.simulation_progress.emit(rp.position, len(index))
+        if rp.done:
+            self._log("[SIM] End of simulation file reached")
+            self.sim_ended.emit()
+            self.sim_enabled = False
+            self._drop_replay()
+            self.msleep(50) # Короткая пауза перед след. циклом
+            return
+        wait = rp.wait_time(0.05)
+        if wait > 0:
+            self.msleep(max(1, int(wait * 1000)))
+
+    def _handle_relay_datagram(self, rcv, addr, recv_time=None):
+        """Разбор двоичной датаграммы gcs.py: несколько проверенных кадров."""
+        recv_time = recv_time or time.time()
+        sent = relay.sent_time(rcv)
+        try:
+            frames = relay.unpack(rcv)
+        except (ValueError, struct.error) as e:
+            self._log(f"[ERROR] Invalid relay datagram from {addr}: {e}", key="[ERROR] Invalid relay datagram")
+            return
+        for rf in frames:
+            if not rf.crc_ok or not checksum.verify(rf.frame):
+                self._crc_failed("[WARNING] CRC mismatch (relay)")
+                continue
+            pkt = self.codec.decode(rf.frame)
+            self._track_packet(pkt, rf.rx_time, len(rf.frame))
+            data = self.decode_fields(pkt)
+            if "me2o2" in data:
+                # В JSON gcs.py присылает уже % O2 — в двоичном режиме считаем так же
+                data["me2o2"] = o2.percent(pkt[_ME2O2])
+            # Метки пути пакета; MainWindow допишет flush/render (telemetry/latency.py)
+            trace = [("uart", rf.rx_time)]
+            if sent is not None:
+                trace.append(("send", sent))
+            trace.append(("recv", recv_time))
+            trace.append(("emit", time.time()))
+            data["_trace"] = trace
+            self._publish(data)
+            self._record_packet(pkt, rf.frame, rf.rx_time)
+        self.last_data_time = time.time()
+        self._log(f"[UDP] Received {len(frames)} relay frames from {addr}", key="[UDP] Received relay datagram")
+
     def pause(self):
         self._paused = True
 
@@ -798,182 +1057,40 @@ class TelemetryWorker(QThread):
         print("[WORKER] TelemetryWorker thread started") # Изменено
         # Убираем вывод про SIM, он может сбивать с толку
         # print(f"[SIM] run() started: initial sim_enabled={self.sim_enabled}, udp_enabled={self.udp_enabled}")
-        buf = b"" # Буфер для COM-порта и симуляции
-        self.log_ready.emit(f"Telemetry thread started. Version {APP_VERSION}")
-        self.log_ready.emit(f"Надёжная версия: {STABLE_VERSION}")
+        self._log(f"Telemetry thread started. Version {APP_VERSION}")
+        self._log(f"Надёжная версия: {STABLE_VERSION}")
+        for err in self.field_errors:
+            self._log(f"[ERROR][CONFIG] {err}")
 
         while self._running:
+            self._apply_file_change()
+            self._report_link()
+            self._flush_logs()
             # Если ни симуляция, ни UDP не включены, даём GUI отдохнуть
             if not self.sim_enabled and not self.udp_enabled:
                 self.msleep(50)   # пауза 50 мс
                 continue
             # Приоритет режима имитации
             if self.sim_enabled:
-                if not hasattr(self, 'sim_f') or self.sim_f is None:
-                    try:
-                        #print(f"[SIM_DBG] Attempting to open: {self.sim_file_path}") # Debug
-                        self.sim_f = open(self.sim_file_path, 'rb')
-                        self.log_ready.emit(f"[SIM] Opened simulation file: {self.sim_file_path}")
-                        #print(f"[SIM_DBG] File opened successfully.") # Debug
-                    except Exception as e:
-                        self.log_ready.emit(f"[ERROR] Failed to open simulation file {self.sim_file_path}: {e}")
-                        self.sim_enabled = False # Отключаем симуляцию при ошибке
-                        self.msleep(1000)
-                        continue
-
                 try:
-                    rcv = self.sim_f.read(60) # Читаем бинарный блок
-                    #print(f"[SIM_DBG] Read {len(rcv)} bytes from file.") # Debug
-                    if not rcv:
-                        self.log_ready.emit("[SIM] End of simulation file reached")
-                        self.sim_ended.emit()
-                        self.sim_enabled = False
-                        try: self.sim_f.close()
-                        except: pass
-                        self.sim_f = None
-                        self.msleep(50) # Короткая пауза перед след. циклом
-                        continue
-                    # Эмитим прогресс (текущая позиция и размер)
-                    pos = self.sim_f.tell()
-                    if hasattr(self, "sim_file_size") and self.sim_file_size:
-                        self.simulation_progress.emit(pos, self.sim_file_size)
-                    # Имитируем задержку
-                    self.msleep(500) # Увеличим задержку (было 100)
-
-                    # Обрабатываем бинарный пакет из симуляции (старая логика)
-                    if self._paused:
-                        continue
-                    buf += rcv
-                    # --- Отладка Симуляции --- (Добавлено)
-                    #print(f"[SIM_DEBUG] Read {len(rcv)} bytes. Buffer size: {len(buf)}")
-                    while len(buf) >= 60:
-                         # ... (Старая логика обработки бинарного пакета buf) ...
-                         if buf[:2] == b"\xAA\xAA":
-                             # --- Отладка Симуляции --- (Добавлено)
-                             #print("[SIM_DEBUG] Found header 0xAAAA")
-                             chunk = buf[:60]
-                             try:
-                                 pkt = struct.unpack(self.packet_format, chunk)
-                                 #print(f"[SIM_DBG] Unpacked pkt: {pkt}") # Debug
-                             except struct.error:
-                                 # --- Отладка Симуляции --- (Добавлено)
-                                 #print("[SIM_DEBUG] Struct unpack error. Skipping byte.")
-                                 buf = buf[1:]
-                                 continue
-                             # --- Отладка Симуляции --- (Добавлено)
-                             calculated_crc = self.xor_block(chunk[:-1])
-                             received_crc = pkt[-1]
-                             #print(f"[SIM_DEBUG] CRC Check: Calculated={calculated_crc}, Received={received_crc}")
-                             if calculated_crc == received_crc:
-                                 # --- Отладка Симуляции --- (Добавлено)
-                                 #print("[SIM_DEBUG] CRC OK. Emitting data_ready.")
-                                 try:
-                                     # --- Восстанавливаем динамическое формирование data из self.fields --- (Изменено)
-                                     data = {}
-                                     # Используем self.fields, прочитанные из packet_structure
-                                     for field in self.fields:
-                                         field_name = field.get("name")
-                                         if not field_name:
-                                             continue # Пропускаем поле без имени
-                                         
-                                         field_type = field.get("type")
-                                         scale = field.get("scale", 1.0)
-                                         mask = field.get("mask")
-                                         indices = field.get("indices")
-                                         index = field.get("index")
-
-                                         # Обработка разных типов полей из конфига
-                                         if field_type == "vector3" and indices and len(indices) == 3:
-                                             try:
-                                                 val = [pkt[i] * scale for i in indices]
-                                                 data[field_name] = val
-                                             except IndexError:
-                                                 self.log_ready.emit(f"[ERROR][SIM] Invalid indices {indices} for packet length {len(pkt)} in field {field_name}")
-                                         elif field_type == "float" and index is not None:
-                                             try:
-                                                 val = pkt[index] * scale
-                                                 data[field_name] = val
-                                             except IndexError:
-                                                 self.log_ready.emit(f"[ERROR][SIM] Invalid index {index} for packet length {len(pkt)} in field {field_name}")
-                                         elif field_type == "int" and index is not None:
-                                             try:
-                                                 val = pkt[index]
-                                                 if mask is not None:
-                                                     val &= mask
-                                                 # --- Применяем scale --- (Добавлено)
-                                                 if scale != 1.0:
-                                                     val = val * scale
-                                                 data[field_name] = val
-                                             except IndexError:
-                                                 self.log_ready.emit(f"[ERROR][SIM] Invalid index {index} for packet length {len(pkt)} in field {field_name}")
-                                         elif index is not None: # Обработка uint/int/прочих по index, если тип не указан явно
-                                              try:
-                                                  # --- Читаем значение и применяем scale --- (Добавлено)
-                                                  val = pkt[index]
-                                                  # Получаем scale и для этого случая
-                                                  scale = field.get("scale", 1.0)
-                                                  if scale != 1.0:
-                                                      val = val * scale
-                                                  data[field_name] = val
-                                              except IndexError:
-                                                  self.log_ready.emit(f"[ERROR][SIM] Invalid index {index} for packet length {len(pkt)} in field {field_name}")
-                                         # Добавьте другие типы при необходимости (bytes и т.д.)
-                                     # --- Конец динамического формирования --- 
-                                     #print(f"[SIM_DBG] Parsed data dict: {data}") # Debug
- 
-                                     # Отправляем готовые данные
-                                     self.data_ready.emit(data)
-                                     self.last_data_time = time.time()
-                                     if self.f_csv and not self.f_csv.closed:
-                                         self.f_csv.write(";".join(str(x) for x in pkt) + "\n")
-                                     if self.f_bin and not self.f_bin.closed:
-                                        self.f_bin.write(chunk)
-                                     buf = buf[60:]
-                                 except Exception as e:
-                                     self.log_ready.emit(f"[ERROR] Ошибка парсинга полей из config (симуляция): {e}") # Изменено сообщение
-                                     buf = buf[60:] # Пропускаем пакет, т.к. не смогли сформировать data
-                                     continue
-                             else:
-                                 self.error_crc.emit()
-                                 mw = QApplication.activeWindow()
-                                 # --- Используем сигнал вместо прямого вызова notify --- (Изменено)
-                                 self.notification_requested.emit("CRC mismatch (sim)", "warning")
-                                 buf = buf[1:] # Сдвигаем буфер НА ОДИН БАЙТ при CRC ошибке
-                         else:
-                             # --- Отладка Симуляции --- (Добавлено)
-                             #print(f"[SIM_DEBUG] Header not found at start of buffer (starts with {buf[:2]}). Skipping byte.")
-                             #print(f"[SIM_DEBUG] Header not found at start (starts with {buf[:2]}). Searching...")
-                             header_index = buf.find(b"\xAA\xAA")
-                             if header_index != -1:
-                                 #print(f"[SIM_DBG] Header found at index {header_index}.") # Debug
-                                 #print(f"[SIM_DEBUG] Header found at index {header_index}. Slicing buffer.")
-                                 # Заголовок найден, отбрасываем все байты перед ним
-                                 buf = buf[header_index:]
-                             else:
-                                 #print(f"[SIM_DBG] Header not found in current buffer (len={len(buf)}). Keeping last byte.") # Debug
-                                 #print("[SIM_DEBUG] Header not found in buffer. Keeping last byte.")
-                                 # Заголовок не найден во всем буфере.
-                                 # Сохраняем только последний байт, т.к. начало заголовка (0xAA)
-                                 # могло попасть в конец буфера и быть частью следующего чтения.
-                                 # Если оставить buf = b"", то пакеты со смещением будут потеряны.
-                                 buf = buf[-1:] 
-                                 break # Выходим из while, т.к. без заголовка пакет не собрать
-
+                    self._replay_step()
                 except Exception as e:
-                    self.log_ready.emit(f"[ERROR] Ошибка во время симуляции: {e}")
+                    self._log(f"[ERROR] Ошибка во время симуляции: {e}", key="[ERROR] Ошибка во время симуляции")
                     self.msleep(1000)
-                    continue # Продолжаем цикл
+                continue # Продолжаем цикл
 
             # Режим UDP (если симуляция ВЫКЛЮЧЕНА)
             elif self.udp_enabled:
                 # Проверяем валидность сокета
                 if not hasattr(self, 'udp_socket') or not self.udp_socket:
-                    self.log_ready.emit("[WARN] UDP включен, но сокет невалиден/закрыт. Пропускаем итерацию.")
+                    self._log("[WARNING] UDP включен, но сокет невалиден/закрыт. Пропускаем итерацию.",
+                              key="[WARNING] UDP включен, но сокет невалиден/закрыт")
                     self.msleep(500) # Ждем немного перед следующей попыткой
                     continue
 
                 try:
                     rcv, addr = self.udp_socket.recvfrom(4096) # Увеличим буфер для JSON
+                    recv_time = time.time()
                     # Если мы здесь, значит, данные пришли
                     if self._paused:
                         continue
@@ -983,14 +1100,23 @@ class TelemetryWorker(QThread):
                     try:
                         # Проверяем, не является ли это статус-запросом
                         if rcv == b"status":
-                            self.log_ready.emit(f"[UDP] Received status request from {addr}")
+                            self._log(f"[UDP] Received status request from {addr}", key="[UDP] Received status request")
+                            continue
+                        if rcv in (relay.ACK_JSON, relay.ACK_BIN):
+                            self._log(f"[UDP] Server {addr} confirmed mode: {rcv.decode()}")
+                            continue
+                        if rcv == b"ping":
+                            continue
+                        # Двоичный режим: сырые кадры от gcs.py
+                        if relay.is_relay(rcv):
+                            self._handle_relay_datagram(rcv, addr, recv_time)
                             continue
                             
                         # Пробуем декодировать как UTF-8
                         try:
                             json_string = rcv.decode('utf-8')
                         except UnicodeDecodeError:
-                            self.log_ready.emit(f"[ERROR] Invalid UTF-8 data from {addr}")
+                            self._log(f"[ERROR] Invalid UTF-8 data from {addr}", key="[ERROR] Invalid UTF-8 data")
                             continue
                             
                         if not json_string.strip():  # Skip empty strings
@@ -1001,24 +1127,42 @@ class TelemetryWorker(QThread):
                             data = json.loads(json_string)
                             # Проверяем, что это словарь
                             if not isinstance(data, dict):
-                                self.log_ready.emit(f"[ERROR] Invalid JSON format from {addr}: not a dictionary")
+                                self._log(f"[ERROR] Invalid JSON format from {addr}: not a dictionary", key="[ERROR] Invalid JSON format")
                                 continue
                                 
                             # Отправляем распарсенный JSON
-                            self.data_ready.emit(data)
+                            self._track_link(data.get("packet_num"), data.get("time"), size=len(rcv))
+                            # Сырого кадра в JSON нет: в CSV и SQLite — значения, пересчитанные
+                            # обратно в формат прошивки (me2o2 из % — с точностью ~0.1 %);
+                            # .bin пишется только из настоящих кадров (двоичный режим, имитация)
+                            try:
+                                pkt = self.raw_fields(data)
+                                if "me2o2" in data:
+                                    pkt[_ME2O2] = o2.raw(data["me2o2"])
+                                self._record_packet(pkt, None, data.get("rx_time"))
+                            except (ValueError, TypeError, IndexError) as e:
+                                self._log(f"[ERROR] Invalid values in JSON from {addr}: {e}",
+                                          key="[ERROR] Invalid values in JSON")
+                            trace = [("uart", data.pop("rx_time"))] if "rx_time" in data else []
+                            if "tx_time" in data:
+                                trace.append(("send", data.pop("tx_time")))
+                            data["_trace"] = trace + [("recv", recv_time), ("emit", time.time())]
+                            self._publish(data)
                             self.last_data_time = time.time()
-                            self.log_ready.emit(f"[UDP] Received valid packet from {addr}")
+                            self._log(f"[UDP] Received valid packet from {addr}", key="[UDP] Received valid packet")
                         except json.JSONDecodeError as e:
-                            self.log_ready.emit(f"[ERROR] Invalid JSON from {addr}: {e}")
-                            self.log_ready.emit(f"[DEBUG] Raw data: {rcv.hex()}")
+                            self._log(f"[ERROR] Invalid JSON from {addr}: {e}", key="[ERROR] Invalid JSON")
+                            self._log(f"[DEBUG] Raw data: {rcv.hex()}", key="[DEBUG] Raw data")
                     except Exception as e:
-                        self.log_ready.emit(f"[ERROR] Error processing UDP packet from {addr}: {e}")
+                        self._log(f"[ERROR] Error processing UDP packet from {addr}: {e}", key="[ERROR] Error processing UDP packet")
 
                 except socket.timeout:
-                    pass # Таймаут - это нормально, просто нет данных
+                    # Таймаут - это нормально, просто нет данных; дописываем хвост в БД
+                    if self.store:
+                        self.store.flush()
                 except Exception as e:
                     # Логируем другие ошибки сокета, но не останавливаем поток
-                    self.log_ready.emit(f"[ERROR] Ошибка UDP сокета: {e}")
+                    self._log(f"[ERROR] Ошибка UDP сокета: {e}", key="[ERROR] Ошибка UDP сокета")
                     # Попытка восстановить сокет при ошибке
                     try:
                         if self.udp_socket:
@@ -1030,14 +1174,19 @@ class TelemetryWorker(QThread):
 
 
         # --- Код завершения потока --- (остается как было)
-        if getattr(self, 'sim_f', None):
-            try: self.sim_f.close()
-            except: pass
+        self._drop_replay()
+        for indexer in self._stale_indexers:
+            indexer.wait(1000)
         for fh in (getattr(self, 'f_bin', None), getattr(self, 'f_csv', None)):
             try:
                 if fh and not fh.closed: fh.close()
             except: pass
-        self.log_ready.emit(f"[{datetime.datetime.now()}] TelemetryWorker stopped")
+        if self.store:
+            try: self.store.close()
+            except Exception as e: print(f"[STORE] Close failed: {e}")
+            self.store = None
+        self._log(f"[{datetime.datetime.now()}] TelemetryWorker stopped")
+        self._flush_logs(force=True)
 
     sim_ended = Signal()  # <-- новый сигнал
 
@@ -1225,6 +1374,12 @@ class TelemetryPage(QWidget):
         if not self.pause_btn.isEnabled():
             self.pause_btn.setEnabled(True)
 
+        # Скрытая страница только запоминает пакет; карточки обновятся в showEvent
+        if not self.isVisible():
+            self._stale = True
+            return
+        self._stale = False
+
         for src, (label, field) in self._label_widgets.items():
             val = data.get(src)
             # Get the format string from the field config, default to '{}'
@@ -1278,8 +1433,15 @@ class TelemetryPage(QWidget):
             label.setText("–")
         # Также сбрасываем последнее сохраненное состояние
         self._last_values = {}
+        self._stale = False
         print("[TelemetryPage] Values cleared.") # Для отладки
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Догоняем пропущенное, пока вкладка была скрыта: один последний пакет
+        if getattr(self, "_stale", False) and self._last_values:
+            self.update_values(self._last_values)
+
 class DraggableCard(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1323,14 +1485,68 @@ class DraggableCard(QFrame):
 
         ev.acceptProposedAction()
 
+class _PgAxisRange:
+    """Ось графика pyqtgraph с интерфейсом QValueAxis (min/max/setRange)."""
+
+    def __init__(self, plot, axis: int):
+        self._plot = plot
+        self._axis = axis   # 0 — X, 1 — Y
+
+    def min(self):
+        return self._plot.viewRange()[self._axis][0]
+
+    def max(self):
+        return self._plot.viewRange()[self._axis][1]
+
+    def setRange(self, lo, hi):
+        if self._axis == 0:
+            self._plot.setXRange(lo, hi, padding=0)
+        else:
+            self._plot.setYRange(lo, hi, padding=0)
+
+
+class PointRing:
+    """Кольцевой буфер точек графика с заранее созданными QPointF.
+
+    push() только переписывает координаты существующей точки, а points()
+    отдаёт список в хронологическом порядке для одного QLineSeries.replace().
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._points = [QPointF() for _ in range(self.capacity)]
+        self._head = 0   # куда писать следующую точку
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, x: float, y: float):
+        p = self._points[self._head]
+        p.setX(x)
+        p.setY(y)
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def points(self) -> list:
+        if self._size < self.capacity:
+            return self._points[:self._size]
+        return self._points[self._head:] + self._points[:self._head]
+
+    def clear(self):
+        self._head = self._size = 0
+
 class GraphsPage(QWidget):
     def __init__(self, config):
         super().__init__()
         self.config = config
         self._orig_pos = {}
         # --- Оптимизация: Карты для быстрого обновления --- (Добавлено)
-        # key=source_name (e.g. "accel_x"), value=list of (QLineSeries, index_or_None)
-        self._series_map: Dict[str, List[Tuple[QLineSeries, Optional[int]]]] = {}
+        # key=source_name (e.g. "accel_x"), value=list of (chart_name, PointRing or None, MinMaxDecimator, index_or_None)
+        self._series_map: Dict[str, List[Tuple[str, Optional["PointRing"], MinMaxDecimator, Optional[int]]]] = {}
+        # Графики, в которые пришли новые точки с прошлой перерисовки
+        self._dirty_charts = set()
         # key=chart_name, value=dict with chart info (view, series list, axes, etc.)
         self.charts: Dict[str, Dict] = {}
         # key=chart_name or series_key, value=current_x_index
@@ -1346,8 +1562,10 @@ class GraphsPage(QWidget):
         h = QHBoxLayout(self.sys_frame)
         self.cpu_label = QLabel("CPU: – %")
         self.ram_label = QLabel("RAM: – %")
-        self.lat_label = QLabel("UDP Latency: – s")
-        for lbl in (self.cpu_label, self.ram_label, self.lat_label):
+        self.lat_label = QLabel("Data age: – s")
+        self.ui_label = QLabel("UI: –")
+        self.link_label = QLabel("Link: –")
+        for lbl in (self.cpu_label, self.ram_label, self.lat_label, self.ui_label, self.link_label):
             lbl.setStyleSheet("font-size:10pt; font-weight:bold;")
             h.addWidget(lbl)
         layout.addWidget(self.sys_frame, 0, 0, 1, 2)
@@ -1360,6 +1578,8 @@ class GraphsPage(QWidget):
         # Оборачиваем сетку в прокручиваемую область
         scroll = QScrollArea(self)
         scroll.setWidgetResizable(True) # Revert to standard behavior
+        # Прокрутили к графикам, которые пропускали как невидимые — дорисовать их
+        scroll.verticalScrollBar().valueChanged.connect(lambda _: self._dirty_charts and self.render_charts())
         content = QWidget()
         layout = QGridLayout(content)
         self.setLayout(QVBoxLayout())
@@ -1379,7 +1599,7 @@ class GraphsPage(QWidget):
         self.charts = {}
         self.indexes = {}
         self.data_points = {}  # Store maximum points to display
-        self.data_history     = {}      # Имя -> список значений
+        self.data_history     = {}      # Имя -> SlidingExtrema (мин/макс окна истории)
         self.default_y_ranges = {}      # Имя -> исходный диапазон по Y
         self.last_extreme     = {}      # Имя -> время последнего выхода за пределы
         self.extreme_decay    = 5.0     # секунд до сброса к дефолтному диапазону
@@ -1428,13 +1648,19 @@ class GraphsPage(QWidget):
 
     def reset_charts(self):
             """Полностью очистить графики и вернуть их в дефолт."""
-            # 1) Очистить все серии
+            # 1) Очистить все серии и их буферы точек
             for cfg in self.charts.values():
                 if cfg["multi_axis"]:
                     for s in cfg["series"]:
                         s.clear()
                 else:
                     cfg["series"].clear()
+                for ring in cfg["rings"]:
+                    if ring is not None:
+                        ring.clear()
+                for dec in cfg["decimators"]:
+                    dec.clear()
+            self._dirty_charts.clear()
             # 2) Сбросить индексы X
             for k in self.indexes:
                 self.indexes[k] = 0
@@ -1449,18 +1675,37 @@ class GraphsPage(QWidget):
                 x_axis.setRange(0, 5)
                 cfg["view"].update()
 
+    @Slot(dict)
+    def update_link_stats(self, st):
+        """Качество канала из TelemetryWorker.link_stats (раз в секунду)."""
+        self.link_label.setText(
+            f"Link: loss {st['window_loss_pct']:.1f}% ({st['lost']}), "
+            f"dup {st['duplicates']}, reord {st['reordered']}, "
+            f"jitter {st['jitter_ms']:.0f} ms, {st['throughput_bps']} bit/s")
+
     def _update_system_monitor(self, psutil):
             # CPU и RAM
             cpu = psutil.cpu_percent()
             ram = psutil.virtual_memory().percent
             # пытаемся получить MainWindow через self.window()
             mw = self.window()
-            lat_text = "UDP Latency: N/A"
+            # Возраст последнего пакета и задержка до отрисовки (p95 по LatencyTracer)
+            lat_text = "Data age: N/A"
             if mw and hasattr(mw, "worker"):
                 last = getattr(mw.worker, "last_data_time", None)
                 if last:
-                    lat = time.time() - last
-                    lat_text = f"UDP Latency: {lat:.2f}s"
+                    lat_text = f"Data age: {time.time() - last:.2f}s"
+            if mw and hasattr(mw, "latency"):
+                total = mw.latency.report().get("total")
+                if total and total["n"]:
+                    lat_text += f", UART→chart p95 {total['p95'] * 1000:.0f} ms"
+
+            # счётчики склейки кадров интерфейса
+            if mw and hasattr(mw, "ui_scheduler"):
+                st = mw.ui_scheduler.stats()
+                self.ui_label.setText(
+                    f"UI: {st['rate']:.0f} pkt/s, tick {st['interval_ms']} ms, "
+                    f"coalesced {st['coalesced']}, dropped {st['dropped']}")
 
             # обновляем метки
             self.cpu_label.setText(f"CPU: {cpu:.0f}%")
@@ -1492,6 +1737,31 @@ class GraphsPage(QWidget):
 
         # Initialize index and series
         self.indexes[name] = 0
+        max_points = config.get("max_points", self.data_points.get(name, 200))
+        # Окно автомасштаба; можно задать хоть на весь полёт — мин/макс за O(1)
+        history_points = config.get("history_points", max_points * 3)
+        # Прореживание для режима «весь полёт»: "minmax" (инкрементально) или "lttb"
+        decimation = config.get("decimation", "minmax")
+        chart_info = {
+            "view": None,
+            "chart": None,
+            "backend": "qtcharts",
+            "multi_axis": multi_axis,
+            "y_range": y_range,
+            "max_points": max_points,
+            "history_points": history_points,
+            "decimation": decimation,
+            "overview": False,
+        }
+
+        backend = config.get("backend", "qtcharts")
+        if backend == "pyqtgraph":
+            if pg is not None:
+                chart_view = self._create_pg_plot(chart_info, config, title, y_range, color, axis_names)
+                self.charts[name] = chart_info
+                self._register_sources(name, config)
+                return self._wrap_chart_card(name, chart_view, y_range)
+            print(f"[GraphsPage] pyqtgraph is not installed, chart '{name}' falls back to QtCharts")
 
         # Create chart and setup
         chart = QChart()
@@ -1575,26 +1845,7 @@ class GraphsPage(QWidget):
                 series_list.append(series)
 
             # Register in charts and series dicts
-            self.charts[name] = {
-                "view": None,
-                "chart": chart,
-                "series": series_list,
-                "x_axis": ax_x,
-                "y_axis": ax_y,
-                "multi_axis": True,
-                "y_range": y_range
-            }
-            # --- Оптимизация: Заполняем _series_map --- (Добавлено)
-            sources = config.get("sources", [])
-            if len(sources) == len(series_list):
-                for i, raw_src in enumerate(sources):
-                    # Парсим source один раз при инициализации
-                    base_src, src_idx = self._parse_source(raw_src)
-                    if base_src:
-                        if base_src not in self._series_map:
-                            self._series_map[base_src] = []
-                        self._series_map[base_src].append((series_list[i], src_idx))
-            # --- Конец оптимизации ---
+            chart_info.update(chart=chart, series=series_list, x_axis=ax_x, y_axis=ax_y)
         else:
             # For single value data
             series = QLineSeries()
@@ -1610,24 +1861,7 @@ class GraphsPage(QWidget):
             series.attachAxis(ax_y)
 
             # Register in charts and series dicts
-            self.charts[name] = {
-                "view": None,
-                "chart": chart,
-                "series": series,
-                "x_axis": ax_x,
-                "y_axis": ax_y,
-                "multi_axis": False,
-                "y_range": y_range
-            }
-            # --- Оптимизация: Заполняем _series_map --- (Добавлено)
-            raw_src = config.get("source")
-            if raw_src:
-                base_src, src_idx = self._parse_source(raw_src)
-                if base_src:
-                    if base_src not in self._series_map:
-                        self._series_map[base_src] = []
-                    self._series_map[base_src].append((series, src_idx))
-            # --- Конец оптимизации ---
+            chart_info.update(chart=chart, series=series, x_axis=ax_x, y_axis=ax_y)
 
         # Create chart view with enhanced rendering
         chart_view = QChartView(chart)
@@ -1640,6 +1874,64 @@ class GraphsPage(QWidget):
         # Set a reasonable minimum size for charts
         chart_view.setMinimumSize(300, 250) 
 
+        self.charts[name] = chart_info
+        self._register_sources(name, config)
+        return self._wrap_chart_card(name, chart_view, y_range)
+
+    def _register_sources(self, name, config):
+        """Буферы точек для каждой серии графика и карта source -> буфер."""
+        chart_info = self.charts[name]
+        n_series = len(chart_info["series"]) if chart_info["multi_axis"] else 1
+        # QPointF-буферы нужны только QtCharts; pyqtgraph рисует прямо из истории decimators
+        if chart_info["backend"] == "pyqtgraph":
+            chart_info["rings"] = [None] * n_series
+        else:
+            chart_info["rings"] = [PointRing(chart_info["max_points"]) for _ in range(n_series)]
+        # Полная история полёта для режима «весь полёт»
+        chart_info["decimators"] = [MinMaxDecimator() for _ in range(n_series)]
+        # --- Оптимизация: Заполняем _series_map --- (Добавлено)
+        if chart_info["multi_axis"]:
+            sources = config.get("sources", [])
+            if len(sources) != n_series:
+                return
+        else:
+            sources = [config.get("source")] if config.get("source") else []
+        for i, raw_src in enumerate(sources):
+            # Парсим source один раз при инициализации
+            base_src, src_idx = self._parse_source(raw_src)
+            if base_src:
+                self._series_map.setdefault(base_src, []).append(
+                    (name, chart_info["rings"][i], chart_info["decimators"][i], src_idx))
+
+    def _create_pg_plot(self, chart_info, config, title, y_range, color, axis_names):
+        """График на pyqtgraph: PlotDataItem + NumPy-массивы через setData()."""
+        plot = pg.PlotWidget(title=title)
+        plot.setBackground(None)
+        plot.showGrid(x=True, y=True, alpha=0.3)
+        plot.setMenuEnabled(False)
+        plot.disableAutoRange()
+        plot.setYRange(y_range[0], y_range[1], padding=0)
+        plot.setXRange(0, 5, padding=0)
+        plot.setMinimumSize(300, 250)
+        for side in ("left", "bottom"):
+            plot.getAxis(side).setTextPen(COLORS["text_secondary"])
+        if chart_info["multi_axis"]:
+            plot.addLegend(offset=(10, 10))
+            colors = ["#4fc3f7", "#ff9e80", "#aed581"]  # Blue, Orange, Green for X, Y, Z
+            curves = [plot.plot(pen=pg.mkPen(colors[i], width=2.0), name=axis_names[i]) for i in range(3)]
+        else:
+            curves = plot.plot(pen=pg.mkPen(color, width=2.5))
+        for curve in (curves if chart_info["multi_axis"] else [curves]):
+            curve.setClipToView(True)
+        chart_info.update(
+            backend="pyqtgraph",
+            series=curves,
+            x_axis=_PgAxisRange(plot, 0),
+            y_axis=_PgAxisRange(plot, 1),
+        )
+        return plot
+
+    def _wrap_chart_card(self, name, chart_view, y_range):
         # wrap into card for rounded background
         wrapper = DraggableCard()
         wrapper.setObjectName("card")
@@ -1653,8 +1945,15 @@ class GraphsPage(QWidget):
         btn_detach.setFixedSize(24,24)
         btn_detach.setToolTip("Open chart in separate window")
         # передаём name, чтобы найти chart_data
-        btn_detach.clicked.connect(lambda _, n=config["name"]: self._open_detach(n))
+        btn_detach.clicked.connect(lambda _, n=name: self._open_detach(n))
         wrapper_layout.addWidget(btn_detach, alignment=Qt.AlignLeft)
+        # + кнопка «весь полёт» (прореженная история вместо последних max_points)
+        btn_overview = QPushButton("⤢")
+        btn_overview.setFixedSize(24,24)
+        btn_overview.setCheckable(True)
+        btn_overview.setToolTip("Show the whole flight")
+        btn_overview.clicked.connect(lambda _, n=name: self._toggle_overview(n))
+        wrapper_layout.addWidget(btn_overview, alignment=Qt.AlignLeft)
 
         # +++ кнопка Save PNG +++
         btn = QPushButton("💾 Save PNG")
@@ -1666,6 +1965,7 @@ class GraphsPage(QWidget):
         # Store the view reference
         self.charts[name]["view"]    = chart_view
         self.charts[name]["wrapper"] = wrapper
+        self.charts[name]["overview_btn"] = btn_overview
 
         # ➕ Запомним исходный диапазон Y сразу при создании
         self.default_y_ranges[name] = tuple(y_range)
@@ -1687,50 +1987,34 @@ class GraphsPage(QWidget):
         else:
             return None, None # Пустой источник
 
-    def auto_scale_y_axis(self, name, data_values):
-        """Automatically scale the Y axis based on current data values with improved logic"""
+    def _history(self, name) -> SlidingExtrema:
+        hist = self.data_history.get(name)
+        if hist is None:
+            window = self.charts[name].get("history_points", 600) if name in self.charts else 600
+            hist = self.data_history[name] = SlidingExtrema(window)
+        return hist
+
+    def auto_scale_y_axis(self, name, data_values=None):
+        """Automatically scale the Y axis from the sliding min/max of the chart history"""
         chart_data = self.charts.get(name)
         if not chart_data:
             return
 
         y_axis = chart_data["y_axis"]
-        # + Получаем историю значений
-        history = self.data_history.setdefault(name, [])
-
-        # + Если новых значений нет или они пустые - не меняем масштаб
-        if not data_values:
-            return
+        history = self._history(name)
+        if data_values:
+            history.extend(data_values)
 
-        # + Работаем с историей + текущими значениями для стабильного масштабирования
-        all_values = history + data_values
-
-        # + Если данных все еще мало - используем исходный диапазон
-        # Всегда вычисляем мин/макс из всех собранных значений
-        valid_values = []
-        for v in all_values:
-            if v is not None and not math.isnan(v):
-                valid_values.append(v)
-        if not valid_values:
+        # + Если значений ещё нет - не меняем масштаб
+        v_min = history.min()
+        if v_min is None:
             return
-        current_min = min(valid_values)
-        current_max = max(valid_values)
+        v_max = history.max()
 
         # вычисляем середину и размах
-        v_min = min(valid_values)
-        v_max = max(valid_values)
         mid  = (v_min + v_max) / 2.0
         # добавляем 20% запаса, и не даём span упасть ниже 0.1
         span = max((v_max - v_min) * 1.2, 0.1)
-
-        # + Не допускаем, чтобы мин и макс были слишком близко друг к другу
-        if abs(current_max - current_min) < 0.1:
-            current_min -= 0.5
-            current_max += 0.5
-
-        # + Добавляем отступ для лучшей визуализации (20%)
-        padding = (current_max - current_min) * 0.2
-        new_min = current_min - padding
-        new_max = current_max + padding
         new_min = mid - span/2
         new_max = mid + span/2
 
@@ -1741,7 +2025,7 @@ class GraphsPage(QWidget):
             # ➕ сразу расширяем до экстремума и запоминаем момент
             self.last_extreme[name] = now
             y_axis.setRange(new_min, new_max)
-            if chart_data.get("multi_axis"):
+            if chart_data.get("multi_axis") and chart_data["chart"] is not None:
                 for series in chart_data["series"][1:]:
                     for axis in chart_data["chart"].axes(Qt.Vertical, series):
                         axis.setRange(new_min, new_max)
@@ -1761,8 +2045,8 @@ class GraphsPage(QWidget):
             abs(final_max - current_axis_max) > threshold):
             y_axis.setRange(final_min, final_max)
 
-            # + Также обновляем дополнительные оси в мульти-графиках
-            if chart_data.get("multi_axis"):
+            # + Также обновляем дополнительные оси в мульти-графиках (только QtCharts)
+            if chart_data.get("multi_axis") and chart_data["chart"] is not None:
                 chart = chart_data["chart"]
                 for i, series in enumerate(chart_data["series"]):
                     if i > 0:  # Пропускаем первую серию, т.к. она использует основную ось
@@ -1899,62 +2183,58 @@ class GraphsPage(QWidget):
         with open("config.ini", "w") as f:
             cfg.write(f)
 
-    @Slot(dict)
-    def update_charts(self, data):
-
-        charts_to_update = set() # Собираем имена графиков, которые нужно обновить
-
-        # --- Оптимизация: Используем _series_map для быстрого обновления --- (Изменено)
+    def push_data(self, data):
+        """Разложить значения пакета по буферам графиков (без перерисовки)."""
+        touched = set()
         for key, value in data.items():
-            if key in self._series_map:
-                series_targets = self._series_map[key]
-                for series, index in series_targets:
-                    actual_value = None
-                    if index is not None: # Источник вида key[index]
-                        if isinstance(value, (list, tuple)) and len(value) > index:
-                            actual_value = value[index]
-                    else: # Прямой источник (key)
-                        actual_value = value
-
-                    if actual_value is not None:
-                        # Находим график, которому принадлежит серия (немного неэффективно, но лучше чем было)
-                        chart_name = None
-                        chart_info = None
-                        for name, info in self.charts.items():
-                            if info.get("multi_axis"):
-                                if series in info.get("series", []):
-                                    chart_name = name
-                                    chart_info = info
-                                    break
-                            elif info.get("series") == series:
-                                chart_name = name
-                                chart_info = info
-                                break
-
-                        if chart_name and chart_info:
-                            charts_to_update.add(chart_name)
-                            max_points = self.data_points.get(chart_name, 200) # TODO: Предзагрузить max_points в chart_info
-
-                            # Обновляем историю для автомасштаба (Исправлены отступы)
-                            hist = self.data_history.setdefault(chart_name, [])
-                            hist.append(actual_value)
-                            max_hist = max_points * 3
-                            if len(hist) > max_hist:
-                                hist[:] = hist[-max_hist:]
-
-                            # --- Добавляем точку с правильным X и обновляем индекс --- (Исправлены отступы)
-                            current_x_index = self.indexes.get(chart_name, 0)
-                            series.append(current_x_index, actual_value) # Используем индекс как X
-                            self.indexes[chart_name] = current_x_index + 1 # Инкрементируем индекс
-
-                            # --- Удаляем старые точки ПОСЛЕ добавления --- (Исправлены отступы)
-                            while series.count() > max_points:
-                                series.removePoints(0, 1) # Удаляем по одной самой старой точке
-
-        # --- Обновляем оси и перерисовываем только затронутые графики --- (Исправлены отступы)
-        for chart_name in charts_to_update:
+            targets = self._series_map.get(key)
+            if not targets:
+                continue
+            for chart_name, ring, decimator, index in targets:
+                if index is not None:  # Источник вида key[index]
+                    if not isinstance(value, (list, tuple)) or len(value) <= index:
+                        continue
+                    value_i = value[index]
+                else:
+                    value_i = value
+                if value_i is None:
+                    continue
+                # Все серии одного графика получают один X на пакет
+                x = self.indexes[chart_name]
+                if ring is not None:
+                    ring.push(x, value_i)
+                decimator.push(x, value_i)
+                # Автомасштаб учитывает все серии графика
+                self._history(chart_name).push(value_i)
+                touched.add(chart_name)
+        for chart_name in touched:
+            self.indexes[chart_name] += 1
+        self._dirty_charts |= touched
+
+    def _chart_visible(self, chart_info) -> bool:
+        view = chart_info.get("view")
+        try:
+            return (view is not None and view.isVisible()
+                    and not view.window().isMinimized()
+                    and not view.visibleRegion().isEmpty())
+        except RuntimeError:
+            return False # View might be closed
+
+    def push_batch(self, packets):
+        """Все пакеты кадра в буферы графиков за один вызов."""
+        for data in packets:
+            self.push_data(data)
+
+    def render_charts(self):
+        """Один QLineSeries.replace() на серию для графиков с новыми точками."""
+        dirty, self._dirty_charts = self._dirty_charts, set()
+        for chart_name in dirty:
             chart_info = self.charts.get(chart_name)
             if not chart_info: continue
+            # Невидимый график (другая вкладка, прокручен, окно свёрнуто) ждёт showEvent
+            if not self._chart_visible(chart_info):
+                self._dirty_charts.add(chart_name)
+                continue
 
             chart_view = chart_info["view"]
             try:
@@ -1962,25 +2242,26 @@ class GraphsPage(QWidget):
             except RuntimeError:
                 continue # View might be closed
 
-            # Автомасштаб (используем данные из истории)
-            hist = self.data_history.get(chart_name, [])
-            # Масштабируем не на каждую точку, а, например, раз в 5 обновлений
-            if len(hist) % 5 == 0:
-                self.auto_scale_y_axis(chart_name, [hist[-1]])
-            #if hist: # Передаем только последние добавленные значения (или всю историю?)
-                #self.auto_scale_y_axis(chart_name, [hist[-1]] if hist else []) # Масштабируем по последнему значению?
-                # Или self.auto_scale_y_axis(chart_name, hist) # Масштабируем по всей истории?
-
-            # Обновление оси X (можно оптимизировать, делать 1 раз)
-            x_axis = chart_info["x_axis"]
-            series_to_count = chart_info["series"]
-            # Берем первую серию для подсчета точек (предполагаем, что у всех серий графика одинаковое кол-во)
-            count_series = series_to_count[0] if chart_info.get("multi_axis") else series_to_count
-            current_total_count = count_series.count()
-            max_points_x = self.data_points.get(chart_name, 200)
-            # --- Используем текущий максимальный индекс X для расчета диапазона --- (Изменено)
-            current_max_x = self.indexes.get(chart_name, 0) # Получаем текущий МАКСИМАЛЬНЫЙ X
-            x_axis.setRange(max(0, current_max_x - max_points_x), current_max_x + 5)
+            series_list = chart_info["series"] if chart_info.get("multi_axis") else [chart_info["series"]]
+            if chart_info["overview"]:
+                self._render_overview(chart_info, series_list)
+            elif chart_info["backend"] == "pyqtgraph":
+                # Окно последних max_points прямо из полной истории, без QPointF
+                n = chart_info["max_points"]
+                for curve, dec in zip(series_list, chart_info["decimators"]):
+                    curve.setData(np.array(dec.xs[-n:]), np.array(dec.ys[-n:]))
+            else:
+                for series, ring in zip(series_list, chart_info["rings"]):
+                    series.replace(ring.points())
+
+            # Автомасштаб раз за перерисовку по мин/макс окна истории
+            self.auto_scale_y_axis(chart_name)
+
+            current_max_x = self.indexes.get(chart_name, 0) # Текущий МАКСИМАЛЬНЫЙ X
+            if chart_info["overview"]:
+                chart_info["x_axis"].setRange(0, max(current_max_x, 1))
+            else:
+                chart_info["x_axis"].setRange(max(0, current_max_x - chart_info["max_points"]), current_max_x + 5)
 
             try:
                 chart_view.setUpdatesEnabled(True)
@@ -1988,43 +2269,193 @@ class GraphsPage(QWidget):
                 pass # View might be closed
             chart_view.update()
 
+    def _render_overview(self, chart_info, series_list):
+        """Весь полёт: не больше ~2 точек на пиксель ширины области графика."""
+        if chart_info["chart"] is not None:
+            width = int(chart_info["chart"].plotArea().width()) or chart_info["view"].width()
+        else:
+            width = chart_info["view"].width()
+        buckets = max(50, width)
+        for series, dec in zip(series_list, chart_info["decimators"]):
+            if chart_info["decimation"] == "lttb":
+                idx = lttb(dec.xs, dec.ys, 2 * buckets)
+            else:
+                idx = dec.indices(buckets)
+            xs, ys = dec.xs, dec.ys
+            if chart_info["backend"] == "pyqtgraph":
+                idx = np.array(idx, dtype=np.intp)
+                series.setData(np.frombuffer(xs, dtype=float)[idx].copy(),
+                               np.frombuffer(ys, dtype=float)[idx].copy())
+            else:
+                series.replace([QPointF(xs[i], ys[i]) for i in idx])
+
+    def _toggle_overview(self, name: str):
+        """Переключить график между окном последних точек и всем полётом."""
+        chart_info = self.charts.get(name)
+        if not chart_info:
+            return
+        chart_info["overview"] = not chart_info["overview"]
+        btn = chart_info.get("overview_btn")
+        if btn:
+            btn.setChecked(chart_info["overview"])
+        self._dirty_charts.add(name)
+        self.render_charts()
+
+    @Slot(dict)
+    def update_charts(self, data):
+        self.push_data(data)
+        self.render_charts()
+
     def showEvent(self, event):
         super().showEvent(event)
-        # Refresh all chart views when the page is shown
+        # Точки копились в буферах, пока вкладка была скрыта — рисуем их одним проходом.
         # Use QTimer.singleShot to ensure updates happen after the event loop is processed
-        def refresh_charts():
-            for info in self.charts.values():
-                try:
-                    if info.get("view"): info["view"].update()
-                except Exception as e:
-                    print(f"[GraphsPage] Error refreshing chart in showEvent: {e}")
-        QTimer.singleShot(0, refresh_charts)
+        QTimer.singleShot(0, self.render_charts)
 
 # === СТРАНИЦА ЛОГОВ + ЭКСПОРТ В ZIP ===
+class LogModel(QAbstractListModel):
+    """Строки журнала из LogIndex (кольцевой буфер); при поиске — только совпадения."""
+    LevelRole = Qt.UserRole + 1
+
+    def __init__(self, max_entries: int = 20000, parent=None):
+        super().__init__(parent)
+        self.index_ = LogIndex(max_entries)
+        self._rows = None        # None — все строки, иначе список seq совпадений
+        self._query = ""
+        self._levels = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.index_) if self._rows is None else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if self._rows is None:
+            if row >= len(self.index_):
+                return None
+            seq = self.index_.base + row
+        else:
+            if row >= len(self._rows):
+                return None
+            seq = self._rows[row]
+        raw, level = self.index_.get(seq)
+        if role == Qt.DisplayRole:
+            return raw
+        if role == self.LevelRole:
+            return level
+        return None
+
+    def append(self, raw: str, level: str):
+        ix = self.index_
+        if ix.full():
+            # Буфер полон — самая старая строка уходит
+            oldest = ix.base
+            if self._rows is None:
+                self.beginRemoveRows(QModelIndex(), 0, 0)
+                ix.evict_oldest()
+                self.endRemoveRows()
+            elif self._rows and self._rows[0] == oldest:
+                self.beginRemoveRows(QModelIndex(), 0, 0)
+                ix.evict_oldest()
+                self._rows.pop(0)
+                self.endRemoveRows()
+            else:
+                ix.evict_oldest()
+        seq = ix.end
+        if self._rows is None:
+            row = len(ix)
+            self.beginInsertRows(QModelIndex(), row, row)
+            ix.append(raw, level)
+            self.endInsertRows()
+        else:
+            ix.append(raw, level)
+            if ix.matches(seq, self._query, self._levels):
+                row = len(self._rows)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.append(seq)
+                self.endInsertRows()
+
+    def set_filter(self, query: str, levels=None):
+        """Показать только строки с query и уровнем из levels (через индекс)."""
+        self.beginResetModel()
+        self._query = query.lower()
+        self._levels = frozenset(levels) if levels else None
+        if not query and not levels:
+            self._rows = None
+        else:
+            self._rows = self.index_.search(query, levels)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.index_.clear()
+        if self._rows is not None:
+            self._rows = []
+        self.endResetModel()
+
+    def lines(self) -> list:
+        return self.index_.lines()
+
+
+class LogLevelDelegate(QStyledItemDelegate):
+    """Цвет строки журнала по уровню."""
+    COLORS = {
+        "info":    COLORS["text_secondary"],
+        "warning": COLORS["warning"],
+        "danger":  COLORS["danger"],
+    }
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        color = self.COLORS.get(index.data(LogModel.LevelRole), COLORS["text_secondary"])
+        option.palette.setColor(QPalette.Text, QColor(color))
+
+
 class LogPage(QWidget):
-    def __init__(self):
+    def __init__(self, max_entries: int = 20000):
         super().__init__()
-        self.error_list: list[str] = []
+        # Журнал ограничен max_entries строками (logging.max_entries в конфиге)
+        self.error_list = deque(maxlen=max_entries)
         layout = QVBoxLayout(self); layout.setContentsMargins(15,15,15,15)
-        self.log_entries: list[tuple[str,str]] = []  # хранить пары (raw, html)
-        # --- Search filter ---
+        self.log_model = LogModel(max_entries, self)
+        # --- Search filter: поиск по индексу после паузы в наборе ---
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Search logs...")
+        self.level_combo = QComboBox()
+        for title, levels in (("Все", None), ("WARN + ERROR", ("warning", "danger")), ("ERROR", ("danger",))):
+            self.level_combo.addItem(title, levels)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_filter)
         self.search_edit.textChanged.connect(self.filter_logs)
-        layout.addWidget(self.search_edit)
+        self.level_combo.currentIndexChanged.connect(lambda _: self._apply_filter())
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.search_edit, 1)
+        search_row.addWidget(self.level_combo)
+        layout.addLayout(search_row)
         header = QLabel("Системный журнал")
         header.setStyleSheet(f"""
             font-size: 16pt; font-weight: bold; color: {COLORS['text_primary']}; margin-bottom:10px
         """)
-        self.log_text = QTextEdit();
-        self.log_text.setReadOnly(True)
-        # включить контекстное меню с Copy
-        self.log_text.setContextMenuPolicy(Qt.ContextMenuPolicy.DefaultContextMenu)
+        # Список рисует только видимые строки; цвет уровня — из делегата
+        self.log_text = QListView()
+        self.log_text.setModel(self.log_model)
+        self.log_text.setItemDelegate(LogLevelDelegate(self.log_text))
+        self.log_text.setUniformItemSizes(True)
+        self.log_text.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.log_text.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.log_text.setFont(QFont("Consolas",10))
         self.log_text.setStyleSheet(f"""
-            QTextEdit {{ background: {COLORS['bg_dark']}; color: {COLORS['text_primary']};
+            QListView {{ background: {COLORS['bg_dark']}; color: {COLORS['text_primary']};
             border-radius:6px; padding:10px; border:none }}
         """)
+        # Ctrl+C — копировать выделенные строки
+        sc_copy = QShortcut(QKeySequence.Copy, self.log_text)
+        sc_copy.activated.connect(self._copy_selected)
         buttons_layout = QHBoxLayout()
         self.clear_btn = QPushButton("Очистить лог")
         self.save_btn = QPushButton("Сохранить лог")
@@ -2075,58 +2506,56 @@ class LogPage(QWidget):
 
     @Slot(str)
     def add_log_message(self, message):
-    # Определяем цвет по уровню
-        level = "info"
-        if message.startswith("[ERROR]"):
-            level = "danger"
-        elif message.startswith("[WARNING]"):
-            level = "warning"
-        color = {
-            "info":    COLORS["text_secondary"],
-            "warning": COLORS["warning"],
-            "danger":  COLORS["danger"],
-        }[level]
-        # Формируем сырое и HTML-представление
-        raw  = f"{datetime.datetime.now().strftime('%H:%M:%S')} {message}"
-        html = f'<span style="color:{color};">{raw}</span>'
-        # Сохраняем пару и добавляем в QTextEdit
-        # Сохраняем ошибочные уровни в error_list
-        if level in ("warning", "danger"):
-            self.error_list.append(raw)
-        #self.log_entries.append((raw, html))
-        # Сохраняем ошибочные уровни в error_list
-        if level in ("warning", "danger"):
-            self.error_list.append(raw)
-        self.log_entries.append((raw, html))
-        self.log_text.append(html)
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        self.add_log_messages([message])
+
+    @Slot(list)
+    def add_log_messages(self, messages):
+        """Пачка строк (из TelemetryWorker.logs_ready) — одна прокрутка на пачку."""
+        # Автопрокрутка, только если пользователь и так внизу
+        bar = self.log_text.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum()
+        stamp = datetime.datetime.now().strftime('%H:%M:%S')
+        for message in messages:
+            # Определяем уровень (цвет строки задаёт LogLevelDelegate)
+            level = "info"
+            if message.startswith("[ERROR]"):
+                level = "danger"
+            elif message.startswith("[WARNING]"):
+                level = "warning"
+            raw = f"{stamp} {message}"
+            # Сохраняем ошибочные уровни в error_list
+            if level in ("warning", "danger"):
+                self.error_list.append(raw)
+            self.log_model.append(raw, level)
+        if at_bottom:
+            self.log_text.scrollToBottom()
+
+    def _copy_selected(self):
+        rows = sorted(self.log_text.selectionModel().selectedIndexes(), key=lambda i: i.row())
+        QApplication.clipboard().setText("\n".join(i.data() for i in rows))
 
     def clear_log(self):
-        self.log_text.clear()
-        self.log_entries.clear()
+        self.log_model.clear()
         from PySide6.QtWidgets import QApplication
         mw = QApplication.activeWindow()
         if hasattr(mw, "notify"):
             mw.notify("Logs cleared", "info")
 
     def filter_logs(self, text):
-        """Фильтрация по сырым строкам, вывод с сохранением цвета."""
-        self.log_text.clear()
-        for raw, html in self.log_entries:
-            if text.lower() in raw.lower():
-                self.log_text.append(html)
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        """Перезапустить отложенный поиск: индекс опрашивается раз на паузу в наборе."""
+        self._search_timer.start()
+
+    def _apply_filter(self):
+        self._search_timer.stop()
+        self.log_model.set_filter(self.search_edit.text(), self.level_combo.currentData())
+        self.log_text.scrollToBottom()
 
     def save_log(self):
         now = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         path = f"log/system_log_{now}.txt"
         try:
             with open(path, "w", encoding="utf-8") as f:
-                f.write(self.log_text.toPlainText())
+                f.write("\n".join(self.log_model.lines()))
             msg = f"[{datetime.datetime.now()}] Лог сохранен в {path}"
             self.add_log_message(msg)
             from PySide6.QtWidgets import QApplication
@@ -2166,7 +2595,7 @@ class LogPage(QWidget):
         mw = self.window()
 
         # Логи и ошибки
-        logs = self.log_text.toPlainText()
+        logs = "\n".join(self.log_model.lines())
         errors = "\n".join(self.error_list)
 
         # Картинки графиков
@@ -2186,7 +2615,10 @@ class LogPage(QWidget):
         html += ".card{background:#242424;padding:10px;margin:10px;border-radius:8px;}"
         html += "h1,h2{color:" + COLORS["accent"] + ";}</style></head><body>"
         html += "<h1>Telemetry Report</h1><h2>Logs</h2><pre>{}</pre>".format(logs)
-        html += "<h2>Errors</h2><pre>{}</pre><h2>Charts</h2>".format(errors)
+        html += "<h2>Errors</h2><pre>{}</pre>".format(errors)
+        if hasattr(mw, "latency"):
+            html += "<h2>Latency</h2><div class='card'>{}</div>".format(mw.latency.html())
+        html += "<h2>Charts</h2>"
         for name, b64 in imgs.items():
             html += f"<div class='card'><h3>{name}</h3>"
             html += f"<img src='data:image/png;base64,{b64}'/></div>"
@@ -2220,12 +2652,13 @@ class LogPage(QWidget):
 
     def get_errors(self) -> list[str]:
         """Вернуть все WARN/ERROR сообщения."""
-        return self.error_list
+        return list(self.error_list)
 
 # === СТРАНИЦА НАСТРОЕК + .ini ===
 class SettingsPage(QWidget):
     settings_changed      = Signal(bool, str, int)
     simulator_changed     = Signal(bool, str)
+    sim_speed_changed     = Signal(float)
 
     def __init__(self):
         super().__init__()
@@ -2307,6 +2740,19 @@ class SettingsPage(QWidget):
         hl.addWidget(self.sim_file_path)
         hl.addWidget(btn_browse)
         v2.addLayout(hl)
+        # Скорость воспроизведения по бортовому времени (применяется сразу)
+        self.sim_speed = QComboBox()
+        for title, speed in (("0.5×", 0.5), ("1×", 1.0), ("2×", 2.0), ("5×", 5.0), ("10×", 10.0),
+                             ("25×", 25.0), ("100×", 100.0), ("Максимум", replay.AFAP)):
+            self.sim_speed.addItem(title, speed)
+        idx = self.sim_speed.findText(self.cfg.get("Settings", "sim_speed", fallback="1×"))
+        self.sim_speed.setCurrentIndex(idx if idx >= 0 else 1)
+        self.sim_speed.currentIndexChanged.connect(
+            lambda _: self.sim_speed_changed.emit(self.sim_speed.currentData()))
+        hs = QHBoxLayout()
+        hs.addWidget(QLabel("Скорость"))
+        hs.addWidget(self.sim_speed)
+        v2.addLayout(hs)
         layout.addWidget(sim_card)
         # Эмитим только по нажатию Save
         # Disable simulation block when UDP is on
@@ -2383,6 +2829,7 @@ class SettingsPage(QWidget):
         if "Settings" not in self.cfg:
             self.cfg["Settings"] = {}
         self.cfg["Settings"]["simulation"]    = str(self.sim_enable.isChecked())
+        self.cfg["Settings"]["sim_speed"]     = self.sim_speed.currentText()
 
         # store auto-save into cfg
         self.cfg["Settings"]["auto_save"] = str(self.auto_save_chk.isChecked())
@@ -2489,7 +2936,9 @@ class ConsolePage(QWidget):
         self.cmds = [
             "pause","resume","help","version","errors","exit","quit","ping","fps","events",
             "clear logs","clear errors","export report","export logs","export zip",
-            "load bin","udp enable","udp disable","sensor info","log","simulate error"
+            "load bin","udp enable","udp disable","sensor info","log","simulate error",
+            "replay speed","replay seek","replay packet","latency","latency reset",
+            "db sessions","db load"
         ]
         # + затем создаём QCompleter на основе self.cmds
         self.completer = QCompleter(self.cmds, self.input)
@@ -2660,13 +3109,22 @@ class MapPage(QWidget):
         self.map_root = self.map_widget.rootObject()
 
     def set_worker(self, worker):
-        """Подписываем GPS-данные на обновление карты."""
+        """Запоминаем worker; координаты приходят из MainWindow раз в кадр."""
         self.worker = worker
-        worker.data_ready.connect(self.on_map_data)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if getattr(self, "_pending_data", None):
+            self.on_map_data(self._pending_data)
 
     @Slot(dict)
     def on_map_data(self, data):
         """Обновляем центр карты при приходе новых координат."""
+        # На скрытой вкладке только запоминаем пакет, центр карты — в showEvent
+        if not self.isVisible():
+            self._pending_data = data
+            return
+        self._pending_data = None
         # --- Удаляем отладочный вывод --- (Удалено)
         # print(f"[DBG MapPage] on_map_data received: {data}") # DEBUG 1
         lat, lon, _ = data.get("gps", (0,0,0))
@@ -2695,8 +3153,10 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.config = config or {}
         
-        # Буфер пакетов
-        self.buffered_packets = []
+        # Буфер пакетов: склейка в кадры интерфейса со счётчиками (telemetry/scheduler.py)
+        self.ui_scheduler = FrameCoalescer()
+        # Задержки по участкам: UART -> ... -> отрисовка (консоль: latency)
+        self.latency = LatencyTracer()
         self.last_data = None
         
         self.setWindowTitle("Telemetry Dashboard")
@@ -2738,7 +3198,7 @@ class MainWindow(QMainWindow):
         # Pages
         self.tel     = TelemetryPage(self.config)
         self.graphs   = GraphsPage(self.config)  # Передаем конфигурацию в GraphsPage
-        self.log_page = LogPage()
+        self.log_page = LogPage(self.config.get("logging", {}).get("max_entries", 20000))
         self.settings = SettingsPage()
         self.console  = ConsolePage()
         self.map_page = MapPage()
@@ -2847,10 +3307,10 @@ class MainWindow(QMainWindow):
         # Telemetry worker — передаём сначала config, потом порт и baudrate
         self.worker = TelemetryWorker(self.config, "COM3", 9600)
 
-        # Буфер пакетов и таймер для отложенного UI-обновления
+        # Таймер кадров интерфейса; интервал подстраивается в flush_buffered_packets
         self.ui_timer = QTimer(self)
         self.ui_timer.timeout.connect(self.flush_buffered_packets)
-        self.ui_timer.start(100)  # обновлять UI не чаще чем раз в 50 ms
+        self.ui_timer.start(int(self.ui_scheduler.max_interval * 1000))
 
         # ➕ При окончании симуляции — чекаем графики и буфер
         self.worker.sim_ended.connect(self.graphs.reset_charts)
@@ -2858,23 +3318,31 @@ class MainWindow(QMainWindow):
             self.tel.pause_btn.setText("⏸ Пауза"),
             self.tel.pause_btn.setEnabled(False)
         ))
-        self.worker.sim_ended.connect(lambda: self.buffered_packets.clear())
+        self.worker.sim_ended.connect(self.ui_scheduler.clear)
         self.worker.sim_ended.connect(self._on_simulation_ended) # Connect sim end to hide progress
         # --- Добавляем уведомление о завершении симуляции --- (Добавлено)
         self.worker.sim_ended.connect(lambda: self.notify("Файл симуляции прочитан", "info"))
 
         self.tel.set_worker(self.worker)
-        self.worker.data_ready.connect(self._on_data_ready)  # Используем _on_data_ready для буферизации
+        # Пакеты идут через общее кольцо ui_scheduler: один сигнал на пачку, а не на пакет
+        self.worker.ring = self.ui_scheduler
+        self.worker.batch_ready.connect(self._on_batch_ready)
+        self.worker.data_ready.connect(self._on_data_ready)
         self.worker.log_ready.connect(self.log_page.add_log_message)
+        self.worker.logs_ready.connect(self.log_page.add_log_messages)
         self.map_page.set_worker(self.worker)
         self.worker.error_crc.connect(QApplication.beep)
         # Connect progress signal
         self.worker.simulation_progress.connect(self._on_simulation_progress)
+        self.worker.replay_indexing.connect(self._on_replay_indexing)
+        self.worker.link_stats.connect(self.graphs.update_link_stats)
         # --- Подключаем сигнал уведомлений к слоту notify --- (Добавлено)
         self.worker.notification_requested.connect(self.notify)
 
         # --- Подключаем сигналы изменения настроек к новому слоту --- 
         self.settings.settings_changed.connect(self._on_settings_or_mode_changed)
+        self.worker.set_replay_speed(self.settings.sim_speed.currentData())
+        self.settings.sim_speed_changed.connect(self.worker.set_replay_speed)
         # self.settings.simulator_changed.connect(self._on_settings_or_mode_changed) # Убираем дублирующий вызов
 
         # --- Подключаем sim_ended к сбросу телеметрии --- 
@@ -2922,9 +3390,6 @@ class MainWindow(QMainWindow):
         sc_profile = QShortcut(QKeySequence("Ctrl+I"), self)
         sc_profile.activated.connect(self.print_profile)
 
-        # теперь действительно обновляем маленькие графики в TelemetryPage
-        self.worker.data_ready.connect(self.tel.update_values)
-
     def print_profile(self):
         import tracemalloc
         tracemalloc.start()
@@ -2967,7 +3432,7 @@ class MainWindow(QMainWindow):
         # 1) снимем паузу
         self.worker.resume()
         # 2) сбросим UI-буфер
-        self.buffered_packets.clear()
+        self.ui_scheduler.clear()
         # 3) очистим графики
         #self.graphs.reset_charts()
         # 4) деактивируем кнопку Pause до начала прихода данных
@@ -2988,29 +3453,43 @@ class MainWindow(QMainWindow):
         super().closeEvent(event)
 
     def flush_buffered_packets(self):
-        # Создадим локальную копию буфера и очистим оригинал,
-        # чтобы избежать повторной обработки одних и тех же данных
-        packets = list(self.buffered_packets)
-        self.buffered_packets.clear()
-        
-        # Если страница графиков активна - обновим графики
-        if hasattr(self, 'graphs') and self.graphs is not None:
-            for p in packets:
+        """Кадр интерфейса: графикам — вся пачка, карточкам и карте — последний пакет."""
+        packets = self.ui_scheduler.take()
+        if packets:
+            t_flush = time.time()
+            # Графики: все точки пачки одним вызовом, перерисовка одна на кадр
+            if hasattr(self, 'graphs') and self.graphs is not None:
                 try:
-                    self.graphs.update_charts(p)
+                    self.graphs.push_batch(packets)
+                    self.graphs.render_charts()
                 except Exception as e:
-                    print(f"[UI] flush_buffered_packets error: {e}")
-        
-        # Если страница телеметрии активна - обновим её ТОЛЬКО последним пакетом
-        if packets and hasattr(self, 'tel') and self.tel is not None:
-            try:
-                self.tel.update_values(packets[-1]) # Use only the last packet
-            except Exception as e:
-                print(f"[UI] flush_buffered_packets error (telemetry): {e}")
-        
-        # Также обновляем последние данные
-        if packets:
-            self.last_data = packets[-1]
+                    print(f"[UI] flush_buffered_packets error (graphs): {e}")
+
+            latest = packets[-1]
+            if hasattr(self, 'tel') and self.tel is not None:
+                try:
+                    self.tel.update_values(latest)
+                except Exception as e:
+                    print(f"[UI] flush_buffered_packets error (telemetry): {e}")
+            if hasattr(self, 'map_page') and self.map_page is not None:
+                try:
+                    self.map_page.on_map_data(latest)
+                except Exception as e:
+                    print(f"[UI] flush_buffered_packets error (map): {e}")
+            self.last_data = latest
+            # Путь каждого пакета кадра: ... -> flush -> render
+            t_render = time.time()
+            for data in packets:
+                trace = data.get("_trace")
+                if trace:
+                    self.latency.record_stamps(trace + [("flush", t_flush), ("render", t_render)])
+
+        # Следующий кадр — по темпу пакетов; если данные никто не видит — реже
+        visible = (not self.isMinimized()
+                   and self.stack.currentWidget() in (self.tel, self.graphs, self.map_page))
+        interval = int(self.ui_scheduler.next_interval(visible) * 1000)
+        if interval != self.ui_timer.interval():
+            self.ui_timer.setInterval(interval)
 
     @Slot(bool, str)
     def on_simulator_changed(self, enabled: bool, filepath: str):
@@ -3023,6 +3502,14 @@ class MainWindow(QMainWindow):
             QTimer.singleShot(0, self._start_simulation)
             # Сброс UI произойдет через _on_settings_or_mode_changed
 
+    @Slot(int, int)
+    def _on_replay_indexing(self, done: int, total: int):
+        """Прогресс индексации файла имитации (до начала воспроизведения)."""
+        self.progress_bar.setFormat("Индексация %p%")
+        self._on_simulation_progress(done, total)
+        if done >= total:
+            self.progress_bar.setFormat("%p%")
+
     @Slot(int, int)
     def _on_simulation_progress(self, pos: int, total: int):
         """Обновляем прогресс-бар в процентах."""
@@ -3062,6 +3549,9 @@ class MainWindow(QMainWindow):
                 "resume":         "продолжить прием",
                 "version":        "версия программы",
                 "errors":         "показать WARN/ERROR",
+                "ui":             "счётчики кадров интерфейса",
+                "latency":        "задержки по участкам p50/p95/p99, мс",
+                "latency reset":  "сбросить гистограммы задержек",
                 "help":           "список команд",
                 "clear logs":     "очистить лог",
                 "clear errors":   "очистить список ошибок",
@@ -3070,6 +3560,11 @@ class MainWindow(QMainWindow):
                 "export logs":    "сохранить лог в файл",
                 "export zip":     "экспорт логов в ZIP",
                 "load bin <файл>":"загрузить бинарник для симуляции",
+                "db sessions":    "сессии в базе SQLite (data_storage)",
+                "db load <id> [t0 t1]": "показать на графиках сессию из базы (t в с)",
+                "replay speed <x|max>": "скорость имитации (0.5–100×)",
+                "replay seek <n|сек s>": "перемотка имитации к кадру или времени",
+                "replay packet <num>": "перемотка имитации к номеру пакета",
                 "udp enable":     "включить UDP режим",
                 "udp disable":    "выключить UDP режим",
                 "ping":           "показать задержку UDP",
@@ -3117,6 +3612,29 @@ class MainWindow(QMainWindow):
             self.log_page.export_logs()
             self.console.write_response("ZIP export triggered")
             return
+        if cmd.startswith("replay "):
+            # replay speed 10 | replay speed max | replay seek 120 | replay seek 35.5s | replay packet 812
+            parts = cmd.split()
+            try:
+                if len(parts) == 3 and parts[1] == "speed":
+                    speed = replay.AFAP if parts[2] == "max" else float(parts[2].rstrip("x×"))
+                    self.worker.set_replay_speed(speed)
+                elif len(parts) == 3 and parts[1] == "seek" and parts[2].endswith("s"):
+                    self.worker.seek_replay("seek_time", float(parts[2][:-1]))
+                elif len(parts) == 3 and parts[1] == "seek":
+                    self.worker.seek_replay("seek", int(parts[2]))
+                elif len(parts) == 3 and parts[1] == "packet":
+                    self.worker.seek_replay("seek_packet", int(parts[2]))
+                else:
+                    raise ValueError(cmd)
+            except ValueError:
+                self.console.write_response("Usage: replay speed <x|max> | replay seek <n|sec s> | replay packet <num>")
+                return
+            self.console.write_response("Replay command queued")
+            return
+        if cmd == "db sessions" or cmd.startswith("db load "):
+            self._db_command(cmd.split())
+            return
         if cmd.startswith("load bin "):
             path = cmd[len("load bin "):].strip()
             self.on_simulator_changed(True, path)
@@ -3148,7 +3666,8 @@ class MainWindow(QMainWindow):
         if cmd == "sensor info":
             if self.last_data:
                 for k,v in self.last_data.items():
-                    self.console.write_response(f"{k}: {v}")
+                    if k != "_trace":
+                        self.console.write_response(f"{k}: {v}")
             else:
                 self.console.write_response("No sensor data yet")
             return
@@ -3174,6 +3693,23 @@ class MainWindow(QMainWindow):
         if cmd == "version":
             self.console.write_response(f"Grib Telemetry Dashboard v{APP_VERSION} — program 'Norfa'")
             return
+        if cmd == "latency":
+            for line in self.latency.lines():
+                self.console.write_response(line)
+            return
+        if cmd == "latency reset":
+            self.latency.reset()
+            self.console.write_response("Latency histograms cleared")
+            return
+        # ui: счётчики кадров интерфейса
+        if cmd == "ui":
+            for k, v in self.ui_scheduler.stats().items():
+                self.console.write_response(f"{k}: {v}")
+            agg = self.worker.log_agg
+            self.console.write_response(
+                f"log: received {agg.received}, suppressed {agg.suppressed}, batches {agg.batches}")
+            self.console.write_response(self.worker.link.summary())
+            return
         # pause/resume without data-check
         if cmd in ("pause", "resume"):
             if cmd == "pause":
@@ -3196,11 +3732,54 @@ class MainWindow(QMainWindow):
 
         self.console.write_response(f"Unknown command: {cmd}")
 
+    def _db_command(self, parts):
+        """db sessions | db load <id> [t0 t1] — чтение прошлых сессий из TelemetryStore."""
+        db = getattr(self.worker, "store", None)
+        if db is None:
+            self.console.write_response("SQLite storage is disabled (data_storage in config)")
+            return
+        db.flush()
+        if parts[1] == "sessions":
+            for sid, started, source, count in db.sessions():
+                ts = datetime.datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M:%S")
+                mark = " *" if sid == db.session else ""
+                self.console.write_response(f"{sid:>4}  {ts}  {count:>7} pkt  {source}{mark}")
+            return
+        try:
+            sid = int(parts[2])
+            start = float(parts[3]) * 1000 if len(parts) > 3 else None
+            end = float(parts[4]) * 1000 if len(parts) > 4 else None
+        except (IndexError, ValueError):
+            self.console.write_response("Usage: db load <id> [t0 t1]  (t — бортовое время, с)")
+            return
+        rows = db.query_range(start, end, session=sid, columns=codec.FIELDS)
+        if not rows:
+            self.console.write_response(f"No packets in session {sid}")
+            return
+        # Живой приём на паузе (как кнопкой), иначе новые пакеты смешаются с загруженными
+        if not self.worker.is_paused():
+            self.tel.toggle_pause()
+        self.ui_scheduler.clear()
+        self.graphs.reset_charts()
+        packets = [self.worker.decode_fields(row) for row in rows]
+        for data, row in zip(packets, rows):
+            if "me2o2" in data:
+                # В базе — сырое АЦП, на экране — % O2, как в живом приёме
+                data["me2o2"] = o2.percent(row[_ME2O2])
+        self.graphs.push_batch(packets)
+        self.graphs.render_charts()
+        self.tel.update_values(packets[-1])
+        self.console.write_response(f"Loaded {len(packets)} packets from session {sid}; "
+                                    "live data paused (resume to continue)")
+
     def _on_data_ready(self, data):
-        """Обработка получения данных из TelemetryWorker."""
-        # Добавляем в буфер
-        self.buffered_packets.append(data)
-        
+        """Пакет по сигналу data_ready (поток приёма без кольца)."""
+        # Добавляем в буфер; страницы получат его пачкой на следующем кадре
+        self.ui_scheduler.push(data)
+        self._on_batch_ready()
+
+    def _on_batch_ready(self):
+        """В кольце появились пакеты; сами пакеты заберёт flush_buffered_packets."""
         # Активируем кнопку паузы в телеметрии, если она есть и не активна
         if hasattr(self, 'tel') and hasattr(self.tel, 'pause_btn') and not self.tel.pause_btn.isEnabled():
             self.tel.pause_btn.setEnabled(True)
@@ -3245,7 +3824,7 @@ class MainWindow(QMainWindow):
              self.tel.pause_btn.setText("⏸ Пауза")
              self.tel.pause_btn.setEnabled(False)
              # Сбрасываем буфер пакетов
-             self.buffered_packets.clear()
+             self.ui_scheduler.clear()
              # Сбрасываем прогресс бар симуляции
              self._on_simulation_ended() # Используем этот слот для сброса прогресс бара
 